@@ -0,0 +1,74 @@
+"""
+Compares the old text based JSONP decoding with the byte based decoding of xs1_api_client.decoding
+using the recorded api responses in tests/api_responses and synthetic device lists.
+
+Usage: python -m benchmarks.decoding_benchmark
+"""
+import json
+import os
+import timeit
+
+from xs1_api_client import decoding
+
+RESPONSES_DIRECTORY = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'api_responses')
+
+
+def legacy_decode(body: bytes) -> dict:
+    """
+    The decoding used before: decode the whole body to text, slice out the json object and parse it.
+    """
+    text = body.decode('utf-8')
+    return json.loads(text[text.index('{'):text.rindex('}') + 1])
+
+
+def stdlib_decode(body: bytes) -> dict:
+    """
+    Byte based decoding without orjson.
+    """
+    return decoding._decode_json(body, body.find(b'{'))
+
+
+def synthetic_actuator_list(count: int) -> bytes:
+    """
+    :param count: number of actuators
+    :return: a get_list_actuators JSONP response with the given number of actuators
+    """
+    actuators = [{
+        "name": "Actuator_%d" % number,
+        "id": number,
+        "type": "switch",
+        "value": 0.0,
+        "newvalue": 0.0,
+        "utime": 1511492305,
+        "unit": "%",
+        "function": [{"type": "on", "dsc": "ON"}, {"type": "off", "dsc": "OFF"},
+                     {"type": "disabled", "dsc": ""}, {"type": "disabled", "dsc": ""}]
+    } for number in range(1, count + 1)]
+    response = {"version": 16, "type": "get_list_actuators", "utc_offset": 60, "dst": "off", "actuator": actuators}
+    return b"callback(" + json.dumps(response, indent=4).encode('utf-8') + b")\n"
+
+
+def main():
+    inputs = []
+    for filename in sorted(os.listdir(RESPONSES_DIRECTORY)):
+        with open(os.path.join(RESPONSES_DIRECTORY, filename), 'rb') as f:
+            inputs.append((filename, b"callback(" + f.read() + b")\n"))
+    for count in [64, 1000, 10000]:
+        inputs.append(("synthetic %d actuators" % count, synthetic_actuator_list(count)))
+
+    decoders = [("legacy", legacy_decode), ("stdlib", stdlib_decode)]
+    if decoding.orjson is not None:
+        decoders.append(("orjson", decoding.decode_jsonp))
+    else:
+        print("orjson is not installed, skipping it")
+
+    print("%-32s %10s" % ("input", "size") + "".join("%14s" % name for name, _ in decoders))
+    for name, body in inputs:
+        number = max(1, 200000 // len(body))
+        timings = [min(timeit.repeat(lambda: decode(body), number=number, repeat=3)) / number
+                   for _, decode in decoders]
+        print("%-32s %10d" % (name, len(body)) + "".join("%12.1fus" % (t * 1e6) for t in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures the memory used by device objects and the cost of their accessors.
+
+Devices are created from synthetic list responses of the gateway simulator (half actuators, half sensors).
+Memory is measured using tracemalloc and includes everything a device keeps alive (f.ex. its state).
+Results can be saved and compared like the results of the hot paths benchmark.
+
+Usage: python -m benchmarks.device_model_benchmark [--devices 2000] [--save NAME] [--compare NAME]
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.hot_paths_benchmark import create_api, measure, load_results, save_results
+
+ACCESSORS = ["id", "number", "name", "type", "value", "new_value", "unit", "last_update", "enabled", "__str__"]
+
+
+def memory_per_device(size: int) -> float:
+    """
+    :param size: number of actuators and sensors
+    :return: the number of bytes kept alive per device object
+    """
+    api, _ = create_api(size)
+    # warm up caches (url templates, decoder) so they aren't counted
+    api.get_all_actuators()
+    api.get_all_sensors()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        devices = api.get_all_actuators() + api.get_all_sensors()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return (after - before) / len(devices)
+
+
+def accessor_benchmarks(size: int) -> dict:
+    """
+    :param size: number of actuators and sensors
+    :return: the time of a single accessor call (in seconds) by accessor
+    """
+    api, _ = create_api(size)
+    devices = api.get_all_actuators() + api.get_all_sensors()
+
+    timings = {}
+    for accessor in ACCESSORS:
+        methods = [getattr(device, accessor) for device in devices]
+
+        def call_all():
+            for method in methods:
+                method()
+
+        timings["accessor/%s" % accessor] = measure(call_all) / len(devices)
+
+    def update():
+        for device in devices:
+            device.set_state({"value": 1.0, "newvalue": 1.0, "utime": 1})
+
+    timings["set_state"] = measure(update) / len(devices)
+    return timings
+
+
+def main(args: [str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks the memory and accessors of device objects")
+    parser.add_argument("--devices", type=int, default=2000, help="number of devices (actuators + sensors)")
+    parser.add_argument("--save", metavar="NAME", help="save the results as benchmarks/results/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare with previously saved results")
+    options = parser.parse_args(args)
+
+    baseline = load_results(options.compare) if options.compare else {}
+
+    size = options.devices // 2
+    results = {"memory_per_device": memory_per_device(size)}
+    results.update(accessor_benchmarks(size))
+
+    print("%-24s %12s" % ("benchmark", "result") + ("%12s %8s" % ("baseline", "ratio") if baseline else ""))
+    for name, result in results.items():
+        # memory in bytes, times in nanoseconds
+        scale, unit = (1, "B ") if name.startswith("memory") else (1e9, "ns")
+        line = "%-24s %10.0f%s" % (name, result * scale, unit)
+        if name in baseline:
+            line += "%10.0f%s %7.2fx" % (baseline[name] * scale, unit, result / baseline[name])
+        print(line)
+
+    if options.save:
+        print("Saved results to %s" % save_results(options.save, results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
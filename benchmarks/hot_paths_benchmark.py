@@ -0,0 +1,165 @@
+"""
+Times the hot paths of the client for 10 to 10,000 devices using synthetic responses of the gateway simulator:
+request url building, response decoding, creation of device objects by get_all_actuators/get_all_sensors,
+the device accessors and get_functions.
+
+No network is involved, responses are replayed from memory.
+Results can be saved (f.ex. once per release) and compared with a previous run to spot regressions.
+
+Usage: python -m benchmarks.hot_paths_benchmark [--sizes 10 100 1000 10000] [--save NAME] [--compare NAME]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import Command, UrlParam
+from xs1_api_client.decoding import decode_jsonp
+from xs1_api_client.simulator import SimulatedGateway
+from xs1_api_client.transport.cassette import Cassette, Interaction, ReplayTransport
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'results')
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+
+def synthetic_response(gateway: SimulatedGateway, command: Command) -> bytes:
+    """
+    :param gateway: the simulated gateway
+    :param command: the command to answer
+    :return: the JSONP response body of the simulated gateway
+    """
+    response = gateway.handle({UrlParam.COMMAND.value: command.value})
+    return ("callback(%s)\n" % json.dumps(response, ensure_ascii=False)).encode('utf-8')
+
+
+def create_api(size: int) -> (xs1api.XS1, dict):
+    """
+    :param size: number of actuators and sensors
+    :return: an api object answering list requests with synthetic responses, and the raw responses
+    """
+    gateway = SimulatedGateway(actuators=size, sensors=size)
+    bodies = {command: synthetic_response(gateway, command)
+              for command in [Command.GET_LIST_ACTUATORS, Command.GET_LIST_SENSORS]}
+    cassette = Cassette([Interaction(command.value, None, body) for command, body in bodies.items()])
+
+    api = xs1api.XS1(transport=ReplayTransport(cassette))
+    api._apply_connection_info("127.0.0.1", 80, False, None, None)
+    return api, bodies
+
+
+def measure(func) -> float:
+    """
+    :param func: the function to time
+    :return: the best time of a single call (in seconds)
+    """
+    timer = timeit.Timer(func)
+    # run each repetition for at least 0.2 seconds
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def url_benchmarks(api: xs1api.XS1) -> dict:
+    return {
+        "build_url/get_list_actuators": measure(lambda: api._build_request_url(Command.GET_LIST_ACTUATORS)),
+        "build_url/set_state_actuator": measure(lambda: api._build_request_url(
+            Command.SET_STATE_ACTUATOR, {UrlParam.NUMBER: 12, UrlParam.VALUE: 50.5})),
+        "build_url/set_config_actuator": measure(lambda: api._build_request_url(
+            Command.SET_CONFIG_ACTUATOR, {UrlParam.NUMBER: 12, UrlParam.NAME: "Living room"})),
+    }
+
+
+def size_benchmarks(size: int) -> dict:
+    api, bodies = create_api(size)
+    actuators = api.get_all_actuators()
+    sensors = api.get_all_sensors()
+    devices = actuators + sensors
+
+    def accessors():
+        for device in devices:
+            device.value()
+            device.type()
+            device.enabled()
+
+    def functions():
+        for actuator in actuators:
+            actuator.get_functions()
+
+    return {
+        "decode/get_list_actuators/%d" % size: measure(lambda: decode_jsonp(bodies[Command.GET_LIST_ACTUATORS])),
+        "decode/get_list_sensors/%d" % size: measure(lambda: decode_jsonp(bodies[Command.GET_LIST_SENSORS])),
+        "get_all_actuators/%d" % size: measure(api.get_all_actuators),
+        "get_all_sensors/%d" % size: measure(api.get_all_sensors),
+        "accessors/%d" % (size * 2): measure(accessors),
+        "get_functions/%d" % size: measure(functions),
+    }
+
+
+def load_results(name: str) -> dict:
+    """
+    :param name: the name of saved results or the path of a results file
+    :return: the timings of the saved results
+    """
+    path = name if os.path.isfile(name) else os.path.join(RESULTS_DIRECTORY, name + ".json")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)["timings"]
+
+
+def save_results(name: str, timings: dict) -> str:
+    """
+    :param name: the name of the results (f.ex. the version of the library)
+    :param timings: the measured timings
+    :return: the path of the results file
+    """
+    os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+    path = os.path.join(RESULTS_DIRECTORY, name + ".json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "name": name,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timings": timings,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return path
+
+
+def main(args: [str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks the hot paths of the XS1 api client")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="numbers of devices")
+    parser.add_argument("--save", metavar="NAME", help="save the results as benchmarks/results/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare with previously saved results")
+    parser.add_argument("--threshold", type=float, default=1.3,
+                        help="slowdown factor reported as a regression when comparing")
+    options = parser.parse_args(args)
+
+    baseline = load_results(options.compare) if options.compare else {}
+
+    timings = url_benchmarks(create_api(1)[0])
+    for size in options.sizes:
+        timings.update(size_benchmarks(size))
+
+    regressions = 0
+    print("%-36s %14s" % ("benchmark", "time") + ("%14s %8s" % ("baseline", "ratio") if baseline else ""))
+    for name, seconds in timings.items():
+        line = "%-36s %12.2fus" % (name, seconds * 1e6)
+        if name in baseline:
+            ratio = seconds / baseline[name]
+            line += "%12.2fus %7.2fx" % (baseline[name] * 1e6, ratio)
+            if ratio > options.threshold:
+                line += "  REGRESSION"
+                regressions += 1
+        print(line)
+
+    if options.save:
+        print("Saved results to %s" % save_results(options.save, timings))
+    if regressions:
+        print("%d benchmarks are more than %.2fx slower than %s" % (regressions, options.threshold, options.compare))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Compares the request throughput of a new HTTP session per call with the pooled keep-alive session
+of the XS1 object against a local stand-in server.
+
+Usage: python -m benchmarks.session_benchmark [number of requests]
+"""
+import sys
+import time
+
+import requests
+
+from benchmarks.stand_in import StandInServer, load_response
+from xs1_api_client import api as xs1api
+from xs1_api_client.decoding import decode_jsonp
+
+
+class PerCallSessionXS1(xs1api.XS1):
+    """
+    XS1 variant that mimics the old behaviour of opening a new session for every request.
+    """
+
+    def _send_request(self, request_url: str) -> dict:
+        with requests.Session() as session:
+            response = session.get(request_url, timeout=5)
+            return decode_jsonp(response.content, response.encoding)
+
+
+def run(api: xs1api.XS1, count: int) -> float:
+    """
+    :param api: the api object to benchmark
+    :param count: number of requests to send
+    :return: requests per second
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        api.get_state_sensor(1)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with StandInServer(load_response('get_state_sensor')) as server:
+        results = {}
+        for name, api_class in [("session per call", PerCallSessionXS1), ("pooled session", xs1api.XS1)]:
+            with api_class(server.host, server.port) as api:
+                results[name] = run(api, count)
+
+    for name, requests_per_second in results.items():
+        print("%-20s %10.1f req/s" % (name, requests_per_second))
+    print("%-20s %10.2fx" % ("speedup", results["pooled session"] / results["session per call"]))
+
+
+if __name__ == '__main__':
+    main()
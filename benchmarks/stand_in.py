@@ -0,0 +1,49 @@
+"""
+A minimal local stand-in for the XS1 gateway answering every request with the same JSONP response.
+"""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPONSES_DIRECTORY = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'api_responses')
+
+
+def load_response(filename: str) -> bytes:
+    """
+    :param filename: name of a file in tests/api_responses
+    :return: the response wrapped in a JSONP callback
+    """
+    with open(os.path.join(RESPONSES_DIRECTORY, filename), 'rb') as f:
+        return b"callback(" + f.read() + b")"
+
+
+class StandInServer(object):
+    """
+    Serves a fixed response on a random local port while used as a context manager.
+    """
+
+    def __init__(self, body: bytes) -> None:
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/javascript")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.host, self.port = self._server.server_address
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,65 @@
+"""
+Compares the import time and the per call latency of the available transports against a local stand-in server.
+
+Usage: python -m benchmarks.transport_benchmark [number of requests]
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.stand_in import StandInServer, load_response
+from xs1_api_client import api as xs1api
+from xs1_api_client.transport.http_client_transport import HttpClientTransport
+from xs1_api_client.transport.requests_transport import RequestsTransport
+
+IMPORTS = {
+    "requests": "from xs1_api_client.api import XS1; "
+                "from xs1_api_client.transport.requests_transport import RequestsTransport",
+    "http.client": "from xs1_api_client.api import XS1; "
+                   "from xs1_api_client.transport.http_client_transport import HttpClientTransport",
+}
+
+
+def measure_import_time(statement: str, repeat: int = 5) -> float:
+    """
+    Measures the import time in a fresh interpreter.
+    :param statement: the import statement
+    :param repeat: number of measurements
+    :return: the fastest import time in seconds
+    """
+    code = "import time; start = time.perf_counter(); %s; print(time.perf_counter() - start)" % statement
+    return min(float(subprocess.check_output([sys.executable, "-c", code])) for _ in range(repeat))
+
+
+def measure_latency(api: xs1api.XS1, count: int) -> [float]:
+    """
+    :param api: the api object to benchmark
+    :param count: number of requests to send
+    :return: latencies of all requests in seconds
+    """
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        api.get_state_sensor(1)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print("%-12s %12s %12s %12s" % ("transport", "import", "median", "p99"))
+    with StandInServer(load_response('get_state_sensor')) as server:
+        for name, transport in [("requests", RequestsTransport()), ("http.client", HttpClientTransport())]:
+            import_time = measure_import_time(IMPORTS[name])
+            with xs1api.XS1(server.host, server.port, transport=transport) as api:
+                latencies = sorted(measure_latency(api, count))
+
+            print("%-12s %10.1fms %10.1fus %10.1fus" % (name, import_time * 1e3,
+                                                       statistics.median(latencies) * 1e6,
+                                                       latencies[int(len(latencies) * 0.99)] * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,6 @@ There may be other methods besides the ones shown here. Have a look at the docum
 http://xs1-api-client.readthedocs.io/
 to get more info.
 """
-import time
-
 from xs1_api_client import api as xs1api
 from xs1_api_client import api_constants
 from xs1_api_client.api_constants import Node, ActuatorType, FunctionType
@@ -75,14 +73,18 @@ for sensor in sensors:
 changing_actuator = actuators[6]  # pick one from the received list
 print("Old value: " + str(changing_actuator.value()))  # print old value
 print("Old new_value: " + str(changing_actuator.new_value()))  # print old new_value
-changing_actuator.set_value(1)  # use the object method to set a new value (turn light on)
+# use the object method to set a new value (turn light on)
+# with confirm=True a confirmation is returned that completes once the value has been transmitted to the device
+confirmation = changing_actuator.set_value(1, confirm=True)
 print("Updated value: " + str(
     changing_actuator.value()))  # print the updated value (will be updated with the response of the gateway)
 print("Updated new_value: " + str(
     changing_actuator.new_value()))  # print the updated new_value
 
-print("Sleeping...")
-time.sleep(3)
+# wait until the new value has been transmitted to the device
+print("Waiting for confirmation...")
+if confirmation.wait(10):
+    print("Confirmed value: " + str(changing_actuator.value()))
 
 print("")
 # alternatively you can call a function that is defined for an actuator (in the gateway)
@@ -56,5 +56,9 @@ setup(
         'Programming Language :: Python :: 3.11'
     ],
     install_requires=install_requirements(),
+    extras_require={
+        # faster decoding of api responses
+        'orjson': ['orjson'],
+    },
     tests_require=test_requirements()
 )
@@ -1,8 +1,19 @@
 import json
 import unittest
 from unittest.mock import MagicMock
+from urllib.parse import urlsplit, parse_qsl
 
 from xs1_api_client import api as xs1api
+from xs1_api_client.resilience import RetryPolicy
+from xs1_api_client.simulator import SimulatedGateway
+
+
+def get_parameters(request_url: str) -> dict:
+    """
+    :param request_url: a request url
+    :return: the url parameters of the request
+    """
+    return dict(parse_qsl(urlsplit(request_url).query))
 
 
 class XS1TestBase(unittest.TestCase):
@@ -44,3 +55,53 @@ class XS1TestBase(unittest.TestCase):
 
     if __name__ == '__main__':
         unittest.main()
+
+
+class SimulatedGatewayTestBase(unittest.TestCase):
+    """
+    Base class for tests using api objects whose requests are answered by a SimulatedGateway.
+    """
+
+    _test_host = "testhost"
+
+    # options of the SimulatedGateway created for every test
+    _gateway_options = {}
+
+    def setUp(self):
+        self._gateway = self.create_gateway()
+        self._api = self.create_api()
+
+    def create_gateway(self) -> SimulatedGateway:
+        """
+        :return: the simulated gateway answering the requests of this test
+        """
+        return SimulatedGateway(**self._gateway_options)
+
+    def create_api(self, api_class=xs1api.XS1, **kwargs):
+        """
+        Creates an api object (without retries) whose requests are answered by self.send_request
+        :param api_class: XS1 or AsyncXS1
+        :param kwargs: further options of the api object
+        :return: the api object
+        """
+        kwargs.setdefault("retry_policy", RetryPolicy(max_retries=0))
+        api = api_class(**kwargs)
+        sync_api = getattr(api, "_api", api)
+        sync_api._send_request = MagicMock(side_effect=self.send_request)
+        sync_api.set_connection_info(self._test_host, config_info=xs1api.XS1.CONFIG_INFO_LAZY)
+        return api
+
+    def send_request(self, request_url: str) -> dict:
+        """
+        :param request_url: the request url
+        :return: the response of the simulated gateway
+        """
+        return self._gateway.handle(get_parameters(request_url))
+
+    def get_requests(self, api=None) -> [dict]:
+        """
+        :param api: the XS1 object, self._api if None
+        :return: the parameters of all requests sent by the api object
+        """
+        api = api if api is not None else self._api
+        return [get_parameters(call[0][0]) for call in api._send_request.call_args_list]
@@ -0,0 +1,103 @@
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from tests import XS1TestBase
+from xs1_api_client.api import XS1
+from xs1_api_client.api_constants import FunctionType
+from xs1_api_client.async_api import AsyncXS1, AsyncXS1Switch, AsyncXS1Sensor
+from xs1_api_client.device.actuator.switch import XS1Switch
+
+
+class TestAsyncXS1(XS1TestBase):
+
+    def setUp(self):
+        super().setUp()
+        self._async_api = AsyncXS1(self._test_host)
+
+    def tearDown(self):
+        self._async_api.close()
+
+    def _mock_response(self, filename: str) -> None:
+        api_response = TestAsyncXS1.get_api_response(filename)
+        self._async_api._api._send_request = MagicMock(return_value=api_response)
+
+    def test_constructor_does_not_block(self):
+        self._async_api._api._send_request = MagicMock()
+
+        api = AsyncXS1(self._test_host)
+
+        self.assertEqual(api.get_host(), self._test_host)
+        self._async_api._api._send_request.assert_not_called()
+
+    def test_covers_all_public_methods(self):
+        public_methods = [name for name in dir(XS1)
+                          if not name.startswith("_") and callable(inspect.getattr_static(XS1, name))]
+
+        missing = [name for name in public_methods if not hasattr(AsyncXS1, name)]
+        self.assertEqual(missing, [])
+
+    def test_config_info_is_fetched_on_first_use(self):
+        self._mock_response("get_config_info")
+
+        self.assertEqual(asyncio.run(self._async_api.get_gateway_name()), "xs1")
+        self.assertEqual(asyncio.run(self._async_api.get_gateway_uptime()), 963766)
+        self._async_api._api._send_request.assert_called_once()
+
+    def test_get_all_actuators(self):
+        self._mock_response("get_list_actuators")
+
+        actuators = asyncio.run(self._async_api.get_all_actuators())
+
+        switches = [actuator for actuator in actuators if isinstance(actuator, AsyncXS1Switch)]
+        self.assertTrue(switches)
+        # async switches are still switches
+        self.assertTrue(all(isinstance(switch, XS1Switch) for switch in switches))
+        for actuator in actuators:
+            self.assertIs(actuator._api_interface, self._async_api)
+
+    def test_requests_run_on_the_executor(self):
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="xs1-test") as executor:
+            api = AsyncXS1(self._test_host, executor=executor)
+            thread_names = []
+
+            def send_request(request_url: str) -> dict:
+                thread_names.append(threading.current_thread().name)
+                return TestAsyncXS1.get_api_response("get_list_sensors")
+
+            api._api._send_request = MagicMock(side_effect=send_request)
+            asyncio.run(api.get_all_sensors())
+
+        self.assertTrue(thread_names[0].startswith("xs1-test"))
+
+    def test_actuator_update(self):
+        self._mock_response("get_list_actuators")
+        actuator = asyncio.run(self._async_api.get_actuator(1))
+        self.assertEqual(actuator.value(), 0.0)
+
+        self._mock_response("get_state_actuator__updated")
+        asyncio.run(actuator.update())
+
+        self.assertEqual(actuator.value(), 16.0)
+        self.assertEqual(actuator.new_value(), 18.0)
+
+    def test_switch_function_execute(self):
+        self._mock_response("get_list_actuators")
+        switch = asyncio.run(self._async_api.get_actuator(3))
+
+        self._mock_response("call_actuator_function")
+        asyncio.run(switch.get_function_by_type(FunctionType.OFF).execute())
+
+        self.assertEqual(switch.value(), 0)
+
+    def test_sensor_update(self):
+        self._mock_response("get_list_sensors")
+        sensors = asyncio.run(self._async_api.get_all_sensors())
+        self.assertTrue(all(isinstance(sensor, AsyncXS1Sensor) for sensor in sensors))
+
+        self._mock_response("get_state_sensor")
+        asyncio.run(sensors[0].update())
+
+        self.assertEqual(sensors[0].name(), "broken")
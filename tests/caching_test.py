@@ -0,0 +1,158 @@
+import threading
+import time
+from unittest.mock import MagicMock
+from urllib.parse import urlsplit, parse_qs
+
+from tests import XS1TestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import Command
+from xs1_api_client.caching import ResponseCache, copy_response
+from xs1_api_client.resilience import RetryPolicy
+
+RESPONSE_FILES = {
+    "get_config_info": "get_config_info",
+    "get_list_actuators": "get_list_actuators",
+    "get_list_sensors": "get_list_sensors",
+    "get_state_actuator": "get_state_actuator",
+    "set_state_actuator": "call_actuator_function",
+    "set_config_actuator": "set_config_actuator",
+}
+
+
+class TestXS1(XS1TestBase):
+
+    def setUp(self):
+        self._underTest = xs1api.XS1(response_cache=ResponseCache(stale_ttl=10),
+                                     retry_policy=RetryPolicy(max_retries=0))
+        self._underTest._send_request = MagicMock(side_effect=self._send_request)
+        self._underTest._apply_connection_info(self._test_host)
+
+    @staticmethod
+    def _send_request(request_url: str) -> dict:
+        command = parse_qs(urlsplit(request_url).query)["cmd"][0]
+        return TestXS1.get_api_response(RESPONSE_FILES[command])
+
+    def _expire(self, seconds: float) -> None:
+        for entry in self._underTest.get_response_cache()._entries.values():
+            entry.fetched_at -= seconds
+
+    def _requested_commands(self) -> [str]:
+        return [parse_qs(urlsplit(call[0][0]).query)["cmd"][0] for call in self._underTest._send_request.call_args_list]
+
+    def test_fresh_responses_are_cached(self):
+        self._underTest.get_all_actuators()
+        self._underTest.get_all_actuators()
+        self._underTest.get_state_actuator(3)
+        self._underTest.get_state_actuator(3)
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+        self.assertEqual(self._underTest.get_cache_stats(), {"hits": 2, "stale_hits": 0, "misses": 2})
+
+    def test_uncached_commands(self):
+        self._underTest.update_config_info()
+        self._underTest.update_config_info()
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+
+    def test_callers_get_copies(self):
+        self._underTest = xs1api.XS1(response_cache=ResponseCache(), retry_policy=RetryPolicy(max_retries=0),
+                                     keep_raw_state=True)
+        self._underTest._send_request = MagicMock(side_effect=self._send_request)
+        self._underTest._apply_connection_info(self._test_host)
+
+        first = self._underTest.get_all_actuators()
+        first[0].get_state()["name"] = "changed"
+
+        second = self._underTest.get_all_actuators()
+        self.assertNotEqual(second[0].get_state()["name"], "changed")
+
+    def test_expired_responses_are_requested_again(self):
+        self._underTest = xs1api.XS1(response_cache=ResponseCache(), retry_policy=RetryPolicy(max_retries=0))
+        self._underTest._send_request = MagicMock(side_effect=self._send_request)
+        self._underTest._apply_connection_info(self._test_host)
+
+        self._underTest.get_all_actuators()
+        self._expire(5)
+        self._underTest.get_all_actuators()
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+
+    def test_stale_while_revalidate(self):
+        self._underTest.get_all_actuators()
+        self._expire(5)
+
+        refreshed = threading.Event()
+        release = threading.Event()
+
+        def slow_send_request(request_url: str) -> dict:
+            release.wait(5)
+            refreshed.set()
+            return self._send_request(request_url)
+
+        self._underTest._send_request = MagicMock(side_effect=slow_send_request)
+
+        # stale responses are returned immediately while a single background request refreshes them
+        self.assertEqual(len(self._underTest.get_all_actuators()), 64)
+        self.assertEqual(len(self._underTest.get_all_actuators()), 64)
+        release.set()
+        self.assertTrue(refreshed.wait(5))
+
+        deadline = time.time() + 5
+        while self._underTest.get_response_cache()._entries[
+            ("get_list_actuators", self._underTest._build_request_url(Command.GET_LIST_ACTUATORS))
+        ].refreshing and time.time() < deadline:
+            time.sleep(0.01)
+
+        self._underTest.get_all_actuators()
+        self.assertEqual(self._underTest._send_request.call_count, 1)
+        self.assertEqual(self._underTest.get_cache_stats(), {"hits": 1, "stale_hits": 2, "misses": 1})
+
+    def test_set_value_patches_device_list(self):
+        self._underTest.get_all_actuators()
+        self._underTest.get_state_actuator(3)
+
+        self._underTest.set_actuator_value(3, 0)
+        actuator = self._underTest.get_all_actuators()[2]
+        self._underTest.get_state_actuator(3)
+
+        self.assertEqual(actuator.value(), 0.0)
+        self.assertEqual(self._requested_commands(),
+                         ["get_list_actuators", "get_state_actuator", "set_state_actuator", "get_state_actuator"])
+
+    def test_set_config_invalidates_device_list(self):
+        self._underTest.get_all_actuators()
+        self._underTest.set_config_actuator(1, {})
+        self._underTest.get_all_actuators()
+
+        self.assertEqual(self._requested_commands(),
+                         ["get_list_actuators", "set_config_actuator", "get_list_actuators"])
+
+    def test_write_during_load_is_not_overwritten(self):
+        cache = self._underTest.get_response_cache()
+        cache_key = self._underTest._build_request_url(Command.GET_LIST_ACTUATORS)
+
+        def load():
+            # a write finishes while the list is requested
+            cache.record_write(Command.SET_STATE_ACTUATOR, {"number": 3}, {})
+            return self._send_request(cache_key)
+
+        cache.get(Command.GET_LIST_ACTUATORS, None, cache_key, load)
+        self.assertNotIn(("get_list_actuators", cache_key), cache._entries)
+
+    def test_connection_info_change_clears_cache(self):
+        self._underTest.get_all_actuators()
+        self._underTest._apply_connection_info("otherhost")
+        self._underTest.get_all_actuators()
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+
+    def test_copy_response(self):
+        response = TestXS1.get_api_response("get_list_actuators")
+        copy = copy_response(response)
+
+        self.assertEqual(copy, response)
+        self.assertIsNot(copy["actuator"][0], response["actuator"][0])
+        self.assertIsNot(copy["actuator"][0]["function"], response["actuator"][0]["function"])
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(xs1api.XS1().get_cache_stats())
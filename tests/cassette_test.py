@@ -0,0 +1,96 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from xs1_api_client import api as xs1api
+from xs1_api_client.transport import Transport, HTTPStatusError
+from xs1_api_client.transport.cassette import Cassette, Interaction, RecordingTransport, ReplayTransport
+
+API_RESPONSES = os.path.join(os.path.dirname(__file__), 'api_responses')
+
+
+class FakeTransport(Transport):
+    """
+    Answers every request with the same body.
+    """
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    def get(self, url: str, timeout: float, auth: (str, str) = None) -> (bytes, str or None):
+        time.sleep(0.01)
+        return self._body, "utf-8"
+
+
+class TestCassette(unittest.TestCase):
+
+    def test_replay_api_responses(self):
+        transport = ReplayTransport(Cassette.load(API_RESPONSES))
+        api = xs1api.XS1("testhost", transport=transport)
+
+        self.assertEqual(api.get_gateway_name(), "xs1")
+        self.assertEqual(len(api.get_all_actuators()), 64)
+
+        # multiple responses for the same command are replayed in order
+        actuator = api.get_actuator(1)
+        actuator.update()
+        self.assertEqual(actuator.value(), 0.0)
+        actuator.update()
+        self.assertEqual(actuator.value(), 16.0)
+
+        # actuator functions are requested using set_state_actuator
+        response = api.call_actuator_function(3, 1)
+        self.assertEqual(response["actuator"]["name"], "Markus_Nachttisch")
+
+    def test_unknown_request(self):
+        transport = ReplayTransport(Cassette())
+
+        with self.assertRaises(HTTPStatusError) as context:
+            transport.get("http://testhost/control?callback=callback&cmd=get_list_sensors", 5)
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_record_and_replay(self):
+        body = 'callback({"version": 16, "type": "get_state_sensor", "sensor": {"name": "Küche", "value": 1.0}})'
+        recorder = RecordingTransport(FakeTransport(body.encode('utf-8')))
+        api = xs1api.XS1("testhost", user="User", password="Password", transport=recorder)
+
+        api.get_state_sensor(3)
+
+        interactions = recorder.get_cassette().get_interactions()
+        self.assertEqual([i.command for i in interactions], ["get_config_info", "get_state_sensor"])
+        self.assertEqual(interactions[1].parameters, {"number": "3"})
+        self.assertGreater(interactions[1].latency, 0.005)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cassette.jsonl")
+            recorder.get_cassette().save(path)
+            cassette = Cassette.load(path)
+
+        replay_api = xs1api.XS1("otherhost", transport=ReplayTransport(cassette))
+        self.assertEqual(replay_api.get_state_sensor(3)["sensor"]["name"], "Küche")
+        with self.assertRaises(HTTPStatusError):
+            replay_api.get_state_sensor(4)
+
+    def test_binary_body(self):
+        interaction = Interaction("get_list_sensors", {}, b"callback({\"dsc\": \"16\xb0C\"})", encoding="iso-8859-1")
+
+        restored = Interaction.from_dict(interaction.to_dict())
+
+        self.assertEqual(restored.body, interaction.body)
+        self.assertEqual(restored.encoding, "iso-8859-1")
+
+    def test_replay_speed(self):
+        cassette = Cassette([Interaction("get_protocol_info", None, b'callback({"version": 16})', latency=0.2)])
+        transport = ReplayTransport(cassette, speed=4)
+
+        threads = [threading.Thread(target=transport.get, args=("http://host/control?cmd=get_protocol_info", 5))
+                   for _ in range(10)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLess(time.perf_counter() - start, 0.2)
@@ -0,0 +1,214 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from tests import XS1TestBase, SimulatedGatewayTestBase, get_parameters
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import Command
+from xs1_api_client.coalescing import SingleFlight, WriteQueue
+
+
+class TestXS1(XS1TestBase):
+
+    def setUp(self):
+        self._underTest = xs1api.XS1(coalesce_requests=True, keep_raw_state=True)
+
+        api_response = TestXS1.get_api_response("get_config_info")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        self._underTest.set_connection_info(self._test_host)
+
+    def _run_concurrently(self, func, count: int) -> list:
+        """
+        Calls func from multiple threads while the mocked gateway request is blocked
+        until all of them have been started.
+        """
+        release = threading.Event()
+        api_response = TestXS1.get_api_response("get_list_sensors")
+
+        def send_request(request_url: str) -> dict:
+            release.wait(5)
+            return api_response
+
+        self._underTest._send_request = MagicMock(side_effect=send_request)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(func())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+
+        # give the threads some time to queue up behind the first request
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def test_is_write_command(self):
+        self.assertTrue(Command.is_write_command(Command.SET_STATE_ACTUATOR))
+        self.assertTrue(Command.is_write_command("set_config_sensor"))
+        self.assertFalse(Command.is_write_command(Command.GET_LIST_SENSORS))
+
+    def test_concurrent_reads_are_coalesced(self):
+        stats_before = self._underTest.get_coalescing_stats()
+
+        results = self._run_concurrently(self._underTest.get_all_sensors, 5)
+
+        self.assertEqual(self._underTest._send_request.call_count, 1)
+        stats = self._underTest.get_coalescing_stats()
+        self.assertEqual(stats["misses"] - stats_before["misses"], 1)
+        self.assertEqual(stats["hits"] - stats_before["hits"], 4)
+
+        # every caller gets its own device objects and states
+        self.assertEqual(len(results), 5)
+        self.assertIsNot(results[0][0].get_state(), results[1][0].get_state())
+
+    def test_leader_modifications_are_not_shared(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def request() -> dict:
+            started.set()
+            release.wait(5)
+            return {"actuator": [{"name": "lamp"}]}
+
+        def lead():
+            response = flight.execute("key", request)
+            # like get_all_actuators() the caller modifies its response right away
+            response["actuator"][0]["number"] = 1
+            results.append(response)
+
+        results = []
+        leader = threading.Thread(target=lead)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flight.execute("key", request)))
+                     for _ in range(3)]
+        for thread in followers:
+            thread.start()
+
+        time.sleep(0.1)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(sum("number" in response["actuator"][0] for response in results), 1)
+        self.assertEqual(len(set(id(response) for response in results)), 4)
+
+    def test_writes_are_not_coalesced(self):
+        self._run_concurrently(lambda: self._underTest.set_sensor_value(1, 1), 3)
+
+        self.assertEqual(self._underTest._send_request.call_count, 3)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(xs1api.XS1().get_coalescing_stats())
+
+
+class TestWriteQueue(SimulatedGatewayTestBase):
+
+    _gateway_options = {"actuators": 5, "sensors": 0}
+
+    def setUp(self):
+        # writes to these actuator numbers are blocked until self._release is set
+        self._blocked = set()
+        self._in_flight = threading.Event()
+        self._release = threading.Event()
+        super(TestWriteQueue, self).setUp()
+
+    def create_api(self, api_class=xs1api.XS1, **kwargs):
+        kwargs.setdefault("write_queue", WriteQueue(window=0.05))
+        return super(TestWriteQueue, self).create_api(api_class, **kwargs)
+
+    def send_request(self, request_url: str) -> dict:
+        parameters = get_parameters(request_url)
+        if parameters["cmd"] == Command.SET_STATE_ACTUATOR.value and int(parameters["number"]) in self._blocked:
+            self._in_flight.set()
+            self._release.wait(5)
+        return self._gateway.handle(parameters)
+
+    def _written_values(self, number: int, api=None) -> [float]:
+        return [float(p["value"]) for p in self.get_requests(api)
+                if p["cmd"] == Command.SET_STATE_ACTUATOR.value and int(p["number"]) == number]
+
+    def test_writes_are_collapsed(self):
+        self._blocked.add(1)
+        first = self._api.submit_actuator_value(1, 0)
+        self.assertTrue(self._in_flight.wait(5))
+
+        # writes arriving while the first one is in flight replace each other
+        futures = [self._api.submit_actuator_value(1, value) for value in range(1, 30)]
+        self._release.set()
+
+        self.assertEqual(first.result(5)["actuator"]["newvalue"], 0)
+        for future in futures:
+            self.assertEqual(future.result(5)["actuator"]["newvalue"], 29)
+        self.assertEqual(self._written_values(1), [0, 29])
+        self.assertEqual(self._api.get_write_queue().get_stats(), {"submitted": 30, "executed": 2, "elided": 28})
+
+    def test_writes_to_idle_actuators_are_not_delayed(self):
+        api = self.create_api(write_queue=WriteQueue(window=10))
+
+        start = time.monotonic()
+        for value in range(5):
+            self.assertEqual(api.set_actuator_value(1, value)["actuator"]["newvalue"], value)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self._written_values(1, api), [0, 1, 2, 3, 4])
+        self.assertEqual(api.get_write_queue().get_pending(), 0)
+
+    def test_actuators_are_independent(self):
+        self._blocked.add(1)
+        slow = self._api.submit_actuator_value(1, 10)
+        self.assertTrue(self._in_flight.wait(5))
+
+        # neither a synchronous nor a queued write to another actuator waits for the slow one
+        self.assertEqual(self._api.set_actuator_value(2, 20)["actuator"]["newvalue"], 20)
+        self.assertEqual(self._api.submit_actuator_value(3, 30).result(5)["actuator"]["newvalue"], 30)
+        self.assertFalse(slow.done())
+
+        self._release.set()
+        self.assertEqual(slow.result(5)["actuator"]["newvalue"], 10)
+        self.assertTrue(self._api.get_write_queue().flush(5))
+
+    def test_concurrent_switch_writes(self):
+        switch = self._api.get_actuator_by_number(1)
+        self._blocked.add(1)
+        first = threading.Thread(target=switch.turn_off)
+        first.start()
+        self.assertTrue(self._in_flight.wait(5))
+
+        threads = [threading.Thread(target=switch.turn_on if index % 2 else switch.turn_off) for index in range(10)]
+        for thread in threads:
+            thread.start()
+        # give the threads some time to queue up behind the first write
+        time.sleep(0.2)
+        self._release.set()
+        for thread in [first] + threads:
+            thread.join(5)
+
+        self.assertEqual(len(self._written_values(1)), 2)
+        self.assertEqual(switch.new_value(), self._gateway.handle(
+            {"cmd": Command.GET_STATE_ACTUATOR.value, "number": "1"})["actuator"]["newvalue"])
+
+    def test_errors_are_shared(self):
+        self._blocked.add(1)
+        first = self._api.submit_actuator_value(1, 0)
+        self.assertTrue(self._in_flight.wait(5))
+        futures = [self._api.submit_actuator_value(1, value) for value in range(1, 4)]
+        self._api._send_request.side_effect = ValueError("invalid response")
+        self._release.set()
+
+        self.assertEqual(first.result(5)["actuator"]["newvalue"], 0)
+        for future in futures:
+            self.assertIsInstance(future.exception(5), ValueError)
+        self.assertEqual(self._api._send_request.call_count, 2)
+
+    def test_without_queue(self):
+        api = self.create_api(write_queue=None)
+
+        future = api.submit_actuator_value(1, 42)
+
+        self.assertTrue(future.done())
+        self.assertEqual(future.result()["actuator"]["newvalue"], 42)
+        self.assertIsNone(api.get_write_queue())
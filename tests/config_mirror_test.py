@@ -0,0 +1,74 @@
+from tests import SimulatedGatewayTestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import Command, Node
+
+
+class TestXS1(SimulatedGatewayTestBase):
+
+    _gateway_options = {"actuators": 8, "sensors": 8}
+
+    def create_api(self, api_class=xs1api.XS1, **kwargs):
+        return super(TestXS1, self).create_api(api_class, mirror_config=True, **kwargs)
+
+    def _requested_commands(self) -> [str]:
+        return [parameters["cmd"] for parameters in self.get_requests()]
+
+    def test_configs_are_mirrored(self):
+        config = self._api.get_config_actuator(1)
+        config["name"] = "changed"
+
+        self.assertEqual(self._api.get_config_actuator(1)["name"], "Actuator_1")
+        self.assertEqual(self._api.get_config_sensor(1)["name"], "Sensor_1")
+        self.assertEqual(self._api.get_config_sensor(1)["name"], "Sensor_1")
+
+        self.assertEqual(self._requested_commands(), ["get_config_actuator", "get_config_sensor"])
+        self.assertEqual(self._api.get_config_mirror().get_stats(), {"hits": 2, "misses": 2})
+
+    def test_unchanged_name_needs_no_request(self):
+        actuator = self._api.get_actuator_by_number(2)
+        actuator.set_name("Actuator_2")
+        actuator.set_name("Actuator_2")
+
+        self.assertEqual(self._requested_commands(), ["get_list_actuators", "get_config_actuator"])
+
+    def test_set_config_updates_mirror(self):
+        sensor = self._api.get_sensor_by_number(3)
+        self.assertEqual(sensor.set_name("Renamed"), "Renamed")
+        sensor.set_name("Renamed")
+
+        self.assertEqual(self._api.get_config_sensor(3)["name"], "Renamed")
+        self.assertEqual(self._requested_commands(), ["get_list_sensors", "get_config_sensor", "set_config_sensor"])
+
+    def test_changed_list_entry_invalidates_config(self):
+        self._api.get_config_actuator(1)
+        self._api.get_config_actuator(2)
+
+        # renamed by another client
+        self._gateway.handle({"cmd": Command.SET_CONFIG_ACTUATOR.value, "number": "2", "name": "Other"})
+        self._api.get_all_actuators()
+
+        self._api.get_config_actuator(1)
+        self.assertEqual(self._api.get_config_actuator(2)["name"], "Other")
+        self.assertEqual(self._requested_commands(), ["get_config_actuator", "get_config_actuator",
+                                                      "get_list_actuators", "get_config_actuator"])
+
+    def test_changed_state_invalidates_config(self):
+        self._api.get_config_sensor(4)
+        self._gateway.handle({"cmd": Command.SET_CONFIG_SENSOR.value, "number": "4", "type": "hygrometer"})
+        self._api.get_state_sensor(4)
+
+        self.assertEqual(self._api.get_config_sensor(4)["type"], "hygrometer")
+
+    def test_invalidate(self):
+        mirror = self._api.get_config_mirror()
+        self._api.get_config_actuator(1)
+        self._api.get_config_sensor(1)
+
+        mirror.invalidate(Node.ACTUATOR)
+        self._api.get_config_actuator(1)
+        self._api.get_config_sensor(1)
+
+        self.assertEqual(mirror.get_stats(), {"hits": 1, "misses": 3})
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(xs1api.XS1().get_config_mirror())
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+from tests import SimulatedGatewayTestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import FunctionType
+from xs1_api_client.async_api import AsyncXS1
+from xs1_api_client.confirmation import ConfirmationTracker, ConfirmationTimeout
+from xs1_api_client.simulator import SimulatedGateway
+
+
+class TestConfirmation(SimulatedGatewayTestBase):
+
+    _gateway_options = {"actuators": 20, "sensors": 0, "transmit_delay": 0.1}
+
+    def create_api(self, api_class=xs1api.XS1, **kwargs):
+        tracker = ConfirmationTracker(timeout=5, initial_delay=0.01, max_delay=0.05)
+        return super(TestConfirmation, self).create_api(api_class, confirmation_tracker=tracker, **kwargs)
+
+    def _count_requests(self, command: str) -> int:
+        return sum(1 for parameters in self.get_requests() if parameters["cmd"] == command)
+
+    def test_write_is_confirmed(self):
+        actuator = self._api.get_actuator_by_number(1)
+
+        confirmation = actuator.set_value(42, confirm=True)
+        self.assertEqual(actuator.new_value(), 42)
+        self.assertNotEqual(actuator.value(), 42)
+
+        self.assertIs(confirmation.result(5), actuator)
+        self.assertEqual(actuator.value(), 42)
+
+    def test_no_confirmation_requested(self):
+        actuator = self._api.get_actuator_by_number(1)
+        self.assertIsNone(actuator.set_value(42))
+        self.assertEqual(self._api.get_confirmation_tracker().get_pending(), 0)
+
+    def test_confirmations_share_requests(self):
+        switches = [actuator for actuator in self._api.get_all_actuators() if actuator.type() == "switch"]
+        self._api._send_request.reset_mock()
+
+        confirmations = [switch.turn_on(confirm=True) if not switch.value() else switch.turn_off(confirm=True)
+                         for switch in switches]
+        for confirmation in confirmations:
+            self.assertTrue(confirmation.wait(5))
+
+        tracker = self._api.get_confirmation_tracker()
+        self.assertEqual(self._count_requests("get_list_actuators"), tracker.get_stats()["rounds"])
+        self.assertLess(tracker.get_stats()["rounds"], 20)
+        self.assertEqual(tracker.get_pending(), 0)
+
+    def test_function_call(self):
+        actuator = self._api.get_actuator_by_number(1)
+        function = actuator.get_function_by_type(FunctionType.ON if not actuator.value() else FunctionType.OFF)
+
+        confirmation = function.execute(confirm=True)
+        self.assertTrue(confirmation.wait(5))
+
+    def test_timeout(self):
+        self._gateway = SimulatedGateway(actuators=5, sensors=0, transmit_delay=60)
+        actuator = self._api.get_actuator_by_number(1)
+
+        start = time.monotonic()
+        actuator.set_value(77)
+        confirmation = self._api.confirm_write(actuator, timeout=0.1)
+        with self.assertRaises(ConfirmationTimeout):
+            confirmation.result(5)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self._api.get_confirmation_tracker().get_stats()["timeouts"], 1)
+
+    def test_already_confirmed(self):
+        self._gateway = SimulatedGateway(actuators=5, sensors=0)
+        actuator = self._api.get_actuator_by_number(1)
+        self._api._send_request.reset_mock()
+
+        confirmation = actuator.set_value(12, confirm=True)
+
+        self.assertTrue(confirmation.done())
+        self.assertEqual(self._api._send_request.call_count, 1)
+
+    def test_async_confirmation(self):
+        api = self.create_api(AsyncXS1)
+
+        async def write():
+            actuator = await api.get_actuator_by_number(2)
+            confirmation = await actuator.set_value(55, confirm=True)
+            return await asyncio.wait_for(confirmation, 5)
+
+        actuator = asyncio.run(write())
+        self.assertEqual(actuator.value(), 55)
+        api.close()
@@ -0,0 +1,44 @@
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from xs1_api_client import decoding
+from xs1_api_client.decoding import decode_jsonp
+
+
+class TestDecoding(unittest.TestCase):
+
+    @staticmethod
+    def get_api_response_bytes(filename: str) -> bytes:
+        file_path = os.path.join(os.path.dirname(__file__), 'api_responses', filename)
+        with open(file_path, 'rb') as f:
+            return b"callback(" + f.read() + b")\n"
+
+    def assert_decodes_fixtures(self):
+        directory = os.path.join(os.path.dirname(__file__), 'api_responses')
+        for filename in os.listdir(directory):
+            body = self.get_api_response_bytes(filename)
+            text = body.decode('utf-8')
+            expected = json.loads(text[text.index('{'):text.rindex('}') + 1])
+
+            self.assertEqual(decode_jsonp(body), expected, filename)
+
+    def test_decode_fixtures(self):
+        self.assert_decodes_fixtures()
+
+    def test_decode_fixtures_without_orjson(self):
+        with patch.object(decoding, 'orjson', None):
+            self.assert_decodes_fixtures()
+
+    def test_decode_unwrapped(self):
+        self.assertEqual(decode_jsonp(b'{"version": 16}'), {"version": 16})
+
+    def test_decode_non_utf8(self):
+        body = 'callback({"dsc": "16°C"})'.encode('iso-8859-1')
+
+        self.assertEqual(decode_jsonp(body, 'iso-8859-1'), {"dsc": "16°C"})
+
+    def test_decode_invalid(self):
+        with self.assertRaises(ValueError):
+            decode_jsonp(b'<html>Unauthorized</html>')
@@ -1,6 +1,6 @@
 from unittest.mock import MagicMock
 
-from tests import XS1TestBase
+from tests import XS1TestBase, get_parameters
 from xs1_api_client.api_constants import Node, UrlParam, FunctionType, ActuatorType
 
 
@@ -74,6 +74,22 @@ class TestXS1(XS1TestBase):
         self.assertEqual(response[Node.ACTUATOR.value][Node.PARAM_VALUE.value], 0)
         self.assertIsNotNone(response)
 
+    def test_actuator_call_function_uses_number(self):
+        api_response = TestXS1.get_api_response("get_list_actuators")
+        # the id of an actuator is not necessarily its (1-based) position in the list
+        api_response["actuator"][2]["id"] = 42
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        actuator_3 = self._underTest.get_actuator_by_number(3)
+        self.assertNotEqual(actuator_3.id(), actuator_3.number())
+
+        api_response = TestXS1.get_api_response("call_actuator_function")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        actuator_3.call_function(actuator_3.get_functions()[0])
+
+        parameters = get_parameters(self._underTest._send_request.call_args[0][0])
+        self.assertEqual(parameters["number"], "3")
+        self.assertEqual(parameters["function"], "1")
+
     def test_api_update_specific_actuator(self):
         api_response = TestXS1.get_api_response("get_list_actuators")
         self._underTest._send_request = MagicMock(return_value=api_response)
@@ -89,3 +105,56 @@ class TestXS1(XS1TestBase):
 
         self.assertEqual(actuator_1.value(), 16.0)
         self.assertEqual(actuator_1.new_value(), 18.0)
+
+    def test_api_get_state_actuators(self):
+        api_response = TestXS1.get_api_response("get_list_actuators")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        actuator_1 = self._underTest.get_actuator(1)
+
+        api_response = TestXS1.get_api_response("get_state_actuator__updated")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+
+        results = self._underTest.get_state_actuators([actuator_1], max_workers=8)
+
+        self.assertEqual(list(results.keys()), [1])
+        self.assertEqual(actuator_1.value(), 16.0)
+        self.assertEqual(actuator_1.new_value(), 18.0)
+
+    def test_api_get_state_actuators_partial_failure(self):
+        api_response = TestXS1.get_api_response("get_list_actuators")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        actuators = self._underTest.get_all_actuators()
+        actuator_1, actuator_3 = actuators[0], actuators[2]
+
+        def send_request(request_url: str) -> dict:
+            if "number=1" in request_url:
+                return TestXS1.get_api_response("get_state_actuator__updated")
+            # a response without an actuator node
+            return {"version": 16, "type": "get_state_actuator"}
+
+        self._underTest._send_request = MagicMock(side_effect=send_request)
+        results = self._underTest.get_state_actuators([actuator_1, actuator_3])
+
+        self.assertEqual(actuator_1.value(), 16.0)
+        self.assertIsInstance(results[3], Exception)
+        self.assertEqual(actuator_3.value(), api_response["actuator"][2]["value"])
+
+    def test_api_refresh(self):
+        api_response = TestXS1.get_api_response("get_list_actuators")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        actuators = self._underTest.get_all_actuators()
+        actuator_1, actuator_3 = actuators[0], actuators[2]
+
+        api_response = TestXS1.get_api_response("get_list_actuators")
+        api_response["actuator"][0]["value"] = 42.0
+        api_response["actuator"][2]["newvalue"] = 13.0
+        self._underTest._send_request = MagicMock(return_value=api_response)
+
+        self._underTest.refresh([actuator_1, actuator_3])
+
+        self.assertEqual(self._underTest._send_request.call_count, 1)
+        self.assertIn("cmd=get_list_actuators", self._underTest._send_request.call_args[0][0])
+        self.assertEqual(actuator_1.value(), 42.0)
+        self.assertEqual(actuator_1.number(), 1)
+        self.assertEqual(actuator_3.new_value(), 13.0)
+        self.assertEqual(actuators[1].value(), api_response["actuator"][1]["value"])
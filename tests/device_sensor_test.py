@@ -53,3 +53,52 @@ class TestXS1(XS1TestBase):
 
         response = self._underTest.get_state_sensor(1)
         self.assertIsNotNone(response)
+
+    def test_api_get_state_sensors(self):
+        api_response = TestXS1.get_api_response("get_list_sensors")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        sensors = self._underTest.get_all_sensors()[:3]
+
+        state_response = TestXS1.get_api_response("get_state_sensor")
+
+        def send_request(request_url: str) -> dict:
+            if request_url.endswith("number=2"):
+                raise ValueError("Invalid api response")
+            return state_response
+
+        self._underTest._send_request = MagicMock(side_effect=send_request)
+
+        results = self._underTest.get_state_sensors(sensors + [1, 5])
+
+        self.assertEqual(set(results.keys()), {1, 2, 3, 5})
+        self.assertEqual(self._underTest._send_request.call_count, 4)
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(results[5], state_response)
+
+        # devices are updated in place, failed ones are left untouched
+        self.assertEqual(sensors[0].name(), "broken")
+        self.assertNotEqual(sensors[1].name(), "broken")
+        self.assertEqual(sensors[2].name(), "broken")
+
+    def test_api_refresh(self):
+        actuator_response = TestXS1.get_api_response("get_list_actuators")
+        sensor_response = TestXS1.get_api_response("get_list_sensors")
+        self._underTest._send_request = MagicMock(return_value=sensor_response)
+        sensors = self._underTest.get_all_sensors()
+        self._underTest._send_request = MagicMock(return_value=actuator_response)
+        actuator = self._underTest.get_all_actuators()[0]
+
+        sensor_response = TestXS1.get_api_response("get_list_sensors")
+        sensor_response["sensor"][1]["value"] = -5.0
+
+        def send_request(request_url: str) -> dict:
+            return sensor_response if "cmd=get_list_sensors" in request_url else actuator_response
+
+        self._underTest._send_request = MagicMock(side_effect=send_request)
+
+        # one list request per device kind, no matter how many devices
+        self._underTest.refresh(sensors + [actuator])
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+        self.assertEqual(sensors[1].value(), -5.0)
+        self.assertEqual(sensors[1].number(), 2)
@@ -1,5 +1,71 @@
+from unittest.mock import MagicMock
+
 from tests import XS1TestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import ActuatorType, SensorType
+from xs1_api_client.device.actuator import XS1Actuator
+from xs1_api_client.device.sensor import XS1Sensor
 
 
 class TestXS1(XS1TestBase):
-    pass
+
+    def test_devices_have_no_instance_dict(self):
+        api_response = TestXS1.get_api_response("get_list_actuators")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        actuators = self._underTest.get_all_actuators()
+
+        api_response = TestXS1.get_api_response("get_list_sensors")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        sensors = self._underTest.get_all_sensors()
+
+        for device in actuators + sensors:
+            self.assertFalse(hasattr(device, "__dict__"), type(device))
+
+    def test_fields_are_parsed(self):
+        actuator = XS1Actuator({"id": 3, "number": 2, "name": "Lamp", "type": "switch", "value": 100.0,
+                                "newvalue": 0.0, "unit": "%", "utime": 1511492305,
+                                "function": [{"type": "on", "dsc": "on"}]}, None)
+
+        self.assertEqual(actuator.id(), 3)
+        self.assertEqual(actuator.number(), 2)
+        self.assertEqual(actuator.name(), "Lamp")
+        self.assertIs(actuator.type(), ActuatorType.SWITCH)
+        self.assertEqual(actuator.value(), 100.0)
+        self.assertEqual(actuator.new_value(), 0.0)
+        self.assertEqual(actuator.unit(), "%")
+        self.assertEqual(actuator.last_update(), 1511492305)
+        self.assertTrue(actuator.enabled())
+        self.assertEqual(len(actuator.get_functions()), 1)
+
+        # actuator types take precedence, unknown types are kept as they are
+        self.assertIs(XS1Sensor({"type": "disabled"}, None).type(), ActuatorType.DISABLED)
+        self.assertFalse(XS1Sensor({"type": "disabled"}, None).enabled())
+        self.assertIs(XS1Sensor({"type": "hygrometer"}, None).type(), SensorType.HYGROMETER)
+        self.assertEqual(XS1Sensor({"type": "flux_capacitor"}, None).type(), "flux_capacitor")
+
+    def test_set_state_merges(self):
+        sensor = XS1Sensor({"id": 1, "number": 1, "name": "Outside", "type": "temperature", "value": 1.0,
+                            "unit": "°C", "utime": 1}, None)
+        sensor.set_state({"value": 2.5, "utime": 2})
+
+        self.assertEqual(sensor.value(), 2.5)
+        self.assertEqual(sensor.last_update(), 2)
+        self.assertEqual(sensor.name(), "Outside")
+        self.assertEqual(sensor.get_state(), {"id": 1, "number": 1, "name": "Outside", "type": "temperature",
+                                              "value": 2.5, "newvalue": None, "unit": "°C", "utime": 2})
+
+    def test_keep_raw_state(self):
+        state = {"id": 1, "name": "Outside", "type": "temperature", "value": 1.0, "utime": 1, "custom": "x"}
+        sensor = XS1Sensor(state, None, keep_raw=True)
+        sensor.set_state({"value": 2.0})
+
+        self.assertEqual(sensor.get_state(), dict(state, value=2.0))
+        # the api response isn't modified
+        self.assertEqual(state["value"], 1.0)
+        self.assertNotIn("custom", XS1Sensor(state, None).get_state())
+
+        api = xs1api.XS1(keep_raw_state=True)
+        api._send_request = MagicMock(return_value=TestXS1.get_api_response("get_list_actuators"))
+        api._apply_connection_info(self._test_host)
+        actuator = api.get_all_actuators()[0]
+        self.assertEqual(actuator.get_state()["function"][0], {"type": "auto", "dsc": "16°C"})
@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import Command, Node
+from xs1_api_client.event_stream import XS1EventStream, parse_event, format_event
+from xs1_api_client.resilience import RetryPolicy
+from xs1_api_client.simulator import XS1Simulator
+from xs1_api_client.transport.cassette import RecordingTransport, ReplayTransport
+from xs1_api_client.transport.http_client_transport import HttpClientTransport
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    """
+    Answers every subscription with the next scripted list of event lines and closes the connection.
+    Other requests are answered by the simulated gateway of the server.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if "cmd=subscribe" not in self.path:
+            server.simulator_handler(self)
+            return
+
+        server.subscriptions += 1
+        lines = server.script.pop(0) if server.script else []
+        body = "".join(line + "\n" for line in lines).encode('utf-8')
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestXS1EventStream(unittest.TestCase):
+
+    def setUp(self):
+        self._simulator = XS1Simulator(actuators=5, sensors=5)
+        self._simulator.start()
+        self._api = xs1api.XS1(retry_policy=RetryPolicy(max_retries=0))
+        self._api.set_connection_info(self._simulator.host, self._simulator.port)
+
+    def tearDown(self):
+        self._simulator.stop()
+
+    def _wait_for(self, condition, timeout: float = 5) -> bool:
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def test_parse_event(self):
+        event = parse_event(b"1511492305\t2017\t11\t24\tfr\t3\t58\t25\t+0100\tA\t3\tswitch\t100.0\r\n")
+        self.assertEqual(event.node, Node.ACTUATOR)
+        self.assertEqual(event.number, 3)
+        self.assertEqual(event.device_type, "switch")
+        self.assertEqual(event.value, 100.0)
+        self.assertEqual(event.utime, 1511492305)
+
+        self.assertIsNone(parse_event(""))
+        self.assertIsNone(parse_event("1511492305 2017 11 24 fr 3 58 25 +0100 X 3 switch 100.0"))
+        self.assertIsNone(parse_event("1511492305 2017 11 24 fr 3 58 25 +0100 S 3 temperature warm"))
+
+    def test_format_event(self):
+        line = format_event(Node.SENSOR, 2, "temperature", 21.5, 1511492305)
+        event = parse_event(line)
+        self.assertEqual((event.node, event.number, event.value), (Node.SENSOR, 2, 21.5))
+
+    def test_events_update_registered_devices(self):
+        actuator = self._api.get_actuator_by_number(1)
+        sensor = self._api.get_sensor_by_number(2)
+        received = []
+
+        with XS1EventStream(self._api) as stream:
+            stream.register(actuator, sensor)
+            stream.add_listener(received.append)
+            self.assertTrue(stream.wait_connected(5))
+
+            self._simulator.gateway.handle({"cmd": Command.SET_STATE_ACTUATOR.value, "number": "1", "value": "42"})
+            self._simulator.gateway.handle({"cmd": Command.SET_STATE_SENSOR.value, "number": "2", "value": "7.5"})
+            self.assertTrue(self._wait_for(lambda: len(received) == 2))
+
+        self.assertEqual(actuator.value(), 42)
+        self.assertEqual(actuator.new_value(), 42)
+        self.assertEqual(sensor.value(), 7.5)
+        self.assertEqual(stream.get_stats()["events"], 2)
+
+    def test_record_and_replay(self):
+        transport = RecordingTransport(HttpClientTransport())
+        api = xs1api.XS1(transport=transport, retry_policy=RetryPolicy(max_retries=0))
+        api.set_connection_info(self._simulator.host, self._simulator.port)
+        received = []
+
+        with XS1EventStream(api) as stream:
+            stream.add_listener(received.append)
+            self.assertTrue(stream.wait_connected(5))
+            self._simulator.gateway.handle({"cmd": Command.SET_STATE_ACTUATOR.value, "number": "3", "value": "42"})
+            self.assertTrue(self._wait_for(lambda: len(received) == 1))
+
+        replay_api = xs1api.XS1(transport=ReplayTransport(transport.get_cassette()),
+                                retry_policy=RetryPolicy(max_retries=0))
+        replay_api.set_connection_info(self._simulator.host, self._simulator.port)
+        replayed = []
+
+        with XS1EventStream(replay_api) as stream:
+            stream.add_listener(replayed.append)
+            self.assertTrue(self._wait_for(lambda: len(replayed) >= 1))
+
+        self.assertEqual((replayed[0].number, replayed[0].value), (3, 42))
+
+    def test_reconnect_resyncs_devices(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ScriptedHandler)
+        server.daemon_threads = True
+        server.subscriptions = 0
+        server.script = [
+            [format_event(Node.ACTUATOR, 1, "switch", 100.0, 1000), "garbage"],
+            [format_event(Node.ACTUATOR, 1, "switch", 50.0, 2000)],
+        ]
+
+        # answer regular requests like the simulator does
+        simulated = self._simulator.gateway
+
+        def simulator_handler(handler):
+            body = ("callback(%s)" % json.dumps(simulated.handle(dict(parse_qsl(urlsplit(handler.path).query))))
+                    ).encode('utf-8')
+            handler.send_response(200)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+
+        server.simulator_handler = simulator_handler
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+
+        try:
+            self._api._apply_connection_info(*server.server_address)
+            actuator = self._api.get_actuator_by_number(1)
+            received = []
+
+            stream = XS1EventStream(self._api, reconnect_delay=0.01, max_reconnect_delay=0.01)
+            stream.register(actuator)
+            stream.add_listener(received.append)
+            with stream:
+                self.assertTrue(self._wait_for(lambda: stream.get_stats()["resyncs"] >= 3))
+
+            self.assertEqual([event.value for event in received], [100.0, 50.0])
+
+            # the resync after the last reconnection restored the state of the gateway
+            self.assertEqual(actuator.value(), simulated.handle(
+                {"cmd": Command.GET_STATE_ACTUATOR.value, "number": "1"})["actuator"]["value"])
+
+            stats = stream.get_stats()
+            self.assertGreaterEqual(stats["connects"], 3)
+            self.assertGreaterEqual(stats["resyncs"], 3)
+            self.assertEqual(stats["invalid_lines"], 1)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_stop_interrupts_reading(self):
+        stream = XS1EventStream(self._api)
+        stream.start()
+        self.assertTrue(stream.wait_connected(5))
+
+        start = time.monotonic()
+        stream.stop(5)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(stream.is_connected())
@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+
+from tests import XS1TestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.governor import ConcurrencyGovernor
+from xs1_api_client.resilience import RetryPolicy
+
+
+class TestConcurrencyGovernor(unittest.TestCase):
+
+    def test_additive_increase(self):
+        governor = ConcurrencyGovernor(initial_limit=2, max_limit=4)
+
+        for _ in range(20):
+            governor.execute(lambda: None)
+
+        self.assertEqual(governor.get_limit(), 4)
+
+    def test_slow_requests_do_not_increase(self):
+        governor = ConcurrencyGovernor(initial_limit=2, latency_threshold=0.0)
+
+        governor.execute(time.sleep, 0.01)
+
+        self.assertEqual(governor.get_limit(), 2)
+
+    def test_multiplicative_decrease(self):
+        governor = ConcurrencyGovernor(initial_limit=8, max_limit=8)
+
+        def fail():
+            raise requests.exceptions.ReadTimeout()
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            governor.execute(fail)
+        self.assertEqual(governor.get_limit(), 4)
+
+        for _ in range(5):
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                governor.execute(fail)
+        self.assertEqual(governor.get_limit(), 1)
+        self.assertEqual(governor.get_in_flight(), 0)
+
+    def test_api_errors_do_not_decrease(self):
+        governor = ConcurrencyGovernor(initial_limit=2)
+
+        def fail():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            governor.execute(fail)
+
+        self.assertEqual(governor.get_limit(), 2)
+
+    def test_limits_concurrency(self):
+        governor = ConcurrencyGovernor(initial_limit=2, max_limit=2)
+        release = threading.Event()
+
+        threads = [threading.Thread(target=governor.execute, args=(release.wait, 5)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+
+        self.assertEqual(governor.get_in_flight(), 2)
+        self.assertEqual(governor.get_queue_depth(), 3)
+
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(governor.get_in_flight(), 0)
+        self.assertEqual(governor.get_queue_depth(), 0)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            ConcurrencyGovernor(initial_limit=10, max_limit=5)
+
+
+class TestXS1(XS1TestBase):
+
+    def test_requests_pass_governor(self):
+        governor = ConcurrencyGovernor()
+        api = xs1api.XS1(governor=governor, retry_policy=RetryPolicy(max_retries=0))
+        api._send_request = MagicMock(side_effect=requests.exceptions.ConnectionError())
+        api._apply_connection_info(self._test_host)
+
+        governor.execute = MagicMock(wraps=governor.execute)
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            api.get_protocol_info()
+
+        governor.execute.assert_called_once()
+        self.assertIs(api.get_governor(), governor)
+
+    def test_bulk_workers(self):
+        api = xs1api.XS1(pool_size=4)
+        self.assertEqual(api.get_bulk_workers(10), min(api.DEFAULT_BULK_WORKERS, 4))
+        self.assertEqual(api.get_bulk_workers(10, max_workers=2), 2)
+        self.assertEqual(api.get_bulk_workers(3, max_workers=8), 3)
+
+        api = xs1api.XS1(governor=ConcurrencyGovernor(max_limit=6), pool_size=10)
+        self.assertEqual(api.get_bulk_workers(20), 6)
@@ -0,0 +1,146 @@
+import copy
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import MagicMock
+
+from tests import XS1TestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import Command
+from xs1_api_client.metadata_cache import MetadataCache, gateway_key
+from xs1_api_client.resilience import RetryPolicy
+
+
+class TestXS1(XS1TestBase):
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._responses = {
+            command: TestXS1.get_api_response(command) for command in
+            ["get_config_info", "get_list_systems", "get_list_functions", "get_types_actuators", "get_types_sensors"]
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def _send_request(self, request_url: str) -> dict:
+        for command, response in self._responses.items():
+            if "cmd=%s" % command in request_url:
+                return response
+        raise AssertionError("unexpected request %s" % request_url)
+
+    def _create_api(self, send_request=None) -> xs1api.XS1:
+        api = xs1api.XS1(metadata_cache=MetadataCache(self._directory), retry_policy=RetryPolicy(max_retries=0))
+        api._send_request = MagicMock(side_effect=send_request or self._send_request)
+        api.set_connection_info(self._test_host)
+        return api
+
+    def test_cold_start_fills_cache(self):
+        api = self._create_api()
+        api.get_list_systems()
+        api.get_list_systems()
+
+        self.assertEqual(api._send_request.call_count, 2)
+        self.assertTrue(os.path.exists(os.path.join(self._directory, "gateways.json")))
+
+    def test_warm_start_without_network(self):
+        api = self._create_api()
+        for method in [api.get_list_systems, api.get_list_functions, api.get_types_actuators,
+                       api.get_types_sensors]:
+            method()
+
+        def unreachable(request_url: str) -> dict:
+            raise ConnectionError("gateway unreachable")
+
+        api = self._create_api(unreachable)
+        self.assertEqual(api.get_gateway_name(), "xs1")
+        self.assertEqual(len(api.get_list_functions()), len(self._responses["get_list_functions"]["function"]))
+        self.assertTrue(api.get_types_sensors())
+
+        # the failing revalidation keeps the cached metadata
+        api.wait_for_revalidation(5)
+        self.assertEqual(api.get_gateway_mac(), self._responses["get_config_info"]["info"]["mac"])
+
+    def test_revalidation_after_firmware_update(self):
+        api = self._create_api()
+        api.get_list_functions()
+
+        self._responses["get_config_info"]["info"]["firmware"] = "5.0.0.1"
+        api = self._create_api()
+        api.wait_for_revalidation(5)
+
+        self.assertEqual(api.get_gateway_firmware_version(), "5.0.0.1")
+        api.get_list_functions()
+        commands = [call[0][0].split("cmd=")[1] for call in api._send_request.call_args_list]
+        self.assertEqual(commands, ["get_config_info", "get_list_functions"])
+
+    def test_revalidation_is_dropped_after_host_change(self):
+        api = self._create_api()
+        api.get_list_functions()
+        cached = MetadataCache(self._directory).get("%s:80" % self._test_host, Command.GET_CONFIG_INFO)
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_request(request_url: str) -> dict:
+            if "cmd=get_config_info" in request_url and not started.is_set():
+                started.set()
+                release.wait(5)
+                response = copy.deepcopy(self._responses["get_config_info"])
+                response["info"]["firmware"] = "5.0.0.1"
+                return response
+            return self._send_request(request_url)
+
+        api = self._create_api(slow_request)
+        self.assertTrue(started.wait(5))
+        api._apply_connection_info("otherhost")
+        release.set()
+        api.wait_for_revalidation(5)
+
+        self.assertFalse(api.has_config_info())
+        self.assertEqual(MetadataCache(self._directory).get("%s:80" % self._test_host, Command.GET_CONFIG_INFO),
+                         cached)
+
+    def test_unreadable_files_are_ignored(self):
+        with open(os.path.join(self._directory, "gateways.json"), 'w') as f:
+            f.write("{not json")
+
+        api = self._create_api()
+        self.assertEqual(api._send_request.call_count, 1)
+
+    def test_gateway_key(self):
+        config_info = self._responses["get_config_info"]
+        self.assertEqual(gateway_key(config_info), "%s_%s" % (
+            config_info["info"]["mac"].replace(":", "-"), config_info["info"]["firmware"]))
+        self.assertIsNone(gateway_key({}))
+
+    def test_responses_are_copies(self):
+        cache = MetadataCache(self._directory)
+        cache.put("host:80", Command.GET_CONFIG_INFO, self._responses["get_config_info"])
+        cache.get("host:80", Command.GET_CONFIG_INFO)["info"]["mac"] = "changed"
+
+        self.assertNotEqual(cache.get("host:80", Command.GET_CONFIG_INFO)["info"]["mac"], "changed")
+        self.assertIsNone(cache.get("other:80", Command.GET_CONFIG_INFO))
+
+    def test_clear_only_removes_cache_files(self):
+        with open(os.path.join(self._directory, "settings.json"), 'w') as f:
+            f.write("{}")
+
+        cache = MetadataCache(self._directory)
+        cache.put("host:80", Command.GET_CONFIG_INFO, self._responses["get_config_info"])
+        cache.put("host:80", Command.GET_LIST_SYSTEMS, self._responses["get_list_systems"])
+        cache.clear()
+
+        self.assertEqual(os.listdir(self._directory), ["settings.json"])
+        self.assertIsNone(MetadataCache(self._directory).get("host:80", Command.GET_CONFIG_INFO))
+
+    def test_failed_writes_leave_no_files(self):
+        cache = MetadataCache(self._directory)
+        cache.put("host:80", Command.GET_CONFIG_INFO, self._responses["get_config_info"])
+        files = sorted(os.listdir(self._directory))
+
+        # not serializable
+        cache.put("host:80", Command.GET_LIST_SYSTEMS, {"system": [object()]})
+
+        self.assertEqual(sorted(os.listdir(self._directory)), files)
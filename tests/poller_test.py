@@ -0,0 +1,146 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from tests import SimulatedGatewayTestBase
+from xs1_api_client.api_constants import Command, Node
+from xs1_api_client.poller import XS1Poller
+from xs1_api_client.simulator import SimulatedGateway
+
+
+class TestXS1Poller(SimulatedGatewayTestBase):
+
+    def create_gateway(self) -> SimulatedGateway:
+        # time passes on the simulated gateway by increasing self._elapsed
+        self._elapsed = 0.0
+        return SimulatedGateway(actuators=10, sensors=10, clock=lambda: time.time() + self._elapsed)
+
+    def _set_value(self, number: int, value: float) -> None:
+        self._gateway.handle({"cmd": Command.SET_STATE_ACTUATOR.value, "number": str(number), "value": str(value)})
+
+    def test_only_changes_are_reported(self):
+        poller = XS1Poller(self._api, sensors=False)
+        self.assertEqual(poller.poll(), [])
+        self.assertEqual(poller.poll(), [])
+
+        self._set_value(4, 42)
+        events = poller.poll()
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].node, Node.ACTUATOR)
+        self.assertEqual(events[0].number, 4)
+        self.assertEqual(events[0].new_state["value"], 42)
+        self.assertIn("value", events[0].get_changed_properties())
+        self.assertNotIn("id", events[0].get_changed_properties())
+        self.assertEqual(poller.poll(), [])
+
+    def test_failed_cycle_keeps_changes(self):
+        poller = XS1Poller(self._api)
+        poller.poll()
+
+        self._set_value(4, 42)
+        send_request = self._api._send_request.side_effect
+
+        def fail_sensors(request_url: str) -> dict:
+            if Command.GET_LIST_SENSORS.value in request_url:
+                raise ConnectionError("gateway unreachable")
+            return send_request(request_url)
+
+        self._api._send_request.side_effect = fail_sensors
+        self.assertRaises(ConnectionError, poller.poll)
+
+        # the actuator change is reported by the next successful cycle
+        self._api._send_request.side_effect = send_request
+        events = poller.poll()
+        self.assertEqual([(event.node, event.number) for event in events], [(Node.ACTUATOR, 4)])
+
+    def test_emit_initial(self):
+        poller = XS1Poller(self._api, emit_initial=True)
+        events = poller.poll()
+
+        self.assertEqual(len(events), 20)
+        self.assertIsNone(events[0].old_state)
+
+    def test_sensor_changes(self):
+        poller = XS1Poller(self._api, actuators=False)
+        poller.poll()
+
+        # let an hour pass on the simulated gateway
+        self._elapsed += 3600
+        events = poller.poll()
+
+        self.assertTrue(events)
+        for event in events:
+            self.assertEqual(event.node, Node.SENSOR)
+            self.assertTrue(event.get_changed_properties())
+
+    def test_registry_devices_are_updated(self):
+        actuator = self._api.get_registry().get_actuator_by_number(2)
+        poller = XS1Poller(self._api, sensors=False)
+        poller.poll()
+
+        self._set_value(2, 13)
+        event, = poller.poll()
+
+        self.assertIs(event.device, actuator)
+        self.assertEqual(actuator.value(), 13)
+
+    def test_cycle_stats(self):
+        poller = XS1Poller(self._api)
+        self.assertIsNone(poller.get_last_cycle())
+        poller.poll()
+        self._set_value(1, 5)
+        poller.poll()
+
+        cycle = poller.get_last_cycle()
+        self.assertEqual(cycle["devices"], 20)
+        self.assertEqual(cycle["events"], 1)
+        self.assertGreater(cycle["request_time"], 0)
+        self.assertGreaterEqual(cycle["diff_time"], 0)
+
+        stats = poller.get_stats()
+        self.assertEqual(stats["cycles"], 2)
+        self.assertEqual(stats["events"], 1)
+
+    def test_listeners(self):
+        received = []
+        changed = threading.Event()
+
+        def listener(event):
+            received.append(event)
+            changed.set()
+
+        poller = XS1Poller(self._api, interval=0.01, sensors=False)
+        poller.add_listener(lambda event: 1 / 0)
+        poller.add_listener(listener)
+        with poller:
+            # wait for the initial cycle
+            while poller.get_stats()["cycles"] == 0:
+                changed.wait(0.01)
+            self._set_value(7, 99)
+            self.assertTrue(changed.wait(5))
+
+        self.assertEqual(received[0].number, 7)
+
+    def test_iterator(self):
+        poller = XS1Poller(self._api, interval=0.01, sensors=False, emit_initial=True)
+
+        numbers = []
+        for event in poller.events():
+            numbers.append(event.number)
+            if len(numbers) == 10:
+                poller.stop()
+
+        self.assertEqual(numbers, list(range(1, 11)))
+
+    def test_failed_cycles_are_counted(self):
+        poller = XS1Poller(self._api, interval=0.01)
+        self._api._send_request = MagicMock(side_effect=ValueError("invalid response"))
+
+        with poller:
+            deadline = time.monotonic() + 5
+            while poller.get_stats()["errors"] < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertGreaterEqual(poller.get_stats()["errors"], 2)
+        self.assertEqual(poller.get_stats()["cycles"], 0)
@@ -0,0 +1,98 @@
+from unittest.mock import MagicMock
+
+from tests import XS1TestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import ActuatorType, SensorType
+from xs1_api_client.device.actuator import XS1Actuator
+from xs1_api_client.device.actuator.switch import XS1Switch
+
+
+class TestXS1(XS1TestBase):
+
+    def setUp(self):
+        self._underTest = xs1api.XS1(warm_registry=True)
+        self._underTest._send_request = MagicMock(side_effect=self._send_request)
+        self._underTest._apply_connection_info(self._test_host)
+
+    @staticmethod
+    def _send_request(request_url: str) -> dict:
+        return TestXS1.get_api_response(
+            "get_list_actuators" if "get_list_actuators" in request_url else "get_list_sensors")
+
+    def test_lookups_are_fresh_by_default(self):
+        api = xs1api.XS1()
+        api._send_request = MagicMock(side_effect=self._send_request)
+        api._apply_connection_info(self._test_host)
+        actuator = api.get_actuator(3)
+
+        updated = TestXS1.get_api_response("get_list_actuators")
+        updated["actuator"][2]["value"] = 42.0
+        api._send_request = MagicMock(return_value=updated)
+
+        self.assertEqual(api.get_actuator(3).value(), 42.0)
+        self.assertEqual(api.get_actuator_by_number(3).value(), 42.0)
+        self.assertEqual(api._send_request.call_count, 2)
+        # objects returned before aren't changed
+        self.assertEqual(actuator.value(), 0.0)
+
+    def test_lookups_share_a_single_request(self):
+        actuator = self._underTest.get_actuator(3)
+        self.assertIs(self._underTest.get_actuator_by_number(3), actuator)
+        self.assertIs(self._underTest.get_registry().get_actuator_by_name(actuator.name()), actuator)
+        self.assertIsNotNone(self._underTest.get_sensor(2))
+        self.assertIsNotNone(self._underTest.get_sensor_by_number(2))
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+
+    def test_lookup_by_type(self):
+        registry = self._underTest.get_registry()
+
+        switches = registry.get_actuators_by_type(ActuatorType.SWITCH)
+        self.assertTrue(switches)
+        for switch in switches:
+            self.assertIsInstance(switch, XS1Switch)
+        self.assertEqual(registry.get_actuators_by_type("switch"), switches)
+
+        for sensor in registry.get_sensors_by_type(SensorType.TEMPERATURE):
+            self.assertEqual(sensor.type(), SensorType.TEMPERATURE)
+
+    def test_unknown_device_refreshes_once(self):
+        self._underTest.get_actuator(1)
+        self.assertIsNone(self._underTest.get_actuator(12345))
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+
+    def test_refresh_keeps_device_objects(self):
+        registry = self._underTest.get_registry()
+        actuators = registry.get_actuators()
+
+        updated = TestXS1.get_api_response("get_list_actuators")
+        updated["actuator"][2]["value"] = 42.0
+        self._underTest._send_request = MagicMock(return_value=updated)
+        refreshed = registry.refresh_actuators()
+
+        for old, new in zip(actuators, refreshed):
+            self.assertIs(old, new)
+        self.assertEqual(actuators[2].value(), 42.0)
+
+    def test_refresh_replaces_devices_of_another_kind(self):
+        registry = self._underTest.get_registry()
+        switch = registry.get_actuator_by_number(3)
+        self.assertIsInstance(switch, XS1Switch)
+
+        updated = TestXS1.get_api_response("get_list_actuators")
+        updated["actuator"][2]["type"] = ActuatorType.TEMPERATURE.value
+        self._underTest._send_request = MagicMock(return_value=updated)
+        registry.refresh_actuators()
+
+        actuator = registry.get_actuator_by_number(3)
+        self.assertIsNot(actuator, switch)
+        self.assertIs(type(actuator), XS1Actuator)
+        self.assertEqual(registry.get_actuators_by_type(ActuatorType.TEMPERATURE).count(actuator), 1)
+
+    def test_connection_info_change_clears_registry(self):
+        self._underTest.get_actuator(1)
+        self._underTest._apply_connection_info("otherhost")
+        self._underTest.get_actuator(1)
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
@@ -0,0 +1,161 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+from urllib3.util.retry import Retry
+
+from tests import XS1TestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.resilience import RetryBudget, RetryPolicy, CircuitBreaker, CircuitOpenError
+
+
+def server_error(status_code: int) -> requests.exceptions.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(response=response)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, min_tokens=1)
+
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.should_retry(requests.exceptions.ReadTimeout(), 1))
+        self.assertTrue(policy.should_retry(server_error(503), 2))
+        self.assertFalse(policy.should_retry(server_error(503), 3))
+        self.assertFalse(policy.should_retry(server_error(401), 1))
+        self.assertFalse(policy.should_retry(ValueError(), 1))
+
+    def test_should_not_retry_without_budget(self):
+        policy = RetryPolicy(budget=RetryBudget(min_tokens=0))
+
+        self.assertFalse(policy.should_retry(requests.exceptions.ReadTimeout(), 1))
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=1.5)
+
+        self.assertEqual(policy.get_backoff(1), 0.5)
+        self.assertEqual(policy.get_backoff(2), 1.0)
+        self.assertEqual(policy.get_backoff(3), 1.5)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.get_state(), CircuitBreaker.CLOSED)
+        self.assertFalse(breaker.before_request())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.get_state(), CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+
+        time.sleep(0.1)
+        self.assertTrue(breaker.before_request())
+        self.assertEqual(breaker.get_state(), CircuitBreaker.HALF_OPEN)
+
+        # only a single probe is allowed
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_failure()
+        self.assertEqual(breaker.get_state(), CircuitBreaker.OPEN)
+
+        time.sleep(0.1)
+        self.assertTrue(breaker.before_request())
+        breaker.record_success()
+        self.assertEqual(breaker.get_state(), CircuitBreaker.CLOSED)
+
+
+class TestXS1(XS1TestBase):
+
+    def setUp(self):
+        self._underTest = xs1api.XS1(retry_policy=RetryPolicy(max_retries=1, backoff_factor=0),
+                                     circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.05))
+        self._underTest._apply_connection_info(self._test_host)
+
+    def test_retries_gateway_failures(self):
+        api_response = TestXS1.get_api_response("get_state_sensor")
+        self._underTest._send_request = MagicMock(side_effect=[requests.exceptions.ReadTimeout(), api_response])
+
+        self.assertEqual(self._underTest.get_state_sensor(1), api_response)
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+
+    def test_does_not_retry_client_errors(self):
+        self._underTest._send_request = MagicMock(side_effect=server_error(401))
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self._underTest.get_state_sensor(1)
+        self._underTest._send_request.assert_called_once()
+
+    def test_fails_fast_while_gateway_is_down(self):
+        self._underTest._send_request = MagicMock(side_effect=requests.exceptions.ConnectionError())
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self._underTest.get_state_sensor(1)
+        # a request counts as a single failure, including its retries
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+        self.assertEqual(self._underTest.get_circuit_breaker().get_state(), CircuitBreaker.CLOSED)
+
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self._underTest.get_state_sensor(1)
+        self.assertEqual(self._underTest._send_request.call_count, 6)
+
+        with self.assertRaises(CircuitOpenError):
+            self._underTest.get_state_sensor(1)
+        self.assertEqual(self._underTest._send_request.call_count, 6)
+
+    def test_probes_gateway_with_protocol_info(self):
+        self._underTest._send_request = MagicMock(side_effect=requests.exceptions.ConnectionError())
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self._underTest.get_state_sensor(1)
+        self.assertEqual(self._underTest.get_circuit_breaker().get_state(), CircuitBreaker.OPEN)
+
+        time.sleep(0.1)
+        api_response = TestXS1.get_api_response("get_state_sensor")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+
+        self.assertEqual(self._underTest.get_state_sensor(1), api_response)
+
+        self.assertEqual(self._underTest._send_request.call_count, 2)
+        self.assertTrue(self._underTest._send_request.call_args_list[0][0][0].endswith("cmd=get_protocol_info"))
+        self.assertEqual(self._underTest.get_circuit_breaker().get_state(), CircuitBreaker.CLOSED)
+
+    def test_deprecated_retry_strategy(self):
+        with self.assertWarns(DeprecationWarning):
+            self.assertEqual(xs1api.XS1.RETRY_STRATEGY.total, 5)
+
+        class LegacyXS1(xs1api.XS1):
+            RETRY_STRATEGY = Retry(total=2, backoff_factor=0)
+
+        with self.assertWarns(DeprecationWarning):
+            api = LegacyXS1()
+        api._send_request = MagicMock(side_effect=requests.exceptions.ConnectionError())
+        api._apply_connection_info(self._test_host)
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            api.get_state_sensor(1)
+        self.assertEqual(api._send_request.call_count, 3)
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from tests import SimulatedGatewayTestBase, get_parameters
+from xs1_api_client.api_constants import Command, FunctionType
+from xs1_api_client.scene import SceneExecutor, SceneCommand
+
+
+class TestSceneExecutor(SimulatedGatewayTestBase):
+
+    _gateway_options = {"actuators": 10, "sensors": 0}
+
+    def setUp(self):
+        super(TestSceneExecutor, self).setUp()
+        self._delay = 0.0
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._written = []
+
+    def send_request(self, request_url: str) -> dict:
+        parameters = get_parameters(request_url)
+        if parameters["cmd"] != Command.SET_STATE_ACTUATOR.value:
+            return self._gateway.handle(parameters)
+
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        time.sleep(self._delay)
+        with self._lock:
+            self._in_flight -= 1
+            self._written.append(int(parameters["number"]))
+        return self._gateway.handle(parameters)
+
+    def test_values_and_functions(self):
+        # actuator 1 is a switch, actuator 3 a temperature actuator without on/off functions
+        switch = self._api.get_actuator_by_number(1)
+        report = SceneExecutor(self._api).execute([
+            (switch, FunctionType.ON),
+            (2, 40),
+            (3, FunctionType.OFF),
+            (99, 10),
+        ])
+
+        self.assertEqual([result.succeeded() for result in report.results], [True, True, False, False])
+        self.assertIs(report.results[0].actuator, switch)
+        self.assertEqual(switch.new_value(), 100)
+        self.assertEqual(report.results[1].actuator.new_value(), 40)
+        self.assertIsInstance(report.results[2].error, LookupError)
+        self.assertEqual(len(report.get_failed()), 2)
+        self.assertFalse(report.succeeded())
+        for result in report.results:
+            self.assertGreaterEqual(result.latency, 0)
+
+    def test_commands_run_concurrently(self):
+        self._delay = 0.1
+        report = SceneExecutor(self._api, max_workers=4).execute([(number, 100) for number in range(1, 9)])
+
+        self.assertTrue(report.succeeded())
+        self.assertEqual(self._max_in_flight, 4)
+        self.assertLess(report.duration, 0.6)
+        for result in report.results:
+            self.assertGreaterEqual(result.latency, 0.1)
+
+    def test_groups_are_ordered(self):
+        self._delay = 0.02
+        commands = [SceneCommand(number, 0, group=number % 3) for number in range(1, 10)]
+        SceneExecutor(self._api).execute(commands)
+
+        groups = [number % 3 for number in self._written]
+        self.assertEqual(groups, sorted(groups))
+
+    def test_pacing(self):
+        report = SceneExecutor(self._api, max_workers=4, pacing=0.05).execute(
+            [(number, 100) for number in range(1, 6)])
+
+        started = sorted(result.started_at for result in report.results)
+        for previous, current in zip(started, started[1:]):
+            self.assertGreaterEqual(current - previous, 0.045)
+
+    def test_empty_scene(self):
+        report = SceneExecutor(self._api).execute([])
+        self.assertEqual(report.results, [])
+        self.assertTrue(report.succeeded())
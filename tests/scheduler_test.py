@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock
+
+from tests import SimulatedGatewayTestBase
+from xs1_api_client.api_constants import Command, SensorType
+from xs1_api_client.scheduler import AdaptiveScheduler, DEFAULT_ACTUATOR_INTERVAL, SENSOR_INTERVALS
+
+
+class TestAdaptiveScheduler(SimulatedGatewayTestBase):
+
+    _gateway_options = {"actuators": 5, "sensors": 8}
+
+    def setUp(self):
+        super(TestAdaptiveScheduler, self).setUp()
+        self._now = 1000.0
+
+    def _create_scheduler(self, **kwargs) -> AdaptiveScheduler:
+        return AdaptiveScheduler(clock=lambda: self._now, **kwargs)
+
+    def _sensor_of_type(self, sensor_type: SensorType):
+        for sensor in self._api.get_all_sensors():
+            if sensor.type() == sensor_type:
+                return sensor
+        raise AssertionError("no %s sensor" % sensor_type)
+
+    def _requested_numbers(self, command: Command) -> [int]:
+        return [int(parameters["number"]) for parameters in self.get_requests() if parameters["cmd"] == command.value]
+
+    def test_base_interval_by_type(self):
+        door = self._sensor_of_type(SensorType.DOOROPEN)
+        barometer = self._sensor_of_type(SensorType.BAROMETER)
+        actuator = self._api.get_actuator_by_number(1)
+        disabled = self._api.get_sensor_by_number(8)
+        self.assertFalse(disabled.enabled())
+
+        scheduler = self._create_scheduler(intervals={SensorType.BAROMETER.value: 120.0})
+        scheduler.add(door, barometer, actuator, disabled)
+
+        self.assertEqual(scheduler.get_interval(door), SENSOR_INTERVALS[SensorType.DOOROPEN.value])
+        self.assertEqual(scheduler.get_interval(barometer), 120.0)
+        self.assertEqual(scheduler.get_interval(actuator), DEFAULT_ACTUATOR_INTERVAL)
+        self.assertIsNone(scheduler.get_interval(disabled))
+
+    def test_interval_adapts_to_changes(self):
+        actuator = self._api.get_actuator_by_number(1)
+        scheduler = self._create_scheduler()
+        scheduler.add(actuator)
+
+        scheduler.run_pending()
+        stretched = scheduler.get_interval(actuator)
+        self.assertGreater(stretched, DEFAULT_ACTUATOR_INTERVAL)
+
+        self._gateway.handle({"cmd": Command.SET_STATE_ACTUATOR.value, "number": "1", "value": "33"})
+        changed = []
+        scheduler.add_listener(changed.append)
+        self._now += stretched
+        scheduler.run_pending()
+
+        self.assertLess(scheduler.get_interval(actuator), stretched)
+        self.assertEqual(changed, [actuator])
+        self.assertEqual(actuator.value(), 33)
+
+        # the interval never leaves its bounds
+        for _ in range(20):
+            self._now += scheduler.get_interval(actuator)
+            scheduler.run_pending()
+        self.assertEqual(scheduler.get_interval(actuator), DEFAULT_ACTUATOR_INTERVAL * 4)
+
+    def test_only_due_devices_are_polled(self):
+        door = self._sensor_of_type(SensorType.DOOROPEN)
+        barometer = self._sensor_of_type(SensorType.BAROMETER)
+        scheduler = self._create_scheduler(budget=100)
+        scheduler.add(door, barometer)
+        self._api._send_request.reset_mock()
+
+        scheduler.run_pending()
+        for _ in range(10):
+            self._now += 1
+            scheduler.run_pending()
+
+        numbers = self._requested_numbers(Command.GET_STATE_SENSOR)
+        self.assertEqual(numbers.count(barometer.number()), 1)
+        self.assertGreater(numbers.count(door.number()), 5)
+
+    def test_budget(self):
+        actuators = self._api.get_all_actuators(enabled=True)
+        scheduler = self._create_scheduler(budget=2)
+        scheduler.add(*actuators)
+        self._api._send_request.reset_mock()
+
+        wait = scheduler.run_pending()
+        self.assertEqual(self._api._send_request.call_count, 2)
+        self.assertAlmostEqual(wait, 0.5)
+        self.assertEqual(scheduler.get_stats()["deferred"], 1)
+
+        self._now += 0.5
+        scheduler.run_pending()
+        self.assertEqual(self._api._send_request.call_count, 3)
+
+    def test_removed_devices_are_not_polled(self):
+        actuator = self._api.get_actuator_by_number(1)
+        scheduler = self._create_scheduler()
+        scheduler.add(actuator)
+        scheduler.remove(actuator)
+        self._api._send_request.reset_mock()
+
+        scheduler.run_pending()
+        self.assertEqual(self._api._send_request.call_count, 0)
+        self.assertIsNone(scheduler.get_interval(actuator))
+
+    def test_failed_polls_are_rescheduled(self):
+        actuator = self._api.get_actuator_by_number(1)
+        scheduler = self._create_scheduler()
+        scheduler.add(actuator)
+        self._api._send_request = MagicMock(side_effect=ValueError("invalid response"))
+
+        scheduler.run_pending()
+        self.assertEqual(scheduler.get_stats()["errors"], 1)
+        self.assertEqual(scheduler.get_interval(actuator), DEFAULT_ACTUATOR_INTERVAL)
@@ -0,0 +1,136 @@
+import time
+import unittest
+
+from xs1_api_client import api as xs1api
+from xs1_api_client.api_constants import Command, ErrorCode, UrlParam
+from xs1_api_client.event_stream import parse_event
+from xs1_api_client.resilience import RetryPolicy
+from xs1_api_client.simulator import SimulatedGateway, XS1Simulator
+from xs1_api_client.transport import HTTPStatusError
+from xs1_api_client.transport.http_client_transport import HttpClientTransport
+
+
+class TestSimulatedGateway(unittest.TestCase):
+
+    def setUp(self):
+        self._underTest = SimulatedGateway(actuators=100, sensors=80)
+
+    def _handle(self, command: Command, **parameters) -> dict:
+        parameters[UrlParam.COMMAND.value] = command.value
+        return self._underTest.handle(parameters)
+
+    def test_all_commands(self):
+        for command in Command:
+            response = self._handle(command, number=1, value=1)
+            self.assertEqual(command.value, response["type"])
+            self.assertNotIn("error", response)
+
+    def test_device_count(self):
+        self.assertEqual(100, len(self._handle(Command.GET_LIST_ACTUATORS)["actuator"]))
+        self.assertEqual(80, len(self._handle(Command.GET_LIST_SENSORS)["sensor"]))
+
+        info = self._handle(Command.GET_CONFIG_INFO)["info"]
+        self.assertEqual(100, info["maxactuators"])
+        self.assertEqual(80, info["maxsensors"])
+
+    def test_unknown_number(self):
+        response = self._handle(Command.GET_STATE_ACTUATOR, number=101)
+        self.assertEqual(ErrorCode.NOT_FOUND.value, response["error"])
+
+    def test_unknown_command(self):
+        response = self._underTest.handle({UrlParam.COMMAND.value: "unknown"})
+        self.assertEqual(ErrorCode.INVALID_COMMAND.value, response["error"])
+
+    def test_set_state_actuator(self):
+        response = self._handle(Command.SET_STATE_ACTUATOR, number=2, value=42)
+        self.assertEqual(42, response["actuator"]["newvalue"])
+        self.assertEqual(42, self._handle(Command.GET_STATE_ACTUATOR, number=2)["actuator"]["value"])
+
+    def test_set_state_actuator_function(self):
+        self._handle(Command.SET_STATE_ACTUATOR, number=1, function=2)
+        self.assertEqual(0, self._handle(Command.GET_STATE_ACTUATOR, number=1)["actuator"]["value"])
+
+        self._handle(Command.SET_STATE_ACTUATOR, number=1, function=1)
+        self.assertEqual(100, self._handle(Command.GET_STATE_ACTUATOR, number=1)["actuator"]["value"])
+
+    def test_transmit_delay(self):
+        self._underTest = SimulatedGateway(actuators=1, sensors=1, transmit_delay=0.1)
+        self._handle(Command.SET_STATE_ACTUATOR, number=1, value=42)
+
+        actuator = self._handle(Command.GET_STATE_ACTUATOR, number=1)["actuator"]
+        self.assertEqual(42, actuator["newvalue"])
+        self.assertNotEqual(42, actuator["value"])
+
+        time.sleep(0.15)
+        self.assertEqual(42, self._handle(Command.GET_STATE_ACTUATOR, number=1)["actuator"]["value"])
+
+    def test_events_are_pushed_after_transmission(self):
+        self._underTest = SimulatedGateway(actuators=1, sensors=1, transmit_delay=0.1)
+        events = self._underTest.subscribe()
+        self._handle(Command.SET_STATE_ACTUATOR, number=1, value=42)
+        self.assertTrue(events.empty())
+
+        event = parse_event(events.get(timeout=1))
+        self.assertEqual(42, event.value)
+        self.assertEqual(42, self._handle(Command.GET_STATE_ACTUATOR, number=1)["actuator"]["value"])
+        self.assertTrue(events.empty())
+
+    def test_set_config_actuator(self):
+        self._handle(Command.SET_CONFIG_ACTUATOR, number=1, name="Renamed")
+        self.assertEqual("Renamed", self._handle(Command.GET_CONFIG_ACTUATOR, number=1)["actuator"]["name"])
+        self.assertEqual("Renamed", self._handle(Command.GET_LIST_ACTUATORS)["actuator"][0]["name"])
+
+    def test_sensor_values_change(self):
+        now = [time.time()]
+        self._underTest = SimulatedGateway(actuators=100, sensors=80, clock=lambda: now[0])
+        now[0] += 1800
+        first = [sensor["value"] for sensor in self._handle(Command.GET_LIST_SENSORS)["sensor"]]
+        now[0] += 1800
+        second = [sensor["value"] for sensor in self._handle(Command.GET_LIST_SENSORS)["sensor"]]
+
+        self.assertNotEqual(first, second)
+
+
+class TestXS1Simulator(unittest.TestCase):
+
+    def setUp(self):
+        self._simulator = XS1Simulator(actuators=10, sensors=12)
+        self._simulator.start()
+        self._underTest = xs1api.XS1(self._simulator.host, self._simulator.port, transport=HttpClientTransport(),
+                                     retry_policy=RetryPolicy(max_retries=0))
+
+    def tearDown(self):
+        self._underTest.close()
+        self._simulator.stop()
+
+    def test_gateway_info(self):
+        self.assertEqual("xs1-simulator", self._underTest.get_gateway_name())
+
+    def test_devices(self):
+        self.assertEqual(10, len(self._underTest.get_all_actuators()))
+        self.assertEqual(12, len(self._underTest.get_all_sensors()))
+
+    def test_set_value(self):
+        actuator = self._underTest.get_actuator(2)
+        actuator.set_value(42)
+
+        self.assertEqual(42, actuator.new_value())
+        self.assertEqual(42, self._underTest.get_actuator(2).value())
+
+    def test_errors(self):
+        self._simulator.error_rate = 1.0
+
+        with self.assertRaises(HTTPStatusError) as context:
+            self._underTest.get_list_functions()
+        self.assertEqual(503, context.exception.status_code)
+
+    def test_latency(self):
+        self._simulator.latency = 0.05
+
+        start = time.perf_counter()
+        self._underTest.get_protocol_info()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
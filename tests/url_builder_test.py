@@ -0,0 +1,142 @@
+from unittest.mock import MagicMock
+
+from requests.utils import requote_uri
+
+from tests import XS1TestBase
+from xs1_api_client.api_constants import Command, UrlParam, Node, FunctionType, ApiConstant
+
+
+def legacy_build_request_url(host: str, port: int, user: str, password: str, command: Command,
+                             parameters: dict = None, ssl: bool = False) -> str:
+    """
+    The request url builder used before url templates were cached, kept as a reference.
+    """
+    request_url = "http"
+    if ssl:
+        request_url += "s"
+    request_url += "://"
+
+    request_url += "%s" % host
+    if port:
+        request_url += ":%s" % port
+
+    request_url += "/control?callback=callback"
+
+    if user and password:
+        request_url += "&%s=%s&%s=%s" % (UrlParam.USER.value, user, UrlParam.PASSWORD.value, password)
+    if isinstance(command, Command):
+        command = command.value
+
+    request_url += "&%s=%s" % (UrlParam.COMMAND.value, command)
+
+    if parameters:
+        processed = {}
+        for k, v in parameters.items():
+            if k == UrlParam.FUNCTION and isinstance(v, list):
+                for idx, func in enumerate(v):
+                    function_type = None
+                    function_description = None
+
+                    for k2, v2 in func.items():
+                        if k2 == "type":
+                            function_type = v2
+                        if k2 == "dsc":
+                            function_description = v2
+
+                    if isinstance(function_type, ApiConstant):
+                        function_type = function_type.value
+                    if isinstance(function_description, ApiConstant):
+                        function_description = function_description.value
+
+                    processed['function%d.type' % (idx + 1)] = str(function_type)
+                    processed['function%d.dsc' % (idx + 1)] = str(function_description)
+
+                continue
+
+            if isinstance(v, ApiConstant):
+                v = v.value
+
+            if isinstance(k, ApiConstant):
+                processed[k.value] = v
+            else:
+                k = str(k)
+                if k not in processed:
+                    processed[k] = v
+
+        for key, value in processed.items():
+            request_url += "&%s=%s" % (key, value)
+
+    return request_url
+
+
+class TestXS1(XS1TestBase):
+    CONNECTIONS = [
+        ("testhost", 80, None, None, False),
+        ("192.168.2.1", None, "User", "Password", False),
+        ("192.168.2.1", 1234, "User", "Password", True),
+    ]
+
+    REQUESTS = [
+        (Command.GET_CONFIG_INFO, None),
+        (Command.GET_LIST_ACTUATORS, {}),
+        ("get_list_sensors", None),
+        (Command.GET_STATE_SENSOR, {UrlParam.NUMBER: 3}),
+        (Command.GET_STATE_ACTUATOR, {"number": 64}),
+        (Command.SET_STATE_ACTUATOR, {UrlParam.NUMBER: 3, UrlParam.VALUE: 100}),
+        (Command.SET_STATE_ACTUATOR, {UrlParam.NUMBER: 3, UrlParam.VALUE: 16.5}),
+        (Command.SET_STATE_ACTUATOR, {UrlParam.NUMBER: 3, UrlParam.FUNCTION: 2}),
+        (Command.SET_STATE_SENSOR, {UrlParam.VALUE: 1, UrlParam.NUMBER: 5}),
+        (Command.SET_CONFIG_SENSOR, {UrlParam.NAME: "Keller", "name": "ignored", UrlParam.TYPE: "hygrometer",
+                                     UrlParam.FACTOR: 1.0, "number": 2}),
+        (Command.SET_CONFIG_ACTUATOR, {UrlParam.NAME: "Fernsehlampe",
+                                       UrlParam.TYPE: "switch",
+                                       UrlParam.FUNCTION: [
+                                           {Node.PARAM_TYPE: FunctionType.ON, Node.PARAM_DESCRIPTION: "16°C"},
+                                           {UrlParam.TYPE: FunctionType.OFF, "dsc": "OFF"},
+                                           {UrlParam.TYPE: FunctionType.DISABLED, "dsc": ""},
+                                       ],
+                                       UrlParam.LOG: "off",
+                                       UrlParam.NUMBER: 1}),
+    ]
+
+    def test_matches_legacy_builder(self):
+        """
+        Tests that the cached url templates produce the same urls as the old builder
+        (after the url normalization done by requests)
+        """
+        for host, port, user, password, ssl in self.CONNECTIONS:
+            self._underTest._send_request = MagicMock(return_value={})
+            self._underTest.set_connection_info(host, port, ssl, user, password)
+
+            for command, parameters in self.REQUESTS:
+                # build twice to use the cached templates
+                for _ in range(2):
+                    expected = legacy_build_request_url(host, port, user, password, command, parameters, ssl)
+                    actual = self._underTest._build_request_url(command, parameters, ssl)
+
+                    self.assertEqual(requote_uri(expected), actual)
+
+    def test_url_encoding(self):
+        self._underTest._send_request = MagicMock(return_value={})
+        self._underTest.set_connection_info("testhost", user="User", password="p&ss=word")
+
+        request_url = self._underTest._build_request_url(Command.SET_CONFIG_ACTUATOR,
+                                                         {UrlParam.NAME: "a+b#c", UrlParam.NUMBER: 1})
+
+        self.assertEqual(request_url, "http://testhost/control?callback=callback&user=User&pwd=p%26ss%3Dword"
+                                      "&cmd=set_config_actuator&name=a%2Bb%23c&number=1")
+
+    def test_templates_are_rebuilt_on_connection_change(self):
+        self.assertTrue(self._underTest._build_request_url(Command.GET_LIST_SENSORS).startswith("http://testhost/"))
+
+        self._underTest._send_request = MagicMock(return_value={})
+        self._underTest.set_connection_info("otherhost", 8080)
+
+        self.assertEqual(self._underTest._build_request_url(Command.GET_LIST_SENSORS),
+                         "http://otherhost:8080/control?callback=callback&cmd=get_list_sensors")
+
+    def test_missing_host(self):
+        self._underTest._apply_connection_info(None)
+
+        with self.assertRaises(Exception):
+            self._underTest._build_request_url(Command.GET_LIST_SENSORS)
@@ -1,6 +1,9 @@
+import threading
 from unittest.mock import MagicMock
 
 from tests import XS1TestBase
+from xs1_api_client import api as xs1api
+from xs1_api_client.resilience import RetryPolicy
 
 
 class TestXS1(XS1TestBase):
@@ -96,3 +99,87 @@ class TestXS1(XS1TestBase):
         for t in self._underTest.get_types_sensors():
             sensor_type = SensorType(t['name'])
             self.assertIsNotNone(sensor_type)
+
+    def test_session_is_reused(self):
+        """
+        Tests that consecutive requests share the same pooled session
+        """
+
+        transport = self._underTest.get_transport()
+        session = transport._get_session()
+        self.assertIs(session, transport._get_session())
+
+        adapter = session.get_adapter("http://%s" % self._test_host)
+        self.assertEqual(adapter._pool_maxsize, self._underTest.DEFAULT_POOL_SIZE)
+
+    def test_session_is_rebuilt_on_connection_change(self):
+        """
+        Tests that changing the connection info discards the old connection pool
+        """
+
+        transport = self._underTest.get_transport()
+        old_session = transport._get_session()
+
+        api_response = TestXS1.get_api_response("get_config_info")
+        self._underTest._send_request = MagicMock(return_value=api_response)
+        self._underTest.set_connection_info(host="192.168.2.1")
+
+        self.assertIsNot(old_session, transport._get_session())
+
+    def test_close(self):
+        """
+        Tests closing the connection pool manually and via the context manager protocol
+        """
+
+        with xs1api.XS1(pool_size=2) as api:
+            session = api.get_transport()._get_session()
+            self.assertEqual(session.get_adapter("https://host")._pool_maxsize, 2)
+
+        self.assertIsNone(api.get_transport()._session)
+
+        self._underTest.get_transport()._get_session()
+        self._underTest.close()
+        self.assertIsNone(self._underTest.get_transport()._session)
+
+    def test_lazy_config_info(self):
+        api = xs1api.XS1(self._test_host, config_info=xs1api.XS1.CONFIG_INFO_LAZY)
+        api._send_request = MagicMock(return_value=TestXS1.get_api_response("get_config_info"))
+        api.set_connection_info(self._test_host)
+        self.assertEqual(api._send_request.call_count, 0)
+
+        self.assertEqual(api.get_gateway_name(), "xs1")
+        self.assertEqual(api.get_gateway_mac(), "00:1B:C5:01:D9:B3")
+        self.assertEqual(api._send_request.call_count, 1)
+
+    def test_prefetched_config_info(self):
+        api = xs1api.XS1(config_info=xs1api.XS1.CONFIG_INFO_PREFETCH)
+        release = threading.Event()
+
+        def send_request(request_url: str) -> dict:
+            release.wait(5)
+            return TestXS1.get_api_response("get_config_info")
+
+        api._send_request = MagicMock(side_effect=send_request)
+        api.set_connection_info(self._test_host)
+
+        # returns immediately, first use waits for the prefetch
+        threading.Timer(0.1, release.set).start()
+        self.assertEqual(api.get_gateway_name(), "xs1")
+        self.assertEqual(api.get_gateway_uptime(), 963766)
+        self.assertEqual(api._send_request.call_count, 1)
+
+    def test_prefetch_failure_surfaces_on_first_use(self):
+        api = xs1api.XS1(config_info=xs1api.XS1.CONFIG_INFO_PREFETCH, retry_policy=RetryPolicy(max_retries=0))
+        api._send_request = MagicMock(side_effect=ValueError("invalid response"))
+        api.set_connection_info(self._test_host)
+
+        with self.assertRaises(ValueError):
+            api.get_gateway_name()
+
+        # the next use tries again
+        api._send_request = MagicMock(return_value=TestXS1.get_api_response("get_config_info"))
+        self.assertEqual(api.get_gateway_name(), "xs1")
+
+    def test_invalid_config_info_mode(self):
+        with self.assertRaises(ValueError):
+            xs1api.XS1(config_info="sometimes")
@@ -1,3 +1,11 @@
 import xs1_api_client.api
 from xs1_api_client.api import XS1
 from xs1_api_client import api_constants
+
+
+def __getattr__(name: str):
+    # asyncio is expensive to import, so only load the async api when it is actually used
+    if name == 'AsyncXS1':
+        from xs1_api_client.async_api import AsyncXS1
+        return AsyncXS1
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
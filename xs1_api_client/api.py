@@ -5,26 +5,95 @@ This is the main xs1_api_client api which contains the XS1 object to interact wi
 Example usage can be found in the example.py file
 """
 
-import json
-
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import inspect
+import re
+import threading
+import time
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import quote
 
 from xs1_api_client.api_constants import UrlParam, Command, Node, ActuatorType, ErrorCode, ApiConstant
+from xs1_api_client.caching import ResponseCache
+from xs1_api_client.coalescing import SingleFlight, WriteQueue
+from xs1_api_client.config_mirror import ConfigMirror
+from xs1_api_client.confirmation import ConfirmationTracker, WriteConfirmation
+from xs1_api_client.decoding import decode_jsonp
+from xs1_api_client.governor import ConcurrencyGovernor
+from xs1_api_client.metadata_cache import MetadataCache
+from xs1_api_client.registry import DeviceRegistry
+from xs1_api_client.resilience import RetryPolicy, CircuitBreaker, is_gateway_failure
+from xs1_api_client.transport import Transport
+from xs1_api_client.device import XS1Device
 from xs1_api_client.device.actuator import XS1Actuator
 from xs1_api_client.device.actuator.switch import XS1Switch
 from xs1_api_client.device.sensor import XS1Sensor
 
 
+class _DeprecatedRetryStrategy(object):
+    """
+    Descriptor of the deprecated XS1.RETRY_STRATEGY, warns on access.
+    """
+
+    _retry = None
+
+    def __get__(self, instance, owner):
+        warnings.warn("XS1.RETRY_STRATEGY is deprecated, pass a RetryPolicy as retry_policy instead",
+                      DeprecationWarning, stacklevel=2)
+        if self._retry is None:
+            # the urllib3 retry strategy used before retries were handled by RetryPolicy
+            from urllib3.util.retry import Retry
+            self._retry = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
+        return self._retry
+
+
 class XS1:
     """
     This class is the main api interface that handles all communication with the XS1 gateway.
     """
-    # setup retry and backoff strategy
-    RETRY_STRATEGY = Retry(total=5,
-                           backoff_factor=0.1,
-                           status_forcelist=[500, 502, 503, 504])
+    # deprecated: the retry behaviour is specified by the retry_policy,
+    # a (urllib3) Retry set by a subclass is still converted to a RetryPolicy
+    RETRY_STRATEGY = _DeprecatedRetryStrategy()
+
+    # default number of keep-alive connections held open to the gateway
+    DEFAULT_POOL_SIZE = 10
+    # default number of concurrent requests used by bulk operations
+    # the gateway is a small embedded device, so keep this low
+    DEFAULT_BULK_WORKERS = 4
+    # timeout of a single request in seconds
+    REQUEST_TIMEOUT = 5
+
+    # when the config info of the gateway is requested
+    # EAGER: while setting the connection info (blocking), LAZY: on first use of a get_gateway_* method,
+    # PREFETCH: in the background while setting the connection info, first use waits for it if necessary
+    CONFIG_INFO_EAGER = 'eager'
+    CONFIG_INFO_LAZY = 'lazy'
+    CONFIG_INFO_PREFETCH = 'prefetch'
+
+    # characters that are left as they are when url encoding parameters
+    _URL_SAFE_CHARACTERS = "/:@!$'()*,;~"
+    _URL_SAFE_VALUE = re.compile(r"^[a-zA-Z0-9_.\-/:@!$'()*,;~]*$")
+    # parameter combinations with a shortcut in _build_request_url
+    _NUMBER_PARAMETER = (UrlParam.NUMBER,)
+    _NUMBER_VALUE_PARAMETERS = (UrlParam.NUMBER, UrlParam.VALUE)
+    _NUMBER_URL_TEMPLATE = "%%s&%s=%%s" % UrlParam.NUMBER.value
+    _NUMBER_VALUE_URL_TEMPLATE = "%%s&%s=%%s&%s=%%s" % (UrlParam.NUMBER.value, UrlParam.VALUE.value)
+    # responses containing device names and types observed by the configuration mirror
+    _MIRROR_LIST_NODES = {
+        Command.GET_LIST_ACTUATORS.value: Node.ACTUATOR,
+        Command.GET_LIST_SENSORS.value: Node.SENSOR,
+    }
+    _MIRROR_STATE_NODES = {
+        Command.GET_STATE_ACTUATOR.value: Node.ACTUATOR,
+        Command.SET_STATE_ACTUATOR.value: Node.ACTUATOR,
+        Command.GET_STATE_SENSOR.value: Node.SENSOR,
+        Command.SET_STATE_SENSOR.value: Node.SENSOR,
+    }
+    # device classes by actuator type value, other actuators are represented by XS1Actuator
+    _ACTUATOR_CLASSES = {
+        ActuatorType.SWITCH.value: XS1Switch,
+        ActuatorType.DIMMER.value: XS1Switch,
+    }
 
     _host = None
     _port = None
@@ -32,9 +101,34 @@ class XS1:
     _user = None
     _password = None
     _config_info = None
+    _config_info_mode = CONFIG_INFO_EAGER
+    _config_info_prefetch = None
+    _pool_size = DEFAULT_POOL_SIZE
+    _transport = None
+    _single_flight = None
+    _governor = None
+    _retry_policy = None
+    _circuit_breaker = None
+    _response_cache = None
+    _config_mirror = None
+    _metadata_cache = None
+    _revalidation = None
+    _connection_generation = 0
+    _registry = None
+    _warm_registry = False
+    _confirmations = None
+    _write_queue = None
+    _keep_raw_state = False
+    _url_templates = {}
 
     def __init__(self, host: str = None, port: int or None = 80, ssl: bool = False, user: str = None,
-                 password: str = None) -> None:
+                 password: str = None, pool_size: int = DEFAULT_POOL_SIZE, coalesce_requests: bool = False,
+                 governor: ConcurrencyGovernor = None, retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None, transport: Transport = None,
+                 response_cache: ResponseCache = None, mirror_config: bool = False,
+                 metadata_cache: MetadataCache = None, config_info: str = CONFIG_INFO_EAGER,
+                 confirmation_tracker: ConfirmationTracker = None, write_queue: WriteQueue = None,
+                 keep_raw_state: bool = False, warm_registry: bool = False) -> None:
         """
         Creates a new api object.
         :param host: host address of the gateway api
@@ -42,28 +136,217 @@ class XS1:
         :param ssl: uses HTTPS instead of HTTP if set to True
         :param user: username for authentication
         :param password: password for authentication
-        """
+        :param pool_size: max number of keep-alive connections kept open to the gateway (by the default transport)
+        :param coalesce_requests: let concurrent identical read requests share a single gateway request
+        :param governor: limits the number of concurrent requests sent to the gateway
+        :param retry_policy: specifies how failed requests are retried, a default RetryPolicy if None
+        :param circuit_breaker: rejects requests while the gateway is down, a default CircuitBreaker if None
+        :param transport: sends the HTTP requests to the gateway, a RequestsTransport if None
+        :param response_cache: serves responses of read requests from memory while they are fresh
+        :param mirror_config: keep the device configurations in memory
+                              until a device list or state shows a different name or type
+        :param metadata_cache: stores static gateway metadata on disk, so it is available immediately
+                               on the next start (and revalidated in the background)
+        :param config_info: when the config info of the gateway is requested:
+                            CONFIG_INFO_EAGER, CONFIG_INFO_LAZY or CONFIG_INFO_PREFETCH
+        :param confirmation_tracker: checks if confirmed writes reached their devices,
+                                     a default ConfirmationTracker if None
+        :param write_queue: collapses rapid successive writes to the same actuator to the latest one
+        :param keep_raw_state: let device objects keep their complete api responses (see XS1Device.get_state()),
+                               by default they only keep their parsed properties
+        :param warm_registry: let single device lookups (f.ex. get_actuator) return the shared device objects
+                              of the device registry, which only requests the device list if it doesn't know
+                              the device. By default every lookup requests the current device list.
+        """
+        self._connection_lock = threading.Lock()
+        self._pool_size = pool_size
+        if transport is None:
+            # only import requests if it is actually used
+            from xs1_api_client.transport.requests_transport import RequestsTransport
+            transport = RequestsTransport(pool_size)
+        self._transport = transport
+        self._governor = governor
+        if retry_policy is None:
+            retry_policy = self._get_legacy_retry_policy() or RetryPolicy()
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        if coalesce_requests:
+            self._single_flight = SingleFlight()
+        self._response_cache = response_cache
+        if mirror_config:
+            self._config_mirror = ConfigMirror()
+        self._metadata_cache = metadata_cache
+        if config_info not in (self.CONFIG_INFO_EAGER, self.CONFIG_INFO_LAZY, self.CONFIG_INFO_PREFETCH):
+            raise ValueError("Invalid config info mode: %s" % config_info)
+        self._config_info_mode = config_info
+        self._registry = DeviceRegistry(self, self._get_actuator_class, self._get_sensor_class)
+        self._warm_registry = warm_registry
+        if confirmation_tracker is None:
+            confirmation_tracker = ConfirmationTracker(self)
+        elif confirmation_tracker.get_api() is None:
+            confirmation_tracker.set_api(self)
+        self._confirmations = confirmation_tracker
+        self._write_queue = write_queue
+        self._keep_raw_state = keep_raw_state
         self.set_connection_info(host, port, ssl, user, password)
 
+    def _get_legacy_retry_policy(self) -> RetryPolicy or None:
+        """
+        :return: a retry policy equivalent to the RETRY_STRATEGY of a subclass, None if it isn't overridden
+        """
+        strategy = inspect.getattr_static(type(self), "RETRY_STRATEGY")
+        if isinstance(strategy, _DeprecatedRetryStrategy):
+            return None
+
+        warnings.warn("XS1.RETRY_STRATEGY is deprecated, pass a RetryPolicy as retry_policy instead",
+                      DeprecationWarning, stacklevel=3)
+        return RetryPolicy(max_retries=strategy.total or 0, backoff_factor=strategy.backoff_factor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def set_connection_info(self, host: str, port: int = None, ssl: bool = False, user: str = None,
-                            password: str = None) -> None:
+                            password: str = None, config_info: str = None) -> None:
         """
         Sets private connection info for this XS1 instance.
         This XS1 instance will also immediately use this connection info.
+        Depending on the config info mode the config info of the gateway is requested right away,
+        in the background or on first use.
         :param host: host address of the gateway api
         :param port: host port of the gateway api
         :param ssl: uses HTTPS instead of HTTP if set to True
         :param user: username for authentication
         :param password: password for authentication
+        :param config_info: config info mode used for this call only, the mode of this XS1 instance if None
         """
-        self._host = host
-        self._port = port
-        self._ssl = ssl
-        self._user = user
-        self._password = password
+        if config_info is None:
+            config_info = self._config_info_mode
+        elif config_info not in (self.CONFIG_INFO_EAGER, self.CONFIG_INFO_LAZY, self.CONFIG_INFO_PREFETCH):
+            raise ValueError("Invalid config info mode: %s" % config_info)
+
+        self._apply_connection_info(host, port, ssl, user, password)
+
+        if not host:
+            return
+
+        if self._metadata_cache is not None:
+            cached_config_info = self._metadata_cache.get(self._get_metadata_address(), Command.GET_CONFIG_INFO)
+            if cached_config_info is not None:
+                # warm start, check in the background if the gateway is still the same
+                self._config_info = cached_config_info
+                self._revalidation = threading.Thread(target=self._revalidate_metadata,
+                                                      args=(self._connection_generation,), daemon=True)
+                self._revalidation.start()
+                return
 
-        if host:
+        if config_info == self.CONFIG_INFO_EAGER:
             self.update_config_info()
+        elif config_info == self.CONFIG_INFO_PREFETCH:
+            self._prefetch_config_info()
+
+    def _prefetch_config_info(self) -> None:
+        """
+        Starts requesting the config info in the background.
+        The outcome (including any error) is picked up by the first use of the config info.
+        """
+        prefetch = Future()
+
+        def fetch():
+            try:
+                prefetch.set_result(self._call_static_api(Command.GET_CONFIG_INFO, use_cache=False))
+            except Exception as ex:
+                prefetch.set_exception(ex)
+
+        self._config_info_prefetch = prefetch
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def _get_metadata_address(self) -> str:
+        """
+        :return: the address of the gateway used as a key in the metadata cache
+        """
+        return "%s:%s" % (self._host, self._port)
+
+    def _revalidate_metadata(self, generation: int) -> None:
+        """
+        Requests the current config info of the gateway, replacing the cached one.
+        Other cached metadata is requested again on its next use if the gateway's firmware has changed.
+        The response is dropped if the connection info has changed in the meantime.
+        :param generation: the connection generation (see _apply_connection_info) the revalidation was started for
+        """
+        address = self._get_metadata_address()
+        try:
+            config_info = self.call_api(Command.GET_CONFIG_INFO)
+        except Exception:
+            # keep using the cached config info, the gateway might just be unreachable right now
+            return
+
+        with self._connection_lock:
+            if generation != self._connection_generation:
+                # the response belongs to the previous gateway (or might even come from the new one)
+                return
+            self._metadata_cache.put(address, Command.GET_CONFIG_INFO, config_info)
+            self._config_info = config_info
+
+    def wait_for_revalidation(self, timeout: float = None) -> None:
+        """
+        Waits until the background revalidation of cached metadata (if any) has finished.
+        :param timeout: max time to wait (in seconds)
+        """
+        if self._revalidation is not None:
+            self._revalidation.join(timeout)
+
+    def _apply_connection_info(self, host: str, port: int = None, ssl: bool = False, user: str = None,
+                               password: str = None) -> None:
+        """
+        Sets private connection info for this XS1 instance without contacting the gateway.
+        :param host: host address of the gateway api
+        :param port: host port of the gateway api
+        :param ssl: uses HTTPS instead of HTTP if set to True
+        :param user: username for authentication
+        :param password: password for authentication
+        """
+        if self._write_queue is not None:
+            # queued writes are meant for the old gateway
+            self._write_queue.flush()
+
+        with self._connection_lock:
+            # lets background requests detect that their responses belong to the previous connection
+            self._connection_generation += 1
+            self._host = host
+            self._port = port
+            self._ssl = ssl
+            self._user = user
+            self._password = password
+            self._config_info = None
+            self._config_info_prefetch = None
+        self._url_templates = {}
+        if self._response_cache is not None:
+            # cached responses belong to the old gateway
+            self._response_cache.invalidate()
+        if self._registry is not None:
+            self._registry.clear()
+        if self._config_mirror is not None:
+            self._config_mirror.invalidate()
+
+        # connections of the old session point to the old host
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections to the gateway.
+        This XS1 instance can still be used afterwards, new connections are opened on demand.
+        """
+        if self._transport is not None:
+            self._transport.close()
+
+    def get_transport(self) -> Transport:
+        """
+        :return: the transport used to send requests to the gateway
+        """
+        return self._transport
 
     def get_host(self) -> str or None:
         """
@@ -83,6 +366,106 @@ class XS1:
         """
         return self._password
 
+    def get_auth(self) -> (str, str) or None:
+        """
+        :return: (user, password) tuple used for basic authentication, None if no credentials are set
+        """
+        return (self._user, self._password) if self._user and self._password else None
+
+    def get_request_url(self, command: Command, parameters: dict = None) -> str:
+        """
+        :param command: command parameter for the URL (see api_constants)
+        :param parameters: additional parameters of the command
+        :return: the url of this request to the current gateway
+        """
+        return self._build_request_url(command, parameters, self._ssl)
+
+    def get_config_info_mode(self) -> str:
+        """
+        :return: when the config info of the gateway is requested:
+                 CONFIG_INFO_EAGER, CONFIG_INFO_LAZY or CONFIG_INFO_PREFETCH
+        """
+        return self._config_info_mode
+
+    def get_keep_raw_state(self) -> bool:
+        """
+        :return: True if device objects keep their complete api responses
+        """
+        return self._keep_raw_state
+
+    def get_governor(self) -> ConcurrencyGovernor or None:
+        """
+        :return: the governor limiting concurrent requests to the gateway, if any
+        """
+        return self._governor
+
+    def get_bulk_workers(self, count: int, max_workers: int = None) -> int:
+        """
+        Determines the number of workers used to send multiple requests concurrently.
+        :param count: number of requests to send
+        :param max_workers: max number of concurrent requests,
+                            defaults to the max limit of the governor or DEFAULT_BULK_WORKERS
+        :return: the number of workers, never more than the number of pooled connections or requests
+        """
+        if not max_workers:
+            # let the governor decide how many requests the gateway can handle
+            max_workers = self._governor.get_max_limit() if self._governor else self.DEFAULT_BULK_WORKERS
+
+        return min(max_workers, self._pool_size, count)
+
+    def get_coalescing_stats(self) -> dict:
+        """
+        :return: a dict with the number of coalesced ("hits") and executed ("misses") read requests,
+                 or None if request coalescing is disabled
+        """
+        if self._single_flight is None:
+            return None
+
+        return {
+            "hits": self._single_flight.get_hits(),
+            "misses": self._single_flight.get_misses()
+        }
+
+    def get_registry(self) -> DeviceRegistry:
+        """
+        :return: the registry of device objects used for lookups by id, number, name and type
+        """
+        return self._registry
+
+    def get_write_queue(self) -> WriteQueue or None:
+        """
+        :return: the queue collapsing successive actuator writes, if any
+        """
+        return self._write_queue
+
+    def get_confirmation_tracker(self) -> ConfirmationTracker:
+        """
+        :return: the tracker checking confirmed writes
+        """
+        return self._confirmations
+
+    def get_config_mirror(self) -> ConfigMirror or None:
+        """
+        :return: the mirror of device configurations, None if mirroring is disabled
+        """
+        return self._config_mirror
+
+    def get_response_cache(self) -> ResponseCache or None:
+        """
+        :return: the cache for responses of read requests, if any
+        """
+        return self._response_cache
+
+    def get_cache_stats(self) -> dict or None:
+        """
+        :return: a dict with the number of fresh ("hits") and stale ("stale_hits") responses served from the cache
+                 and the number of requests sent to the gateway ("misses"), or None if there is no response cache
+        """
+        if self._response_cache is None:
+            return None
+
+        return self._response_cache.get_stats()
+
     def call_api(self, command: Command, parameters: dict = None) -> dict:
         """
         Executes a command on the xs1 api and returns it's response as a dictionary (if there was no error).
@@ -91,13 +474,129 @@ class XS1:
         :return: the api response
         """
         request_url = self._build_request_url(command, parameters, self._ssl)
-        response = self._send_request(request_url)
+        if self._response_cache is None:
+            response = self._fetch_response(command, parameters, request_url)
+        elif Command.is_write_command(command):
+            response = self._fetch_response(command, parameters, request_url)
+            self._response_cache.record_write(command, parameters, response)
+        else:
+            response = self._response_cache.get(command, parameters, request_url,
+                                                lambda: self._fetch_response(command, parameters, request_url))
+
+        if self._config_mirror is not None:
+            self._observe_configuration(command, parameters, response)
+
+        return response
+
+    def _observe_configuration(self, command: Command, parameters: dict, response: dict) -> None:
+        """
+        Lets the configuration mirror check device names and types of a response.
+        :param command: the command of the request
+        :param parameters: the parameters of the request
+        :param response: the api response
+        """
+        command_value = command.value if isinstance(command, Command) else command
+
+        node = self._MIRROR_LIST_NODES.get(command_value)
+        if node is not None:
+            self._config_mirror.observe_list(node, response.get(node.value, []))
+            return
+
+        node = self._MIRROR_STATE_NODES.get(command_value)
+        if node is not None:
+            state = response.get(node.value, {})
+            number = state.get(Node.PARAM_NUMBER.value)
+            if number is None and parameters:
+                number = parameters.get(UrlParam.NUMBER, parameters.get(UrlParam.NUMBER.value))
+            if number is not None:
+                self._config_mirror.observe(node, number, state)
+
+    def _fetch_response(self, command: Command, parameters: dict, request_url: str) -> dict:
+        """
+        Requests a response from the gateway (sharing in-flight read requests if coalescing is enabled).
+        :param command: the command of the request
+        :param parameters: the parameters of the request
+        :param request_url: the request url
+        :return: the api response
+        """
+        if self._single_flight is not None and not Command.is_write_command(command):
+            response = self._single_flight.execute(request_url, lambda: self._execute_request(request_url))
+        else:
+            response = self._execute_request(request_url)
 
         # raises an exception if anything is wrong
         self._check_errors(command, parameters, response)
 
         return response
 
+    def get_retry_policy(self) -> RetryPolicy:
+        """
+        :return: the policy used to retry failed requests
+        """
+        return self._retry_policy
+
+    def get_circuit_breaker(self) -> CircuitBreaker:
+        """
+        :return: the circuit breaker guarding requests to the gateway
+        """
+        return self._circuit_breaker
+
+    def _execute_request(self, request_url: str) -> dict:
+        """
+        Sends a request to the gateway guarded by the circuit breaker and retries it according to the retry policy.
+        :param request_url: the request url
+        :return: the api response as a json object
+        """
+        if self._circuit_breaker.before_request():
+            self._probe_gateway()
+
+        self._retry_policy.record_request()
+
+        retry = 0
+        while True:
+            try:
+                response = self._send_governed_request(request_url)
+            except Exception as ex:
+                if not is_gateway_failure(ex):
+                    raise
+
+                retry += 1
+                if self._circuit_breaker.get_state() != CircuitBreaker.CLOSED \
+                        or not self._retry_policy.should_retry(ex, retry):
+                    # a request counts as a single failure, no matter how often it has been retried
+                    self._circuit_breaker.record_failure()
+                    raise
+
+                time.sleep(self._retry_policy.get_backoff(retry))
+                continue
+
+            self._circuit_breaker.record_success()
+            return response
+
+    def _probe_gateway(self) -> None:
+        """
+        Sends a lightweight request to check if the gateway is reachable again
+        and reports the outcome to the circuit breaker.
+        """
+        try:
+            self._send_governed_request(self._build_request_url(Command.GET_PROTOCOL_INFO, ssl=self._ssl))
+        except Exception:
+            self._circuit_breaker.record_failure()
+            raise
+
+        self._circuit_breaker.record_success()
+
+    def _send_governed_request(self, request_url: str) -> dict:
+        """
+        Sends a request to the gateway, respecting the concurrency limit of the governor (if any)
+        :param request_url: the request url
+        :return: the api response as a json object
+        """
+        if self._governor is None:
+            return self._send_request(request_url)
+
+        return self._governor.execute(self._send_request, request_url)
+
     def _build_request_url(self, command: Command, parameters: dict = None, ssl: bool = False) -> str:
         """
         Builds a request url from the input parameters
@@ -106,14 +605,61 @@ class XS1:
         :param ssl: Uses HTTPS instead of HTTP
         :return: request url
         """
+        request_url = self._get_command_url(command, ssl)
+        if not parameters:
+            return request_url
+
+        # shortcuts for the most common requests
+        keys = tuple(parameters)
+        if keys == self._NUMBER_PARAMETER:
+            number, = parameters.values()
+            return self._NUMBER_URL_TEMPLATE % (request_url, self._encode_url_value(number))
+        if keys == self._NUMBER_VALUE_PARAMETERS:
+            number, value = parameters.values()
+            return self._NUMBER_VALUE_URL_TEMPLATE % (request_url, self._encode_url_value(number),
+                                                      self._encode_url_value(value))
+
+        # append any additional parameters
+        for key, value in self._process_parameters(parameters).items():
+            request_url += "&%s=%s" % (self._encode_url_value(key), self._encode_url_value(value))
+
+        return request_url
+
+    def _get_command_url(self, command: Command, ssl: bool = False) -> str:
+        """
+        Returns the request url for a command without any parameters.
+        Urls are cached until the connection info changes.
+        :param command: the main command
+        :param ssl: Uses HTTPS instead of HTTP
+        :return: request url
+        """
+        try:
+            return self._url_templates[(command, ssl)]
+        except KeyError:
+            pass
+
         if not self._host:
             raise Exception("Missing host!")
 
-        # create request url
-        request_url = "http"
-        if ssl:
-            request_url += "s"
-        request_url += "://"
+        # append command to execute
+        if isinstance(command, Command):
+            command_value = command.value
+        elif isinstance(command, str):
+            command_value = str(command)
+        else:
+            raise ValueError("Invalid command type! Must be a Command enum constant or a string!")
+
+        request_url = "%s&%s=%s" % (self._get_url_prefix(ssl), UrlParam.COMMAND.value,
+                                    self._encode_url_value(command_value))
+        self._url_templates[(command, ssl)] = request_url
+        return request_url
+
+    def _get_url_prefix(self, ssl: bool = False) -> str:
+        """
+        :param ssl: Uses HTTPS instead of HTTP
+        :return: the part of the request url that is the same for every command
+        """
+        request_url = "https://" if ssl else "http://"
 
         request_url += "%s" % self._host
         if self._port:
@@ -123,72 +669,75 @@ class XS1:
 
         # append credentials, if any
         if self._user and self._password:
-            request_url += "&%s=%s&%s=%s" % (UrlParam.USER.value, self._user, UrlParam.PASSWORD.value, self._password)
-        # append command to execute
-        if isinstance(command, Command):
-            command = command.value
-        elif isinstance(command, str):
-            command = str(command)
-        else:
-            raise ValueError("Invalid command type! Must be a Command enum constant or a string!")
+            request_url += "&%s=%s&%s=%s" % (UrlParam.USER.value, self._encode_url_value(self._user),
+                                             UrlParam.PASSWORD.value, self._encode_url_value(self._password))
+
+        return request_url
 
-        request_url += "&%s=%s" % (UrlParam.COMMAND.value, command)
+    @staticmethod
+    def _encode_url_value(value) -> str:
+        """
+        :param value: a url parameter key or value
+        :return: the url encoded string representation of the value
+        """
+        value_type = type(value)
+        if value_type is int or value_type is float:
+            # numbers never need to be encoded
+            return str(value)
+        if isinstance(value, ApiConstant):
+            value = value.value
 
-        # append any additional parameters
-        if parameters:
-
-            def process_parameters(params: dict) -> dict:
-                """
-                Removes duplicates and replaces ApiConstants (Enums) with it's value
-                :param params: parameters to process
-                :return: cleaned up parameters
-                """
-
-                processed = {}
-                for k, v in params.items():
-                    # special treatment when a list of functions is found
-                    if k == UrlParam.FUNCTION and isinstance(v, list):
-                        for idx, func in enumerate(v):
-                            function_type = None
-                            function_description = None
-
-                            for k2, v2 in func.items():
-                                if k2 == "type":
-                                    function_type = v2
-                                if k2 == "dsc":
-                                    function_description = v2
-
-                            if isinstance(function_type, ApiConstant):
-                                function_type = function_type.value
-                            if isinstance(function_description, ApiConstant):
-                                function_description = function_description.value
-
-                            processed['function%d.type' % (idx + 1)] = str(function_type)
-                            processed['function%d.dsc' % (idx + 1)] = str(function_description)
-
-                        continue
-
-                    # if the value is an enum, use it's value instead
-                    if isinstance(v, ApiConstant):
-                        v = v.value
-
-                    # if the key is an enum, use it's value as the key
-                    # and give it priority over other parameters that might have the same key
-                    if isinstance(k, ApiConstant):
-                        processed[k.value] = v
-                    else:
-                        k = str(k)
-                        if k not in processed:
-                            processed[k] = v
-
-                return processed
-
-            processed_params = process_parameters(parameters)
-            for key, value in processed_params.items():
-                # append parameter to request url
-                request_url += "&%s=%s" % (key, value)
+        value = str(value)
+        if XS1._URL_SAFE_VALUE.match(value):
+            return value
+        return quote(value, safe=XS1._URL_SAFE_CHARACTERS)
 
-        return request_url
+    @staticmethod
+    def _process_parameters(params: dict) -> dict:
+        """
+        Removes duplicates and replaces ApiConstants (Enums) with it's value
+        :param params: parameters to process
+        :return: cleaned up parameters
+        """
+
+        processed = {}
+        for k, v in params.items():
+            # special treatment when a list of functions is found
+            if k == UrlParam.FUNCTION and isinstance(v, list):
+                for idx, func in enumerate(v):
+                    function_type = None
+                    function_description = None
+
+                    for k2, v2 in func.items():
+                        if k2 == "type":
+                            function_type = v2
+                        if k2 == "dsc":
+                            function_description = v2
+
+                    if isinstance(function_type, ApiConstant):
+                        function_type = function_type.value
+                    if isinstance(function_description, ApiConstant):
+                        function_description = function_description.value
+
+                    processed['function%d.type' % (idx + 1)] = str(function_type)
+                    processed['function%d.dsc' % (idx + 1)] = str(function_description)
+
+                continue
+
+            # if the value is an enum, use it's value instead
+            if isinstance(v, ApiConstant):
+                v = v.value
+
+            # if the key is an enum, use it's value as the key
+            # and give it priority over other parameters that might have the same key
+            if isinstance(k, ApiConstant):
+                processed[k.value] = v
+            else:
+                k = str(k)
+                if k not in processed:
+                    processed[k] = v
+
+        return processed
 
     def _send_request(self, request_url: str) -> dict:
         """
@@ -196,23 +745,10 @@ class XS1:
         :param request_url: the request url
         :return: the api response as a json object
         """
-        # create session
-        with requests.Session() as session:
-            if self._ssl:
-                protocol = 'https://'
-            else:
-                protocol = 'http://'
-
-            session.mount(protocol, HTTPAdapter(max_retries=self.RETRY_STRATEGY))
+        body, encoding = self._transport.get(request_url, self.REQUEST_TIMEOUT, self.get_auth())
 
-            # make request
-            response = session.get(request_url, timeout=5, auth=(self._user, self._password))
-            response_text = response.text  # .encode('utf-8')
-            response_text_json = response_text[
-                                 response_text.index('{'):response_text.rindex('}') + 1]  # cut out valid json response
-
-            response_dict = json.loads(response_text_json)  # convert to json object
-            return response_dict
+        # cut out and decode the json object directly from the raw response
+        return decode_jsonp(body, encoding)
 
     def _check_errors(self, command: Command, parameters: dict, response: dict) -> dict:
         """
@@ -258,7 +794,27 @@ class XS1:
         """
         Retrieves gateway specific (and immutable) configuration data
         """
-        self._config_info = self.call_api(Command.GET_CONFIG_INFO)
+        self._config_info = self._call_static_api(Command.GET_CONFIG_INFO, use_cache=False)
+
+    def _call_static_api(self, command: Command, use_cache: bool = True) -> dict:
+        """
+        Executes a command whose response (almost) never changes, using the metadata cache if there is one.
+        :param command: one of the commands cached by the metadata cache
+        :param use_cache: return the cached response if there is one, only update the cache otherwise
+        :return: the api response
+        """
+        if self._metadata_cache is None:
+            return self.call_api(command)
+
+        address = self._get_metadata_address()
+        if use_cache:
+            response = self._metadata_cache.get(address, command)
+            if response is not None:
+                return response
+
+        response = self.call_api(command)
+        self._metadata_cache.put(address, command, response)
+        return response
 
     def get_config_main(self) -> dict:
         """
@@ -271,28 +827,28 @@ class XS1:
         """
         :return: a list of currently compatible systems
         """
-        response = self.call_api(Command.GET_LIST_SYSTEMS)
+        response = self._call_static_api(Command.GET_LIST_SYSTEMS)
         return self._get_node_value(response, Node.SYSTEM)
 
     def get_list_functions(self) -> list:
         """
         :return: a list of available functions / actions for actuators
         """
-        response = self.call_api(Command.GET_LIST_FUNCTIONS)
+        response = self._call_static_api(Command.GET_LIST_FUNCTIONS)
         return self._get_node_value(response, Node.FUNCTION)
 
     def get_types_actuators(self) -> list:
         """
         :return: a list of compatible actuators
         """
-        response = self.call_api(Command.GET_TYPES_ACTUATORS)
+        response = self._call_static_api(Command.GET_TYPES_ACTUATORS)
         return self._get_node_value(response, "actuatortype")
 
     def get_types_sensors(self) -> list:
         """
         :return: a list of compatible sensors
         """
-        response = self.call_api(Command.GET_TYPES_SENSORS)
+        response = self._call_static_api(Command.GET_TYPES_SENSORS)
         return self._get_node_value(response, "sensortype")
 
     def get_config_actuator(self, number: int) -> dict:
@@ -300,8 +856,22 @@ class XS1:
         :param number: number of the actuator
         :return: the configuration of a specific actuator
         """
-        response = self.call_api(Command.GET_CONFIG_ACTUATOR, {UrlParam.NUMBER: number})
-        return self._get_node_value(response, Node.ACTUATOR)
+        if self._config_mirror is not None:
+            return self._config_mirror.get(Node.ACTUATOR, number, lambda: self._request_config(
+                Command.GET_CONFIG_ACTUATOR, Node.ACTUATOR, number))
+
+        return self._request_config(Command.GET_CONFIG_ACTUATOR, Node.ACTUATOR, number)
+
+    def _request_config(self, command: Command, node: Node, number: int) -> dict:
+        """
+        Requests the configuration of a device from the gateway.
+        :param command: GET_CONFIG_ACTUATOR or GET_CONFIG_SENSOR
+        :param node: the response node containing the configuration
+        :param number: the number of the device
+        :return: the configuration of the device
+        """
+        response = self.call_api(command, {UrlParam.NUMBER: number})
+        return self._get_node_value(response, node)
 
     def set_config_actuator(self, number: int, configuration: dict) -> dict:
         """
@@ -312,15 +882,21 @@ class XS1:
         configuration[UrlParam.NUMBER] = number
 
         response = self.call_api(Command.SET_CONFIG_ACTUATOR, configuration)
-        return self._get_node_value(response, Node.ACTUATOR)
+        config = self._get_node_value(response, Node.ACTUATOR)
+        if self._config_mirror is not None:
+            self._config_mirror.update(Node.ACTUATOR, number, config)
+        return config
 
     def get_config_sensor(self, number: int) -> dict:
         """
         :param number: number of the sensor
         :return: the configuration of the specific sensor
         """
-        response = self.call_api(Command.GET_CONFIG_SENSOR, {UrlParam.NUMBER: number})
-        return self._get_node_value(response, Node.SENSOR)
+        if self._config_mirror is not None:
+            return self._config_mirror.get(Node.SENSOR, number, lambda: self._request_config(
+                Command.GET_CONFIG_SENSOR, Node.SENSOR, number))
+
+        return self._request_config(Command.GET_CONFIG_SENSOR, Node.SENSOR, number)
 
     def set_config_sensor(self, number: int, configuration: dict) -> dict:
         """
@@ -331,7 +907,10 @@ class XS1:
         configuration[UrlParam.NUMBER.value] = number
 
         response = self.call_api(Command.SET_CONFIG_SENSOR, configuration)
-        return self._get_node_value(response, Node.SENSOR)
+        config = self._get_node_value(response, Node.SENSOR)
+        if self._config_mirror is not None:
+            self._config_mirror.update(Node.SENSOR, number, config)
+        return config
 
     def get_gateway_name(self) -> str:
         """
@@ -369,17 +948,63 @@ class XS1:
         """
         return self._get_config_info_value(Node.DEVICE_MAC)
 
+    def has_config_info(self) -> bool:
+        """
+        :return: True if the config info of the gateway is known, so it can be used without a request
+        """
+        return self._config_info is not None
+
+    def get_config_info(self) -> dict:
+        """
+        Returns the config info of the gateway, requesting it (or waiting for its prefetch) if necessary.
+        :return: the config info response
+        """
+        return self._get_config_info()
+
     def _get_config_info_value(self, node: Node):
-        return self._config_info[Node.INFO.value][node.value]
+        return self._get_config_info()[Node.INFO.value][node.value]
+
+    def _get_config_info(self) -> dict:
+        """
+        Returns the config info of the gateway, requesting it (or waiting for its prefetch) if necessary.
+        Errors of a failed prefetch are raised here (once), the next call requests the config info again.
+        :return: the config info response
+        """
+        config_info = self._config_info
+        if config_info is not None:
+            return config_info
+
+        prefetch = self._config_info_prefetch
+        if prefetch is None:
+            self.update_config_info()
+            return self._config_info
+
+        try:
+            config_info = prefetch.result()
+        finally:
+            if self._config_info_prefetch is prefetch:
+                self._config_info_prefetch = None
+            else:
+                # the connection info has changed in the meantime
+                prefetch = None
+
+        if prefetch is None:
+            return self._get_config_info()
+
+        self._config_info = config_info
+        return config_info
 
     def get_actuator(self, actuator_id: int) -> XS1Actuator or None:
         """
         Get an actuator with a specific id
+        (from the device registry if this XS1 object was created with warm_registry=True)
         :param actuator_id: the id of the actuator
         :return: XS1Actuator
         """
-        all_actuators = self.get_all_actuators()
-        for actuator in all_actuators:
+        if self._warm_registry:
+            return self._registry.get_actuator(actuator_id)
+
+        for actuator in self.get_all_actuators():
             if actuator.id() == actuator_id:
                 return actuator
 
@@ -388,11 +1013,14 @@ class XS1:
     def get_actuator_by_number(self, number: int) -> XS1Actuator or None:
         """
         Get an actuator with a specific number
+        (from the device registry if this XS1 object was created with warm_registry=True)
         :param number: the number of the actuator
         :return: XS1Actuator
         """
-        all_actuators = self.get_all_actuators()
-        for actuator in all_actuators:
+        if self._warm_registry:
+            return self._registry.get_actuator_by_number(number)
+
+        for actuator in self.get_all_actuators():
             if actuator.number() == number:
                 return actuator
 
@@ -408,17 +1036,12 @@ class XS1:
 
         all_actuators = []
         # create actuator objects
+        number_key = Node.PARAM_NUMBER.value
+        get_class = self._get_actuator_class
         for number, actuator in enumerate(self._get_node_value(response, Node.ACTUATOR), start=1):
             # attach number to data so we can use it for future requests
-            actuator[Node.PARAM_NUMBER.value] = number
-
-            actuator_type = self._get_node_value(actuator, Node.PARAM_TYPE)
-            if ActuatorType.SWITCH == actuator_type or ActuatorType.DIMMER == actuator_type:
-                device = XS1Switch(actuator, self)
-            else:
-                device = XS1Actuator(actuator, self)
-
-            all_actuators.append(device)
+            actuator[number_key] = number
+            all_actuators.append(get_class(actuator)(actuator, self, self._keep_raw_state))
 
         if enabled is None:
             return all_actuators
@@ -430,14 +1053,33 @@ class XS1:
                 filtered_actuators.append(actuator)
             return filtered_actuators
 
+    @staticmethod
+    def _get_actuator_class(state: dict) -> type:
+        """
+        :param state: the state of an actuator (api response)
+        :return: the class representing this actuator
+        """
+        return XS1._ACTUATOR_CLASSES.get(state.get(Node.PARAM_TYPE.value), XS1Actuator)
+
+    @staticmethod
+    def _get_sensor_class(state: dict) -> type:
+        """
+        :param state: the state of a sensor (api response)
+        :return: the class representing this sensor
+        """
+        return XS1Sensor
+
     def get_sensor(self, sensor_id: int) -> XS1Sensor or None:
         """
         Get a sensor with a specific id
+        (from the device registry if this XS1 object was created with warm_registry=True)
         :param sensor_id: the id of the sensor
         :return: XS1Sensor
         """
-        all_sensors = self.get_all_sensors()
-        for sensor in all_sensors:
+        if self._warm_registry:
+            return self._registry.get_sensor(sensor_id)
+
+        for sensor in self.get_all_sensors():
             if sensor.id() == sensor_id:
                 return sensor
 
@@ -446,11 +1088,14 @@ class XS1:
     def get_sensor_by_number(self, number: int) -> XS1Sensor or None:
         """
         Get a sensor with a specific number
+        (from the device registry if this XS1 object was created with warm_registry=True)
         :param number: the number of the sensor
         :return: XS1Sensor
         """
-        all_sensors = self.get_all_sensors()
-        for sensor in all_sensors:
+        if self._warm_registry:
+            return self._registry.get_sensor_by_number(number)
+
+        for sensor in self.get_all_sensors():
             if sensor.number() == number:
                 return sensor
 
@@ -464,11 +1109,12 @@ class XS1:
         response = self.call_api(Command.GET_LIST_SENSORS)
 
         all_sensors = []
+        number_key = Node.PARAM_NUMBER.value
+        get_class = self._get_sensor_class
         for number, sensor in enumerate(self._get_node_value(response, Node.SENSOR), start=1):
             # attach number to data so we can use it for future requests
-            sensor[Node.PARAM_NUMBER.value] = number
-            device = XS1Sensor(sensor, self)
-            all_sensors.append(device)
+            sensor[number_key] = number
+            all_sensors.append(get_class(sensor)(sensor, self, self._keep_raw_state))
 
         if enabled is None:
             return all_sensors
@@ -500,6 +1146,99 @@ class XS1:
                                  UrlParam.NUMBER: sensor_number,
                              })
 
+    def get_state_actuators(self, actuators: [int or XS1Actuator], max_workers: int = None) -> dict:
+        """
+        Gets the current state of multiple actuators using concurrent requests.
+        Actuator objects passed in are updated in place.
+        A failing request does not abort the others, its exception is returned instead of the api response.
+        :param actuators: actuator numbers (not ids!) or actuator objects
+        :param max_workers: max number of concurrent requests,
+                            defaults to the max limit of the governor or DEFAULT_BULK_WORKERS
+        :return: a dict of actuator number -> api response (or the exception raised for this number)
+        """
+        return self._get_states(actuators, self.get_state_actuator, Node.ACTUATOR, max_workers)
+
+    def get_state_sensors(self, sensors: [int or XS1Sensor], max_workers: int = None) -> dict:
+        """
+        Gets the current state of multiple sensors using concurrent requests.
+        Sensor objects passed in are updated in place.
+        A failing request does not abort the others, its exception is returned instead of the api response.
+        :param sensors: sensor numbers (not ids!) or sensor objects
+        :param max_workers: max number of concurrent requests,
+                            defaults to the max limit of the governor or DEFAULT_BULK_WORKERS
+        :return: a dict of sensor number -> api response (or the exception raised for this number)
+        """
+        return self._get_states(sensors, self.get_state_sensor, Node.SENSOR, max_workers)
+
+    def _get_states(self, devices: [int or XS1Device], get_state, node: Node, max_workers: int = None) -> dict:
+        """
+        Fetches the state of multiple devices concurrently using a bounded worker pool.
+        :param devices: device numbers or device objects
+        :param get_state: function to fetch the state of a single device number
+        :param node: the response node that contains the device state
+        :param max_workers: max number of concurrent requests
+        :return: a dict of device number -> api response (or the exception raised for this number)
+        """
+        # group devices by number so every number is only requested once
+        devices_by_number = {}
+        for device in devices:
+            if isinstance(device, XS1Device):
+                devices_by_number.setdefault(device.number(), []).append(device)
+            else:
+                devices_by_number.setdefault(device, [])
+
+        results = {}
+        if not devices_by_number:
+            return results
+
+        workers = self.get_bulk_workers(len(devices_by_number), max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {number: executor.submit(get_state, number) for number in devices_by_number}
+
+        for number, future in futures.items():
+            try:
+                response = future.result()
+                for device in devices_by_number[number]:
+                    device.set_state(self._get_node_value(response, node))
+            except Exception as ex:
+                # f.ex. a response without the device node, only this number fails
+                results[number] = ex
+                continue
+
+            results[number] = response
+
+        return results
+
+    def refresh(self, devices: [XS1Device]) -> None:
+        """
+        Updates existing device objects in place using a single list request per device kind
+        (instead of one request per device like XS1Device.update()).
+        References to the device objects stay valid.
+        :param devices: actuator and sensor objects
+        """
+        # group devices by kind and number, objects of the same device are all updated
+        actuators = {}
+        sensors = {}
+        for device in devices:
+            targets = actuators if isinstance(device, XS1Actuator) else sensors
+            targets.setdefault(device.number(), []).append(device)
+
+        for node, command, targets in [(Node.ACTUATOR, Command.GET_LIST_ACTUATORS, actuators),
+                                       (Node.SENSOR, Command.GET_LIST_SENSORS, sensors)]:
+            if not targets:
+                continue
+
+            response = self.call_api(command)
+            for number, state in enumerate(self._get_node_value(response, node) or [], start=1):
+                matching = targets.get(number)
+                if matching is None:
+                    continue
+
+                # attach number to data so we can use it for future requests
+                state[Node.PARAM_NUMBER.value] = number
+                for device in matching:
+                    device.set_state(dict(state))
+
     def call_actuator_function(self, actuator_number: int, function) -> dict:
         """
         Executes a function on the specified actuator and sets the response on the passed in actuator.
@@ -507,11 +1246,10 @@ class XS1:
         :param function: id of the function to execute
         :return: the api response
         """
-        return self.call_api(Command.SET_STATE_ACTUATOR,
-                             {
-                                 UrlParam.NUMBER: actuator_number,
-                                 UrlParam.FUNCTION: function
-                             })
+        return self._write_actuator(actuator_number, {
+            UrlParam.NUMBER: actuator_number,
+            UrlParam.FUNCTION: function
+        })
 
     def set_actuator_value(self, actuator_number: int, value) -> dict:
         """
@@ -520,11 +1258,60 @@ class XS1:
         :param value: the new value to set on the specified actuator
         :return: the api response
         """
-        return self.call_api(Command.SET_STATE_ACTUATOR,
-                             {
-                                 UrlParam.NUMBER: actuator_number,
-                                 UrlParam.VALUE: value
-                             })
+        return self._write_actuator(actuator_number, {
+            UrlParam.NUMBER: actuator_number,
+            UrlParam.VALUE: value
+        })
+
+    def submit_actuator_value(self, actuator_number: int, value) -> Future:
+        """
+        Sets a new value for the specified actuator without waiting for the response.
+        With a write queue the write is delayed and replaced by newer writes to the same actuator.
+        :param actuator_number: actuator number (not id!) to set the new value on
+        :param value: the new value to set on the specified actuator
+        :return: a future resolving to the api response (of the newest write to this actuator)
+        """
+        parameters = {
+            UrlParam.NUMBER: actuator_number,
+            UrlParam.VALUE: value
+        }
+
+        def write() -> dict:
+            return self.call_api(Command.SET_STATE_ACTUATOR, parameters)
+
+        if self._write_queue is not None:
+            return self._write_queue.submit(actuator_number, write)
+
+        future = Future()
+        try:
+            future.set_result(write())
+        except Exception as ex:
+            future.set_exception(ex)
+        return future
+
+    def _write_actuator(self, actuator_number: int, parameters: dict) -> dict:
+        """
+        Sends a set_state_actuator request, through the write queue if there is one.
+        A write to an actuator without a write in flight is sent right away,
+        otherwise it waits for the write in flight and may be replaced by a newer one.
+        :param actuator_number: actuator number (not id!)
+        :param parameters: the request parameters
+        :return: the api response (of the newest write to this actuator)
+        """
+        if self._write_queue is None:
+            return self.call_api(Command.SET_STATE_ACTUATOR, parameters)
+
+        return self._write_queue.execute(actuator_number,
+                                         lambda: self.call_api(Command.SET_STATE_ACTUATOR, parameters))
+
+    def confirm_write(self, actuator: XS1Actuator, timeout: float = None) -> WriteConfirmation:
+        """
+        Tracks a write until the gateway reports that the new value reached the device (value == newvalue).
+        :param actuator: the written actuator (with the state of the write response)
+        :param timeout: time (in seconds) until the write is considered failed, the tracker's default if None
+        :return: a future resolving to the actuator or failing with a ConfirmationTimeout
+        """
+        return self._confirmations.track(actuator, timeout)
 
     def set_sensor_value(self, sensor_number: int, value) -> dict:
         """
@@ -144,6 +144,19 @@ class Command(ApiConstant):
     SET_STATE_SENSOR = 'set_state_sensor'
     """Command to set a new value on a sensor (for debugging)"""
 
+    SUBSCRIBE = 'subscribe'
+    """Command to subscribe to the push interface that streams actuator and sensor updates"""
+
+    @staticmethod
+    def is_write_command(command) -> bool:
+        """
+        :param command: a Command constant or a command string
+        :return: True if the command modifies the state or configuration of the gateway
+        """
+        if isinstance(command, Command):
+            command = command.value
+        return str(command).startswith('set_')
+
 
 class Node(ApiConstant):
     """
@@ -0,0 +1,667 @@
+# -*- coding: utf-8 -*-
+"""
+This is the asyncio variant of the xs1_api_client api which contains the AsyncXS1 object
+to interact with the gateway from within an event loop.
+
+AsyncXS1 is an executor backed wrapper around the synchronous api, it does not use non-blocking I/O:
+every blocking gateway request is executed on an executor so the event loop is never blocked,
+but each request in flight still occupies a thread of that executor. The number of concurrent requests
+is therefore limited by the executor (the default executor of the event loop if none is passed in).
+All requests share the pooled connections of a single XS1 instance, so URL building,
+error handling and retry behaviour are exactly the same as with the synchronous api.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+
+from xs1_api_client.api import XS1
+from xs1_api_client.api_constants import Command, Node
+from xs1_api_client.caching import ResponseCache
+from xs1_api_client.coalescing import WriteQueue
+from xs1_api_client.config_mirror import ConfigMirror
+from xs1_api_client.confirmation import ConfirmationTracker
+from xs1_api_client.device import XS1Device
+from xs1_api_client.device.actuator import XS1Actuator, XS1Function
+from xs1_api_client.device.actuator.switch import XS1Switch
+from xs1_api_client.device.sensor import XS1Sensor
+from xs1_api_client.governor import ConcurrencyGovernor
+from xs1_api_client.registry import DeviceRegistry
+from xs1_api_client.resilience import RetryPolicy, CircuitBreaker
+from xs1_api_client.transport import Transport
+
+
+class AsyncXS1:
+    """
+    This class is the asyncio api interface that handles all communication with the XS1 gateway.
+    Requests are executed by a wrapped XS1 object on an executor (see the module documentation).
+    """
+
+    def __init__(self, host: str = None, port: int or None = 80, ssl: bool = False, user: str = None,
+                 password: str = None, pool_size: int = XS1.DEFAULT_POOL_SIZE, executor: Executor = None,
+                 **kwargs) -> None:
+        """
+        Creates a new api object.
+        In contrast to the synchronous api the gateway is not contacted here,
+        configuration info is fetched on first use instead (or in the background with
+        config_info=XS1.CONFIG_INFO_PREFETCH).
+
+        :param host: host address of the gateway api
+        :param port: host port of the gateway api
+        :param ssl: uses HTTPS instead of HTTP if set to True
+        :param user: username for authentication
+        :param password: password for authentication
+        :param pool_size: max number of keep-alive connections kept open to the gateway
+        :param executor: executor used to run blocking requests, the default executor of the event loop if None.
+                         Its number of workers limits the number of concurrent requests,
+                         f.ex. pass ThreadPoolExecutor(max_workers=pool_size) to match the connection pool
+        :param kwargs: further options of the wrapped XS1 object (like coalesce_requests or governor)
+        """
+        self._api = XS1(pool_size=pool_size, **kwargs)
+        # never block the event loop by requesting the config info right away
+        config_info = self._api.get_config_info_mode()
+        if config_info == XS1.CONFIG_INFO_EAGER:
+            config_info = XS1.CONFIG_INFO_LAZY
+        self._api.set_connection_info(host, port, ssl, user, password, config_info)
+        self._executor = executor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections to the gateway.
+        """
+        self._api.close()
+
+    async def _run(self, func, *args, **kwargs):
+        """
+        Runs a blocking function on the executor of this api object
+        :param func: the function to run
+        :return: the result of the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def set_connection_info(self, host: str, port: int = None, ssl: bool = False, user: str = None,
+                                  password: str = None) -> None:
+        """
+        Sets private connection info for this AsyncXS1 instance.
+        This AsyncXS1 instance will also immediately use this connection info.
+        :param host: host address of the gateway api
+        :param port: host port of the gateway api
+        :param ssl: uses HTTPS instead of HTTP if set to True
+        :param user: username for authentication
+        :param password: password for authentication
+        """
+        await self._run(self._api.set_connection_info, host, port, ssl, user, password)
+
+    async def wait_for_revalidation(self, timeout: float = None) -> None:
+        """
+        Waits until the background revalidation of cached metadata (if any) has finished.
+        :param timeout: max time to wait (in seconds)
+        """
+        await self._run(self._api.wait_for_revalidation, timeout)
+
+    def get_transport(self) -> Transport:
+        """
+        :return: the transport used to send requests to the gateway
+        """
+        return self._api.get_transport()
+
+    def get_host(self) -> str or None:
+        """
+        :return: the currently set host address
+        """
+        return self._api.get_host()
+
+    def get_user(self) -> str or None:
+        """
+        :return: the currently set user used for authentication
+        """
+        return self._api.get_user()
+
+    def get_password(self) -> str or None:
+        """
+        :return: the currently set password used for authentication
+        """
+        return self._api.get_password()
+
+    def get_auth(self) -> (str, str) or None:
+        """
+        :return: (user, password) tuple used for basic authentication, None if no credentials are set
+        """
+        return self._api.get_auth()
+
+    def get_request_url(self, command: Command, parameters: dict = None) -> str:
+        """
+        :param command: command parameter for the URL (see api_constants)
+        :param parameters: additional parameters of the command
+        :return: the url of this request to the current gateway
+        """
+        return self._api.get_request_url(command, parameters)
+
+    def get_config_info_mode(self) -> str:
+        """
+        :return: when the config info of the gateway is requested:
+                 CONFIG_INFO_EAGER, CONFIG_INFO_LAZY or CONFIG_INFO_PREFETCH
+        """
+        return self._api.get_config_info_mode()
+
+    def get_keep_raw_state(self) -> bool:
+        """
+        :return: True if device objects keep their complete api responses
+        """
+        return self._api.get_keep_raw_state()
+
+    def get_governor(self) -> ConcurrencyGovernor or None:
+        """
+        :return: the governor limiting concurrent requests to the gateway, if any
+        """
+        return self._api.get_governor()
+
+    def get_bulk_workers(self, count: int, max_workers: int = None) -> int:
+        """
+        :param count: number of requests to send
+        :param max_workers: max number of concurrent requests
+        :return: the number of workers used to send multiple requests concurrently, see XS1.get_bulk_workers()
+        """
+        return self._api.get_bulk_workers(count, max_workers)
+
+    def get_coalescing_stats(self) -> dict:
+        """
+        :return: a dict with the number of coalesced ("hits") and executed ("misses") read requests,
+                 or None if request coalescing is disabled
+        """
+        return self._api.get_coalescing_stats()
+
+    def get_registry(self) -> DeviceRegistry:
+        """
+        :return: the registry of device objects of the wrapped XS1 object (holding synchronous device objects)
+        """
+        return self._api.get_registry()
+
+    def get_write_queue(self) -> WriteQueue or None:
+        """
+        :return: the queue collapsing successive actuator writes, if any
+        """
+        return self._api.get_write_queue()
+
+    def get_confirmation_tracker(self) -> ConfirmationTracker:
+        """
+        :return: the tracker checking confirmed writes
+        """
+        return self._api.get_confirmation_tracker()
+
+    def get_config_mirror(self) -> ConfigMirror or None:
+        """
+        :return: the mirror of device configurations, None if mirroring is disabled
+        """
+        return self._api.get_config_mirror()
+
+    def get_response_cache(self) -> ResponseCache or None:
+        """
+        :return: the cache for responses of read requests, if any
+        """
+        return self._api.get_response_cache()
+
+    def get_cache_stats(self) -> dict or None:
+        """
+        :return: a dict with the number of fresh ("hits") and stale ("stale_hits") responses served from the cache
+                 and the number of requests sent to the gateway ("misses"), or None if there is no response cache
+        """
+        return self._api.get_cache_stats()
+
+    def get_retry_policy(self) -> RetryPolicy:
+        """
+        :return: the policy used to retry failed requests
+        """
+        return self._api.get_retry_policy()
+
+    def get_circuit_breaker(self) -> CircuitBreaker:
+        """
+        :return: the circuit breaker guarding requests to the gateway
+        """
+        return self._api.get_circuit_breaker()
+
+    async def call_api(self, command: Command, parameters: dict = None) -> dict:
+        """
+        Executes a command on the xs1 api and returns it's response as a dictionary (if there was no error).
+        :param command: command parameter for the URL (see api_constants)
+        :param parameters: additional parameters needed for the specified command like 'number=3' passed in as a dictionary
+        :return: the api response
+        """
+        return await self._run(self._api.call_api, command, parameters)
+
+    async def get_protocol_info(self) -> str:
+        """
+        Retrieves the protocol version that is used by the gateway
+        :return: protocol version number
+        """
+        return await self._run(self._api.get_protocol_info)
+
+    async def update_config_info(self) -> None:
+        """
+        Retrieves gateway specific (and immutable) configuration data
+        """
+        await self._run(self._api.update_config_info)
+
+    async def get_config_main(self) -> dict:
+        """
+        :return: main configuration of the XS1
+        """
+        return await self._run(self._api.get_config_main)
+
+    async def get_list_systems(self) -> list:
+        """
+        :return: a list of currently compatible systems
+        """
+        return await self._run(self._api.get_list_systems)
+
+    async def get_list_functions(self) -> list:
+        """
+        :return: a list of available functions / actions for actuators
+        """
+        return await self._run(self._api.get_list_functions)
+
+    async def get_types_actuators(self) -> list:
+        """
+        :return: a list of compatible actuators
+        """
+        return await self._run(self._api.get_types_actuators)
+
+    async def get_types_sensors(self) -> list:
+        """
+        :return: a list of compatible sensors
+        """
+        return await self._run(self._api.get_types_sensors)
+
+    async def get_config_actuator(self, number: int) -> dict:
+        """
+        :param number: number of the actuator
+        :return: the configuration of a specific actuator
+        """
+        return await self._run(self._api.get_config_actuator, number)
+
+    async def set_config_actuator(self, number: int, configuration: dict) -> dict:
+        """
+        :param number: number of the actuator
+        :param configuration: actuator configuration
+        :return: the new configuration of the specific actuator
+        """
+        return await self._run(self._api.set_config_actuator, number, configuration)
+
+    async def get_config_sensor(self, number: int) -> dict:
+        """
+        :param number: number of the sensor
+        :return: the configuration of the specific sensor
+        """
+        return await self._run(self._api.get_config_sensor, number)
+
+    async def set_config_sensor(self, number: int, configuration: dict) -> dict:
+        """
+        :param number: number of the actuator
+        :param configuration: sensor configuration
+        :return: the new configuration of the sensor
+        """
+        return await self._run(self._api.set_config_sensor, number, configuration)
+
+    def has_config_info(self) -> bool:
+        """
+        :return: True if the config info of the gateway is known, so it can be used without a request
+        """
+        return self._api.has_config_info()
+
+    async def get_config_info(self) -> dict:
+        """
+        Returns the config info of the gateway, requesting it (or waiting for its prefetch) if necessary.
+        :return: the config info response
+        """
+        if self._api.has_config_info():
+            return self._api.get_config_info()
+        return await self._run(self._api.get_config_info)
+
+    async def get_gateway_name(self) -> str:
+        """
+        :return: the device name of the gateway
+        """
+        return await self._get_config_info_value(Node.DEVICE_NAME)
+
+    async def get_gateway_hardware_version(self) -> str:
+        """
+        :return: the hardware version number of the gateway
+        """
+        return await self._get_config_info_value(Node.DEVICE_HARDWARE_VERSION)
+
+    async def get_gateway_bootloader_version(self) -> str:
+        """
+        :return: the bootloader version number of the gateway
+        """
+        return await self._get_config_info_value(Node.DEVICE_BOOTLOADER_VERSION)
+
+    async def get_gateway_firmware_version(self) -> str:
+        """
+        :return: the firmware version number of the gateway
+        """
+        return await self._get_config_info_value(Node.DEVICE_FIRMWARE_VERSION)
+
+    async def get_gateway_uptime(self) -> int:
+        """
+        :return: the uptime of the gateway in seconds
+        """
+        return await self._get_config_info_value(Node.DEVICE_UPTIME)
+
+    async def get_gateway_mac(self) -> str:
+        """
+        :return: the mac address of the gateway
+        """
+        return await self._get_config_info_value(Node.DEVICE_MAC)
+
+    async def _get_config_info_value(self, node: Node):
+        config_info = await self.get_config_info()
+        return config_info[Node.INFO.value][node.value]
+
+    async def get_actuator(self, actuator_id: int) -> XS1Actuator or None:
+        """
+        Get an actuator with a specific id
+        :param actuator_id: the id of the actuator
+        :return: AsyncXS1Actuator
+        """
+        return self._wrap_actuator(await self._run(self._api.get_actuator, actuator_id))
+
+    async def get_actuator_by_number(self, number: int) -> XS1Actuator or None:
+        """
+        Get an actuator with a specific number
+        :param number: the number of the actuator
+        :return: AsyncXS1Actuator
+        """
+        return self._wrap_actuator(await self._run(self._api.get_actuator_by_number, number))
+
+    async def get_all_actuators(self, enabled: bool or None = None) -> [XS1Actuator]:
+        """
+        Requests the list of enabled actuators from the gateway.
+        :param enabled:
+        :return: a list of AsyncXS1Actuator objects
+        """
+        return [self._wrap_actuator(actuator) for actuator in await self._run(self._api.get_all_actuators, enabled)]
+
+    async def get_sensor(self, sensor_id: int) -> XS1Sensor or None:
+        """
+        Get a sensor with a specific id
+        :param sensor_id: the id of the sensor
+        :return: AsyncXS1Sensor
+        """
+        return self._wrap_sensor(await self._run(self._api.get_sensor, sensor_id))
+
+    async def get_sensor_by_number(self, number: int) -> XS1Sensor or None:
+        """
+        Get a sensor with a specific number
+        :param number: the number of the sensor
+        :return: AsyncXS1Sensor
+        """
+        return self._wrap_sensor(await self._run(self._api.get_sensor_by_number, number))
+
+    async def get_all_sensors(self, enabled: bool or None = None) -> [XS1Sensor]:
+        """
+        Requests the list of enabled sensors from the gateway.
+        :return: list of AsyncXS1Sensor objects
+        """
+        return [self._wrap_sensor(sensor) for sensor in await self._run(self._api.get_all_sensors, enabled)]
+
+    async def get_state_actuator(self, actuator_number: int) -> dict:
+        """
+        Gets the current state of the specified actuator.
+        :param actuator_number: actuator number (not id!)
+        :return: the api response as a dict
+        """
+        return await self._run(self._api.get_state_actuator, actuator_number)
+
+    async def get_state_sensor(self, sensor_number: int) -> dict:
+        """
+        Gets the current state of the specified sensor.
+        :param sensor_number: sensor number (not id!)
+        :return: the api response as a dict
+        """
+        return await self._run(self._api.get_state_sensor, sensor_number)
+
+    async def get_state_actuators(self, actuators: [int or XS1Actuator], max_workers: int = None) -> dict:
+        """
+        Gets the current state of multiple actuators using concurrent requests.
+        Actuator objects passed in are updated in place.
+        :param actuators: actuator numbers (not ids!) or actuator objects
+        :param max_workers: max number of concurrent requests
+        :return: a dict of actuator number -> api response (or the exception raised for this number)
+        """
+        return await self._run(self._api.get_state_actuators, actuators, max_workers)
+
+    async def get_state_sensors(self, sensors: [int or XS1Sensor], max_workers: int = None) -> dict:
+        """
+        Gets the current state of multiple sensors using concurrent requests.
+        Sensor objects passed in are updated in place.
+        :param sensors: sensor numbers (not ids!) or sensor objects
+        :param max_workers: max number of concurrent requests
+        :return: a dict of sensor number -> api response (or the exception raised for this number)
+        """
+        return await self._run(self._api.get_state_sensors, sensors, max_workers)
+
+    async def refresh(self, devices: [XS1Device]) -> None:
+        """
+        Updates existing device objects in place using a single list request per device kind.
+        :param devices: actuator and sensor objects
+        """
+        await self._run(self._api.refresh, devices)
+
+    async def call_actuator_function(self, actuator_number: int, function) -> dict:
+        """
+        Executes a function on the specified actuator and sets the response on the passed in actuator.
+        :param actuator_number: actuator number (not id!) to execute the function on and set response value
+        :param function: id of the function to execute
+        :return: the api response
+        """
+        return await self._run(self._api.call_actuator_function, actuator_number, function)
+
+    async def set_actuator_value(self, actuator_number: int, value) -> dict:
+        """
+        Sets a new value for the specified actuator.
+        :param actuator_number: actuator number (not id!) to set the new value on
+        :param value: the new value to set on the specified actuator
+        :return: the api response
+        """
+        return await self._run(self._api.set_actuator_value, actuator_number, value)
+
+    def submit_actuator_value(self, actuator_number: int, value) -> asyncio.Future:
+        """
+        Sets a new value for the specified actuator without waiting for the response.
+        With a write queue the write is delayed and replaced by newer writes to the same actuator.
+        :param actuator_number: actuator number (not id!) to set the new value on
+        :param value: the new value to set on the specified actuator
+        :return: an awaitable resolving to the api response (of the newest write to this actuator)
+        """
+        if self._api.get_write_queue() is None:
+            return asyncio.ensure_future(self.set_actuator_value(actuator_number, value))
+        return asyncio.wrap_future(self._api.submit_actuator_value(actuator_number, value))
+
+    def confirm_write(self, actuator: XS1Actuator, timeout: float = None) -> asyncio.Future:
+        """
+        Tracks a write until the gateway reports that the new value reached the device (value == newvalue).
+        :param actuator: the written actuator (with the state of the write response)
+        :param timeout: time (in seconds) until the write is considered failed, the tracker's default if None
+        :return: an awaitable resolving to the actuator or failing with a ConfirmationTimeout
+        """
+        return asyncio.wrap_future(self._api.confirm_write(actuator, timeout))
+
+    async def set_sensor_value(self, sensor_number: int, value) -> dict:
+        """
+        Sets a new value for the specified sensor.
+        WARNING: Only use this for "virtual" sensors or for debugging!
+        :param sensor_number: sensor number (not id!) to set the new value on
+        :param value: the new value to set on the specified sensor
+        :return: the api response
+        """
+        return await self._run(self._api.set_sensor_value, sensor_number, value)
+
+    def _wrap_actuator(self, actuator: XS1Actuator or None) -> XS1Actuator or None:
+        """
+        Converts an actuator of the synchronous api to its async counterpart
+        :param actuator: the actuator to convert
+        :return: AsyncXS1Actuator or AsyncXS1Switch
+        """
+        if actuator is None:
+            return None
+        if isinstance(actuator, XS1Switch):
+            return AsyncXS1Switch(actuator.get_state(), self, self._api.get_keep_raw_state())
+        return AsyncXS1Actuator(actuator.get_state(), self, self._api.get_keep_raw_state())
+
+    def _wrap_sensor(self, sensor: XS1Sensor or None) -> XS1Sensor or None:
+        """
+        Converts a sensor of the synchronous api to its async counterpart
+        :param sensor: the sensor to convert
+        :return: AsyncXS1Sensor
+        """
+        if sensor is None:
+            return None
+        return AsyncXS1Sensor(sensor.get_state(), self, self._api.get_keep_raw_state())
+
+
+class AsyncXS1Actuator(XS1Actuator):
+    """
+    Represents a basic XS1 Actuator that is bound to an AsyncXS1 api object.
+    """
+
+    __slots__ = ()
+
+    async def update(self) -> None:
+        """
+        Updates the state of this actuator
+        """
+        response = await self._api_interface.get_state_actuator(self.number())
+        new_value = self._get_node_value(response, Node.ACTUATOR)
+        self.set_state(new_value)
+
+    async def set_name(self, name: str):
+        """
+        Sets a new name for this device.
+        Keep in mind that there are some limitations for a device name.
+        :param name: the new name to set
+        :return: the new name of the actuator
+        """
+        # check name arg for validity
+        super(XS1Actuator, self).set_name(name)
+
+        config = await self._api_interface.get_config_actuator(self.number())
+
+        # name is already set, to minimize flash writes don't write it again
+        if config["name"] == name:
+            return name
+
+        config["name"] = name
+
+        result = await self._api_interface.set_config_actuator(self.number(), config)
+        new_name = self._get_node_value(result, "name")
+
+        # save new_name to internal state
+        self.set_state({Node.PARAM_NAME.value: new_name})
+
+        return new_name
+
+    async def set_value(self, value, confirm: bool = False) -> asyncio.Future or None:
+        """
+        Sets a new value for this actuator
+        :param value: new value to set
+        :param confirm: track the write until the new value reached the device
+        :return: an awaitable confirmation if confirm is True
+        """
+        new_state = await self._api_interface.set_actuator_value(self.number(), value)
+        new_value = self._get_node_value(new_state, Node.ACTUATOR)
+        self.set_state(new_value)
+
+        if confirm:
+            return self._api_interface.confirm_write(self)
+
+    async def call_function(self, xs1_function, confirm: bool = False) -> asyncio.Future or None:
+        """
+        Calls the specified function by id and saves the api response as the new state
+        :param xs1_function: XS1Function object
+        :param confirm: track the write until the new value reached the device
+        :return: an awaitable confirmation if confirm is True
+        """
+        if not isinstance(xs1_function, XS1Function):
+            raise ValueError('Invalid function object type! Has to be a XS1Function!')
+
+        response = await self._api_interface.call_actuator_function(self.number(), xs1_function.id())
+        new_value = self._get_node_value(response, Node.ACTUATOR)
+        self.set_state(new_value)
+
+        if confirm:
+            return self._api_interface.confirm_write(self)
+
+
+class AsyncXS1Switch(AsyncXS1Actuator, XS1Switch):
+    """
+    Represents a XS1 Switch that is bound to an AsyncXS1 api object.
+    """
+
+    __slots__ = ()
+
+    async def turn_on(self, confirm: bool = False) -> asyncio.Future or None:
+        """Turns on the switch."""
+        return await self.set_value(100, confirm)
+
+    async def turn_off(self, confirm: bool = False) -> asyncio.Future or None:
+        """Turns off the switch."""
+        return await self.set_value(0, confirm)
+
+
+class AsyncXS1Sensor(XS1Sensor):
+    """
+    Represents a XS1 Sensor that is bound to an AsyncXS1 api object.
+    """
+
+    __slots__ = ()
+
+    async def update(self) -> None:
+        """
+        Updates the state of this sensor
+        """
+        response = await self._api_interface.get_state_sensor(self.number())
+        new_value = self._get_node_value(response, Node.SENSOR)
+        self.set_state(new_value)
+
+    async def set_name(self, name: str):
+        """
+        Sets a new name for this device.
+        Keep in mind that there are some limitations for a device name.
+        :param name: the new name to set
+        :return: the new name of the sensor
+        """
+        # check name arg for validity
+        super(XS1Sensor, self).set_name(name)
+
+        config = await self._api_interface.get_config_sensor(self.number())
+
+        # name is already set, to minimize flash writes don't write it again
+        if config["name"] == name:
+            return name
+
+        config["name"] = name
+
+        result = await self._api_interface.set_config_sensor(self.number(), config)
+        new_name = self._get_node_value(result, "name")
+
+        # save new_name to internal state
+        self.set_state({Node.PARAM_NAME.value: new_name})
+
+        return new_name
+
+    async def set_value(self, value) -> None:
+        """
+        Sets a value for this sensor
+        This should only be used for debugging purpose!
+        :param value: new value to set
+        """
+        response = await self._api_interface.set_sensor_value(self.number(), value)
+        new_value = self._get_node_value(response, Node.SENSOR)
+        self.set_state(new_value)
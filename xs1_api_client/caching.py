@@ -0,0 +1,260 @@
+"""
+An in-memory cache for gateway responses of read commands.
+
+Every cached command has its own time to live (TTL). Successful writes through the same XS1 object
+patch or invalidate the affected entries, so a cached device list never hides a change made by this client.
+Changes made by other clients (or the devices themselves) show up once the entry expires.
+"""
+
+import threading
+import time
+
+from xs1_api_client.api_constants import Command, Node, UrlParam
+
+# commands whose cached responses are affected by a write command
+_AFFECTED_COMMANDS = {
+    Command.SET_STATE_ACTUATOR.value: [Command.GET_LIST_ACTUATORS.value, Command.GET_STATE_ACTUATOR.value],
+    Command.SET_STATE_SENSOR.value: [Command.GET_LIST_SENSORS.value, Command.GET_STATE_SENSOR.value],
+    Command.SET_CONFIG_ACTUATOR.value: [Command.GET_LIST_ACTUATORS.value, Command.GET_STATE_ACTUATOR.value,
+                                        Command.GET_CONFIG_ACTUATOR.value],
+    Command.SET_CONFIG_SENSOR.value: [Command.GET_LIST_SENSORS.value, Command.GET_STATE_SENSOR.value,
+                                      Command.GET_CONFIG_SENSOR.value],
+}
+
+# list commands and the node containing the devices, these are patched with the state returned by a write
+_LIST_NODES = {
+    Command.GET_LIST_ACTUATORS.value: Node.ACTUATOR.value,
+    Command.GET_LIST_SENSORS.value: Node.SENSOR.value,
+}
+
+# device state properties updated in cached device lists after a successful set_state_* command
+_STATE_PROPERTIES = [Node.PARAM_VALUE.value, Node.PARAM_NEW_VALUE.value, Node.PARAM_UTIME.value]
+
+
+def _command_value(command: Command or str) -> str:
+    return command.value if isinstance(command, Command) else str(command)
+
+
+def _get_number(parameters: dict or None) -> int or None:
+    """
+    :param parameters: the parameters of a request
+    :return: the device number used in the parameters, if any
+    """
+    if not parameters:
+        return None
+
+    number = parameters.get(UrlParam.NUMBER, parameters.get(UrlParam.NUMBER.value))
+    return int(number) if number is not None else None
+
+
+def copy_response(value):
+    """
+    Copies an api response, which only consists of dicts, lists and immutable values.
+    This is a lot faster than copy.deepcopy().
+    :param value: the value to copy
+    :return: the copy
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {key: copy_response(item) for key, item in value.items()}
+    if value_type is list:
+        return [copy_response(item) for item in value]
+    return value
+
+
+class _Entry(object):
+    """
+    A cached response.
+    """
+
+    def __init__(self, number: int or None, response: dict) -> None:
+        self.number = number
+        self.response = response
+        self.fetched_at = time.monotonic()
+        self.refreshing = False
+
+
+class ResponseCache(object):
+    """
+    Caches responses of read commands for a configurable time.
+
+    An expired entry can still be served for ``stale_ttl`` seconds while it is refreshed in the background
+    (stale-while-revalidate), so only the very first read (and reads after a long period of inactivity) has to wait
+    for the gateway.
+    """
+
+    DEFAULT_TTLS = {
+        Command.GET_LIST_ACTUATORS: 1.0,
+        Command.GET_LIST_SENSORS: 1.0,
+        Command.GET_STATE_ACTUATOR: 1.0,
+        Command.GET_STATE_SENSOR: 1.0,
+    }
+
+    def __init__(self, ttls: dict = None, stale_ttl: float = 0.0) -> None:
+        """
+        Creates a new response cache.
+        :param ttls: time to live (in seconds) of the responses of each command, DEFAULT_TTLS if None.
+                     Responses of commands without a TTL are not cached.
+        :param stale_ttl: time (in seconds) an expired response is still served while it is refreshed in the background
+        """
+        ttls = ttls if ttls is not None else self.DEFAULT_TTLS
+        self._ttls = {_command_value(command): ttl for command, ttl in ttls.items()}
+        self._stale_ttl = stale_ttl
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        # incremented whenever the entries of a command are invalidated,
+        # so responses requested before an invalidation are not stored afterwards
+        self._generations = {}
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+
+    def get_ttl(self, command: Command or str) -> float or None:
+        """
+        :param command: a command
+        :return: the time to live of responses of this command, None if they are not cached
+        """
+        return self._ttls.get(_command_value(command))
+
+    def get(self, command: Command or str, parameters: dict or None, key, load) -> dict:
+        """
+        Returns a copy of the cached response or loads (and caches) it.
+        :param command: the command of the request
+        :param parameters: the parameters of the request
+        :param key: key identifying the request (f.ex. its url)
+        :param load: function without arguments that requests the response from the gateway
+        :return: the api response
+        """
+        command = _command_value(command)
+        ttl = self._ttls.get(command)
+        if ttl is None:
+            return load()
+
+        with self._lock:
+            entry = self._entries.get((command, key))
+            if entry is not None:
+                age = time.monotonic() - entry.fetched_at
+                if age < ttl:
+                    self._hits += 1
+                    return copy_response(entry.response)
+
+                if age < ttl + self._stale_ttl:
+                    self._stale_hits += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        threading.Thread(target=self._refresh, args=(command, parameters, key, load, entry),
+                                         daemon=True).start()
+                    return copy_response(entry.response)
+
+            self._misses += 1
+            generation = self._generations.get(command, 0)
+
+        response = load()
+        self._store(command, parameters, key, response, generation)
+        return copy_response(response)
+
+    def _refresh(self, command: str, parameters: dict or None, key, load, entry: _Entry) -> None:
+        """
+        Reloads a stale entry in the background.
+        """
+        generation = self._generations.get(command, 0)
+        try:
+            self._store(command, parameters, key, load(), generation)
+        except Exception:
+            # keep serving the stale response until it expires, the next reader tries again
+            pass
+        finally:
+            entry.refreshing = False
+
+    def _store(self, command: str, parameters: dict or None, key, response: dict, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(command, 0) == generation:
+                self._entries[(command, key)] = _Entry(_get_number(parameters), response)
+
+    def record_write(self, command: Command or str, parameters: dict or None, response: dict) -> None:
+        """
+        Updates the cache after a successful write command.
+        Cached device lists are patched with the new device state, all other affected entries are removed.
+        :param command: the write command
+        :param parameters: the parameters of the write command
+        :param response: the response of the write command
+        """
+        command = _command_value(command)
+        affected_commands = _AFFECTED_COMMANDS.get(command)
+        if affected_commands is None:
+            # unknown write command, better safe than sorry
+            self.invalidate()
+            return
+
+        number = _get_number(parameters)
+        if number is None:
+            for affected_command in affected_commands:
+                self.invalidate(affected_command)
+            return
+
+        with self._lock:
+            for cache_key, entry in list(self._entries.items()):
+                affected_command = cache_key[0]
+                if affected_command not in affected_commands:
+                    continue
+
+                if affected_command in _LIST_NODES and command in (Command.SET_STATE_ACTUATOR.value,
+                                                                   Command.SET_STATE_SENSOR.value):
+                    self._patch_list(entry, _LIST_NODES[affected_command], number, response)
+                elif affected_command in _LIST_NODES or entry.number == number:
+                    del self._entries[cache_key]
+
+            # in-flight loads may have fetched the old state
+            for affected_command in affected_commands:
+                self._generations[affected_command] = self._generations.get(affected_command, 0) + 1
+
+    @staticmethod
+    def _patch_list(entry: _Entry, node: str, number: int, response: dict) -> None:
+        """
+        Applies the device state of a write response to a cached device list.
+        """
+        devices = entry.response.get(node)
+        state = response.get(node)
+        if not isinstance(devices, list) or not isinstance(state, dict) or not 1 <= number <= len(devices):
+            return
+
+        # don't modify the cached response in place, readers may be copying it right now
+        device = dict(devices[number - 1])
+        for key in _STATE_PROPERTIES:
+            if key in state:
+                device[key] = state[key]
+
+        devices = list(devices)
+        devices[number - 1] = device
+        patched_response = dict(entry.response)
+        patched_response[node] = devices
+        entry.response = patched_response
+
+    def invalidate(self, command: Command or str = None) -> None:
+        """
+        Removes cached responses.
+        :param command: the command whose responses are removed, all responses if None
+        """
+        with self._lock:
+            if command is None:
+                commands = set(command for command, _ in self._entries) | set(self._ttls)
+                self._entries.clear()
+            else:
+                commands = [_command_value(command)]
+                for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == commands[0]]:
+                    del self._entries[cache_key]
+
+            for command_value in commands:
+                self._generations[command_value] = self._generations.get(command_value, 0) + 1
+
+    def get_stats(self) -> dict:
+        """
+        :return: a dict with the number of fresh ("hits") and stale ("stale_hits") responses served from the cache
+                 and the number of responses requested from the gateway ("misses")
+        """
+        return {
+            "hits": self._hits,
+            "stale_hits": self._stale_hits,
+            "misses": self._misses
+        }
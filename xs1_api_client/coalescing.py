@@ -0,0 +1,279 @@
+"""
+Request coalescing (single-flight) used to share a single gateway request between concurrent callers
+and write coalescing used to collapse rapid successive writes to the same device.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+from xs1_api_client.caching import copy_response
+
+
+class _Call(object):
+    """
+    A single in-flight execution that other callers can wait for.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Executes a function only once for concurrent callers using the same key.
+    Callers arriving while an execution for their key is in flight wait for it and receive a copy of its result.
+    Results must be api responses (dicts, lists and immutable values), see copy_response().
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._hits = 0
+        self._misses = 0
+
+    def execute(self, key, func):
+        """
+        Executes the given function or waits for an in-flight execution with the same key.
+        :param key: key identifying equal executions
+        :param func: function without arguments to execute
+        :return: the result of the function (every caller receives its own copy)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self._misses += 1
+                leader = True
+            else:
+                self._hits += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # callers are free to modify their response, so don't share it
+            return copy_response(call.result)
+
+        try:
+            result = func()
+            # keep an untouched copy for the followers, the leader's caller may modify the result right away
+            call.result = copy_response(result)
+            return result
+        except Exception as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def get_hits(self) -> int:
+        """
+        :return: number of callers that joined an in-flight execution
+        """
+        return self._hits
+
+    def get_misses(self) -> int:
+        """
+        :return: number of callers that started a new execution
+        """
+        return self._misses
+
+
+class _PendingWrite(object):
+    """
+    A write waiting to be executed, replaced by newer writes with the same key.
+    """
+
+    def __init__(self, func) -> None:
+        self.func = func
+        self.futures = []
+
+
+class _KeyState(object):
+    """
+    The writes of a single key: the one in flight (if any) and the one waiting for it.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = False
+        self.started = float("-inf")
+        self.pending = None
+        self.runner = False
+
+    def is_idle(self) -> bool:
+        return not self.in_flight and self.pending is None and not self.runner
+
+
+class WriteQueue(object):
+    """
+    Collapses rapid successive writes with the same key (f.ex. to the same actuator) to the latest one.
+
+    There is at most one write per key in flight. A write to an idle key is executed right away,
+    writes submitted while another write with the same key is in flight wait for it and replace each other,
+    all of their callers receive the result of the write that is finally executed. This write is started once
+    the previous one has finished and at least ``window`` seconds after it was started.
+    Keys are processed independently of each other (every busy key uses a thread of its own),
+    so a slow write to one actuator doesn't hold up writes to others.
+    """
+
+    def __init__(self, window: float = 0.1) -> None:
+        """
+        :param window: min time (in seconds) between the starts of two writes with the same key
+        """
+        self._window = window
+        self._condition = threading.Condition()
+        self._states = {}
+
+        self._submitted = 0
+        self._executed = 0
+        self._elided = 0
+
+    def submit(self, key, func) -> Future:
+        """
+        Queues a write without waiting for it.
+        :param key: key identifying writes that replace each other
+        :param func: function without arguments executing the write
+        :return: a future resolving to the result of the executed write
+        """
+        future = Future()
+        with self._condition:
+            self._submitted += 1
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _KeyState()
+
+            if state.pending is None:
+                state.pending = _PendingWrite(func)
+            else:
+                state.pending.func = func
+                self._elided += 1
+            state.pending.futures.append(future)
+
+            if not state.runner:
+                state.runner = True
+                threading.Thread(target=self._run, args=(key, state), daemon=True).start()
+
+        return future
+
+    def execute(self, key, func):
+        """
+        Executes a write and waits for it.
+        A write to an idle key is executed right away on the calling thread,
+        otherwise it is queued behind the write in flight (and may be replaced by a newer one).
+        :param key: key identifying writes that replace each other
+        :param func: function without arguments executing the write
+        :return: the result of the executed write (which may be a newer one)
+        """
+        with self._condition:
+            state = self._states.get(key)
+            if state is not None:
+                state = None
+            else:
+                state = self._states[key] = _KeyState()
+                self._start(state)
+                self._submitted += 1
+
+        if state is None:
+            return self.submit(key, func).result()
+
+        try:
+            return func()
+        finally:
+            self._finish(key, state)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Executes all pending writes without waiting for their window and waits for them.
+        :param timeout: max time to wait (in seconds)
+        :return: True if all writes have been executed
+        """
+        with self._condition:
+            for state in self._states.values():
+                state.started = float("-inf")
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._states, timeout)
+
+    def get_pending(self) -> int:
+        """
+        :return: the number of writes waiting for a write in flight or their window
+        """
+        with self._condition:
+            return sum(1 for state in self._states.values() if state.pending is not None)
+
+    def get_stats(self) -> dict:
+        """
+        :return: the number of "submitted" writes, writes sent to the gateway ("executed")
+                 and writes replaced by newer ones ("elided")
+        """
+        return {
+            "submitted": self._submitted,
+            "executed": self._executed,
+            "elided": self._elided,
+        }
+
+    def _start(self, state: _KeyState) -> None:
+        """
+        Marks a write of this key as in flight, the condition has to be held.
+        """
+        state.in_flight = True
+        state.started = time.monotonic()
+        self._executed += 1
+
+    def _finish(self, key, state: _KeyState) -> None:
+        """
+        Marks the write in flight of this key as finished and forgets the key if it is idle.
+        """
+        with self._condition:
+            state.in_flight = False
+            if state.is_idle():
+                del self._states[key]
+            self._condition.notify_all()
+
+    def _run(self, key, state: _KeyState) -> None:
+        """
+        Executes the pending writes of a single key until there are none left.
+        """
+        while True:
+            with self._condition:
+                while True:
+                    if state.pending is None:
+                        state.runner = False
+                        if state.is_idle():
+                            del self._states[key]
+                        self._condition.notify_all()
+                        return
+
+                    delay = state.started + self._window - time.monotonic()
+                    if not state.in_flight and delay <= 0:
+                        break
+                    self._condition.wait(delay if not state.in_flight else None)
+
+                write = state.pending
+                state.pending = None
+                self._start(state)
+
+            try:
+                self._execute(write)
+            finally:
+                self._finish(key, state)
+
+    @staticmethod
+    def _execute(write: _PendingWrite) -> None:
+        try:
+            result = write.func()
+        except Exception as ex:
+            for future in write.futures:
+                future.set_exception(ex)
+            return
+
+        # callers are free to modify their response, so don't share it,
+        # copy it before any caller is woken up
+        results = [result] + [copy_response(result) for _ in write.futures[1:]]
+        for future, future_result in zip(write.futures, results):
+            future.set_result(future_result)
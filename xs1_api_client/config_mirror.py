@@ -0,0 +1,113 @@
+"""
+A local copy of the device configurations of a gateway.
+
+Reading a configuration requires a request per device, although configurations rarely change.
+The mirror keeps every configuration it has seen and drops it as soon as a device list or state response
+shows a different name or type for its slot, so changes made by other clients are picked up as well.
+"""
+
+import threading
+
+from xs1_api_client.api_constants import Node
+from xs1_api_client.caching import copy_response
+
+# properties of a configuration that are also part of device list and state responses
+_OBSERVED_PROPERTIES = [Node.PARAM_NAME.value, Node.PARAM_TYPE.value]
+
+
+class ConfigMirror(object):
+    """
+    Caches device configurations per device kind (Node.ACTUATOR or Node.SENSOR) and number.
+    Configurations are returned as copies, so callers are free to modify them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._configs = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, node: Node, number: int, load) -> dict:
+        """
+        Returns the mirrored configuration of a device or loads it.
+        :param node: the kind of the device (Node.ACTUATOR or Node.SENSOR)
+        :param number: the number of the device
+        :param load: function without arguments that requests the configuration from the gateway
+        :return: a copy of the device configuration
+        """
+        key = (node, int(number))
+        with self._lock:
+            config = self._configs.get(key)
+            if config is not None:
+                self._hits += 1
+                return copy_response(config)
+            self._misses += 1
+
+        config = load()
+        self.update(node, number, config)
+        return copy_response(config)
+
+    def update(self, node: Node, number: int, config: dict) -> None:
+        """
+        Stores the current configuration of a device (f.ex. the response of a set_config_* request).
+        :param node: the kind of the device (Node.ACTUATOR or Node.SENSOR)
+        :param number: the number of the device
+        :param config: the device configuration
+        """
+        if not isinstance(config, dict):
+            return
+
+        with self._lock:
+            self._configs[(node, int(number))] = copy_response(config)
+
+    def observe(self, node: Node, number: int, state: dict) -> None:
+        """
+        Drops the configuration of a device if its name or type differs from the given device state.
+        :param node: the kind of the device (Node.ACTUATOR or Node.SENSOR)
+        :param number: the number of the device
+        :param state: the device state of a list or state response
+        """
+        key = (node, int(number))
+        with self._lock:
+            config = self._configs.get(key)
+            if config is None:
+                return
+
+            for name in _OBSERVED_PROPERTIES:
+                if name in state and state[name] != config.get(name):
+                    del self._configs[key]
+                    return
+
+    def observe_list(self, node: Node, states: list) -> None:
+        """
+        Drops all configurations whose name or type differs from a device list response.
+        :param node: the kind of the devices (Node.ACTUATOR or Node.SENSOR)
+        :param states: the device states of the list response (ordered by number)
+        """
+        for number, state in enumerate(states, start=1):
+            self.observe(node, number, state)
+
+    def invalidate(self, node: Node = None, number: int = None) -> None:
+        """
+        Drops mirrored configurations.
+        :param node: the kind of devices to drop, all if None
+        :param number: the device to drop, all devices of this kind if None
+        """
+        with self._lock:
+            if node is None:
+                self._configs.clear()
+            elif number is None:
+                for key in [key for key in self._configs if key[0] == node]:
+                    del self._configs[key]
+            else:
+                self._configs.pop((node, int(number)), None)
+
+    def get_stats(self) -> dict:
+        """
+        :return: a dict with the number of configurations served from the mirror ("hits")
+                 and requested from the gateway ("misses")
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses
+        }
@@ -0,0 +1,192 @@
+"""
+Tracking of actuator writes until the gateway confirms them.
+
+After a new value has been set the gateway reports it as ``newvalue`` while it is still transmitting it to the
+device, ``value`` only changes once the transmission is done. A WriteConfirmation resolves when both are equal.
+All pending confirmations of a gateway are checked by a single background thread using one list request
+per round (see XS1.refresh), with a growing delay between rounds, so confirming many writes at once
+doesn't multiply the requests sent to the gateway.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+
+class ConfirmationTimeout(TimeoutError):
+    """
+    The gateway didn't confirm a write in time.
+    """
+
+    def __init__(self, actuator) -> None:
+        super(ConfirmationTimeout, self).__init__(
+            "Actuator %s did not reach its new value %s" % (actuator.number(), actuator.new_value()))
+        self.actuator = actuator
+
+
+def is_confirmed(actuator) -> bool:
+    """
+    :param actuator: an actuator object
+    :return: True if the last value set on the actuator has reached the device
+    """
+    return actuator.value() == actuator.new_value()
+
+
+class WriteConfirmation(Future):
+    """
+    A future resolving to the actuator once its value equals its new value,
+    or failing with a ConfirmationTimeout.
+    """
+
+    def __init__(self, actuator, deadline: float) -> None:
+        """
+        :param actuator: the written actuator
+        :param deadline: time (time.monotonic()) after which the write is considered failed
+        """
+        super(WriteConfirmation, self).__init__()
+        self.actuator = actuator
+        self.deadline = deadline
+        # confirmations are resolved by the tracker only and can't be cancelled
+        self.set_running_or_notify_cancel()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Waits for the confirmation.
+        :param timeout: max time to wait (in seconds), until the confirmation is resolved if None
+        :return: True if the write has been confirmed, False if it failed or is still pending
+        """
+        try:
+            self.result(timeout)
+        except Exception:
+            return False
+        return True
+
+
+class ConfirmationTracker(object):
+    """
+    Checks pending write confirmations of a gateway on a shared background thread.
+    The thread only runs while there are pending confirmations.
+    Timeouts are detected by the checks, so they resolve up to max_delay late.
+    """
+
+    def __init__(self, api=None, timeout: float = 10.0, initial_delay: float = 0.25, max_delay: float = 2.0,
+                 backoff_factor: float = 2.0) -> None:
+        """
+        :param api: the XS1 object used to refresh the actuators,
+                    if None it is set by the XS1 object this tracker is passed to
+        :param timeout: default time (in seconds) until a write is considered failed
+        :param initial_delay: delay before the first check after a write (in seconds)
+        :param max_delay: upper bound of the delay between two checks (in seconds)
+        :param backoff_factor: factor the delay is multiplied with after every check
+        """
+        self._api = api
+        self._timeout = timeout
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._backoff_factor = backoff_factor
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._delay = initial_delay
+        self._thread = None
+
+        self._stats = {
+            "rounds": 0,
+            "confirmed": 0,
+            "timeouts": 0,
+            "errors": 0,
+        }
+
+    def get_api(self):
+        """
+        :return: the XS1 object used to refresh the actuators
+        """
+        return self._api
+
+    def set_api(self, api) -> None:
+        """
+        :param api: the XS1 object used to refresh the actuators
+        """
+        self._api = api
+
+    def track(self, actuator, timeout: float = None) -> WriteConfirmation:
+        """
+        Starts tracking a write.
+        :param actuator: the written actuator (with the state of the write response)
+        :param timeout: time (in seconds) until the write is considered failed, the default timeout if None
+        :return: the confirmation, already resolved if the gateway confirmed the write immediately
+        """
+        timeout = timeout if timeout is not None else self._timeout
+        confirmation = WriteConfirmation(actuator, time.monotonic() + timeout)
+        if is_confirmed(actuator):
+            self._stats["confirmed"] += 1
+            confirmation.set_result(actuator)
+            return confirmation
+
+        with self._condition:
+            self._pending.append(confirmation)
+            # check soon, the new write is likely to be done quickly
+            self._delay = self._initial_delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+        return confirmation
+
+    def get_pending(self) -> int:
+        """
+        :return: the number of writes that haven't been confirmed yet
+        """
+        return len(self._pending)
+
+    def get_stats(self) -> dict:
+        """
+        :return: the number of check "rounds", "confirmed" writes, "timeouts" and failed checks ("errors")
+        """
+        return dict(self._stats)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                # wait for the delay, new writes reset it
+                deadline = time.monotonic() + self._delay
+                while self._pending and time.monotonic() < deadline:
+                    self._condition.wait(deadline - time.monotonic())
+                    deadline = min(deadline, time.monotonic() + self._delay)
+
+                if not self._pending:
+                    self._thread = None
+                    return
+
+                pending = list(self._pending)
+                self._delay = min(self._max_delay, self._delay * self._backoff_factor)
+
+            self._check(pending)
+
+    def _check(self, pending: [WriteConfirmation]) -> None:
+        """
+        Refreshes the actuators of pending confirmations and resolves the finished ones.
+        """
+        self._stats["rounds"] += 1
+        try:
+            self._api.refresh([confirmation.actuator for confirmation in pending])
+        except Exception:
+            # try again in the next round, unless the deadline is reached
+            self._stats["errors"] += 1
+
+        now = time.monotonic()
+        finished = []
+        for confirmation in pending:
+            if is_confirmed(confirmation.actuator):
+                self._stats["confirmed"] += 1
+                confirmation.set_result(confirmation.actuator)
+                finished.append(confirmation)
+            elif now >= confirmation.deadline:
+                self._stats["timeouts"] += 1
+                confirmation.set_exception(ConfirmationTimeout(confirmation.actuator))
+                finished.append(confirmation)
+
+        finished = set(id(confirmation) for confirmation in finished)
+        with self._condition:
+            self._pending = [confirmation for confirmation in self._pending if id(confirmation) not in finished]
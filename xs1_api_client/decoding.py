@@ -0,0 +1,58 @@
+"""
+Decoding of the JSONP responses sent by the XS1 gateway.
+
+Responses look like ``callback({...})``. The JSON object is located in the raw response bytes
+and decoded without creating intermediate text copies of the whole response.
+If orjson is installed it is used for decoding, otherwise the json module of the standard library is used.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def decode_jsonp(body: bytes, encoding: str = None) -> dict:
+    """
+    Decodes a JSONP response of the gateway.
+    :param body: the raw response body
+    :param encoding: the encoding specified by the response headers, used if the body is not valid UTF-8
+    :return: the decoded JSON object
+    """
+    start = body.find(b'{')
+    end = body.rfind(b'}') + 1
+    if start < 0 or end <= start:
+        raise ValueError("Invalid api response, no JSON object found!")
+
+    if orjson is not None:
+        try:
+            # a memoryview slice does not copy the response
+            return orjson.loads(memoryview(body)[start:end])
+        except orjson.JSONDecodeError:
+            # not UTF-8 or otherwise unsupported by orjson, let the standard library decide
+            pass
+
+    return _decode_json(body, start, encoding)
+
+
+def _decode_json(body: bytes, start: int, encoding: str = None) -> dict:
+    """
+    Decodes the JSON object starting at body[start] using the json module of the standard library.
+    :param body: the raw response body
+    :param start: index of the first byte of the JSON object
+    :param encoding: the encoding to use if the body is not valid UTF-8
+    :return: the decoded JSON object
+    """
+    try:
+        text = body.decode('utf-8')
+    except UnicodeDecodeError:
+        text = body.decode(encoding or 'iso-8859-1')
+
+    # parse in place instead of slicing the json object out of the text first,
+    # everything in front of it is ASCII so the index is the same
+    result, _ = _JSON_DECODER.raw_decode(text, start)
+    return result
@@ -2,23 +2,54 @@ import re
 
 from xs1_api_client.api_constants import Node, ActuatorType, SensorType
 
+# state keys parsed into the fields of a device
+_ID = Node.PARAM_ID.value
+_NUMBER = Node.PARAM_NUMBER.value
+_NAME = Node.PARAM_NAME.value
+_TYPE = Node.PARAM_TYPE.value
+_VALUE = Node.PARAM_VALUE.value
+_NEW_VALUE = Node.PARAM_NEW_VALUE.value
+_UNIT = Node.PARAM_UNIT.value
+_UTIME = Node.PARAM_UTIME.value
+
+# device type constants by value, actuator types take precedence over sensor types with the same value
+_DEVICE_TYPES = {}
+_DEVICE_TYPES.update({sensor_type.value: sensor_type for sensor_type in SensorType})
+_DEVICE_TYPES.update({actuator_type.value: actuator_type for actuator_type in ActuatorType})
+
 
 class XS1Device(object):
     """
     This is a generic XS1 device, all other objetcs inherit from this.
+
+    The properties of a device are parsed from its state once (when it is created and on every set_state() call),
+    the state itself is only kept if requested, since gateways may have hundreds of devices.
     """
 
+    __slots__ = ('_api_interface', '_id', '_number', '_name', '_type', '_value', '_new_value', '_unit', '_utime',
+                 '_raw')
+
     NAME_PATTERN_VALID = re.compile(r'^[a-zA-Z0-9_]+$', re.IGNORECASE)
 
-    def __init__(self, state: dict, api) -> None:
+    def __init__(self, state: dict, api, keep_raw: bool = False) -> None:
         """
         Initializes the device.
 
         :param state: json representation of this device (api response)
         :param api: the interface for handling api requests like fetching and setting values
+        :param keep_raw: keep the state (including fields this class doesn't parse) available using get_state()
         """
         self._api_interface = api
-        self._state = state
+        self._id = None
+        self._number = None
+        self._name = None
+        self._type = None
+        self._value = None
+        self._new_value = None
+        self._unit = None
+        self._utime = None
+        self._raw = {} if keep_raw else None
+        self.set_state(state)
 
     def __str__(self) -> str:
         """
@@ -31,55 +62,76 @@ class XS1Device(object):
     def set_state(self, new_state: dict) -> None:
         """
         Sets a new state for this device.
-        If there is an existing state, new and old values will be merged
-        to retain any information that was missing from api responses.
+        New and old values will be merged to retain any information that was missing from api responses.
 
         :param new_state: new representation of this device (api response)
         """
-        if self._state:
-            for key, value in new_state.items():
-                self._state[key] = value
-
-                #  self._state = {**self._state, **new_state}  # merge dicts (Python 3.5 required)
-        else:
-            self._state = new_state  # set initial state
+        if _ID in new_state:
+            self._id = new_state[_ID]
+        if _NUMBER in new_state:
+            self._number = new_state[_NUMBER]
+        if _NAME in new_state:
+            self._name = new_state[_NAME]
+        if _TYPE in new_state:
+            device_type = new_state[_TYPE]
+            # convert string value to Enum constant if possible
+            self._type = _DEVICE_TYPES.get(device_type, device_type)
+        if _VALUE in new_state:
+            self._value = new_state[_VALUE]
+        if _NEW_VALUE in new_state:
+            self._new_value = new_state[_NEW_VALUE]
+        if _UNIT in new_state:
+            self._unit = new_state[_UNIT]
+        if _UTIME in new_state:
+            self._utime = new_state[_UTIME]
+
+        if self._raw is not None:
+            self._raw.update(new_state)
+
+    def get_state(self) -> dict:
+        """
+        :return: the state of this device, the merged api responses if the device keeps its raw state,
+                 otherwise a new dict of the parsed properties
+        """
+        if self._raw is not None:
+            return self._raw
+
+        state = {
+            _ID: self._id,
+            _NUMBER: self._number,
+            _NAME: self._name,
+            _TYPE: getattr(self._type, "value", self._type),
+            _VALUE: self._value,
+            _NEW_VALUE: self._new_value,
+            _UTIME: self._utime,
+        }
+        if self._unit is not None:
+            state[_UNIT] = self._unit
+        return state
 
     def id(self) -> int:
         """
         :return: id of this device
         """
-        return self._get_node_value(self._state, Node.PARAM_ID)
+        return self._id
 
     def number(self) -> int:
         """
         :return: number of this device
         """
-        return self._get_node_value(self._state, Node.PARAM_NUMBER)
+        return self._number
 
     def type(self) -> ActuatorType or SensorType or str:
         """
         :return: the type of this device
         """
-        device_type_string = self._get_node_value(self._state, Node.PARAM_TYPE)
-
-        # try to convert string value to Enum constant
-        try:
-            return ActuatorType(device_type_string)
-        except ValueError:
-            pass
-
-        try:
-            return SensorType(device_type_string)
-        except ValueError:
-            pass
-
-        return device_type_string
+        return self._type
 
     def name(self) -> str:
         """
         :return: the name of this device
         """
-        return self._get_node_value(self._state, Node.PARAM_NAME)
+        return self._name
 
     def set_name(self, name: str):
         """
@@ -96,7 +148,7 @@ class XS1Device(object):
         """
         :return: the current value of this device
         """
-        return self._get_node_value(self._state, Node.PARAM_VALUE)
+        return self._value
 
     def new_value(self):
         """
@@ -106,19 +158,19 @@ class XS1Device(object):
 
         :return: the new value to set for this device
         """
-        return self._get_node_value(self._state, Node.PARAM_NEW_VALUE)
+        return self._new_value
 
     def unit(self) -> str:
         """
         :return: the unit that is used for the value
         """
-        return self._get_node_value(self._state, Node.PARAM_UNIT)
+        return self._unit
 
     def last_update(self) -> int:
         """
         :return: the time when this device's value was updated last
         """
-        return self._get_node_value(self._state, Node.PARAM_UTIME)
+        return self._utime
 
     def set_value(self, value) -> None:
         """
@@ -140,7 +192,7 @@ class XS1Device(object):
         """
         :return: Returns if this device is enabled.
         """
-        return not ActuatorType.DISABLED == self.type()
+        return self._type is not ActuatorType.DISABLED
 
     def _get_node_value(self, dictionary: dict, node: Node or str) -> str or None:
         """
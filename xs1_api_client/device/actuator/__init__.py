@@ -1,18 +1,51 @@
 from xs1_api_client.api_constants import Node, FunctionType
+from xs1_api_client.confirmation import WriteConfirmation
 from xs1_api_client.device import XS1Device
 
+# state keys of function definitions
+_FUNCTION = Node.PARAM_FUNCTION.value
+_TYPE = Node.PARAM_TYPE.value
+_DESCRIPTION = Node.PARAM_DESCRIPTION.value
+
+# function type constants by value
+_FUNCTION_TYPES = {function_type.value: function_type for function_type in FunctionType}
+
 
 class XS1Actuator(XS1Device):
     """
     Represents a basic XS1 Actuator, there may be special variants for some types.
     """
 
-    def __init__(self, state, api):
-        super(XS1Actuator, self).__init__(state, api)
+    __slots__ = ('_functions',)
+
+    def __init__(self, state, api, keep_raw: bool = False):
+        self._functions = None
+        super(XS1Actuator, self).__init__(state, api, keep_raw)
 
     def __str__(self):
         return "Actuator: " + super(XS1Actuator, self).__str__()
 
+    def set_state(self, new_state: dict) -> None:
+        """
+        Sets a new state for this actuator, including its function definitions.
+
+        :param new_state: new representation of this actuator (api response)
+        """
+        super(XS1Actuator, self).set_state(new_state)
+        if _FUNCTION in new_state:
+            # keep the function definitions as they are, they are only converted when requested by get_functions()
+            self._functions = new_state[_FUNCTION]
+
+    def get_state(self) -> dict:
+        """
+        :return: the state of this actuator, see XS1Device.get_state()
+        """
+        state = super(XS1Actuator, self).get_state()
+        if self._functions is not None and _FUNCTION not in state:
+            state[_FUNCTION] = [{_TYPE: xs1_function.get(_TYPE), _DESCRIPTION: xs1_function.get(_DESCRIPTION)}
+                                for xs1_function in self._functions]
+        return state
+
     def update(self) -> None:
         """
         Updates the state of this actuator
@@ -43,19 +76,24 @@ class XS1Actuator(XS1Device):
         new_name = self._get_node_value(result, "name")
 
         # save new_name to internal state
-        self._state[Node.PARAM_NAME.value] = new_name
+        self.set_state({Node.PARAM_NAME.value: new_name})
 
         return new_name
 
-    def set_value(self, value) -> None:
+    def set_value(self, value, confirm: bool = False) -> WriteConfirmation or None:
         """
         Sets a new value for this actuator
         :param value: new value to set
+        :param confirm: track the write until the new value reached the device
+        :return: a WriteConfirmation if confirm is True
         """
         new_state = self._api_interface.set_actuator_value(self.number(), value)
         new_value = self._get_node_value(new_state, Node.ACTUATOR)
         self.set_state(new_value)
 
+        if confirm:
+            return self._api_interface.confirm_write(self)
+
     def get_function_by_id(self, func_id):
         """
         Get a function by it's id
@@ -85,35 +123,30 @@ class XS1Actuator(XS1Device):
         :return: a list of functions that can be executed using the call_function() method
         """
         functions = []
-        for idx, xs1_function in enumerate(self._get_node_value(self._state, Node.PARAM_FUNCTION)):
-            if self._get_node_value(xs1_function, Node.PARAM_TYPE) != FunctionType.DISABLED.value:
-                try:
-                    function_type = FunctionType(self._get_node_value(xs1_function, Node.PARAM_TYPE))
-                except ValueError:
-                    function_type = FunctionType.UNKNOWN
-
-                functions.append(
-                    XS1Function(self,
-                                idx + 1,
-                                function_type,
-                                self._get_node_value(xs1_function, Node.PARAM_DESCRIPTION)
-                                )
-                )
+        for idx, xs1_function in enumerate(self._functions):
+            function_type = _FUNCTION_TYPES.get(xs1_function.get(_TYPE), FunctionType.UNKNOWN)
+            if function_type is not FunctionType.DISABLED:
+                functions.append(XS1Function(self, idx + 1, function_type, xs1_function.get(_DESCRIPTION)))
 
         return functions
 
-    def call_function(self, xs1_function):
+    def call_function(self, xs1_function, confirm: bool = False) -> WriteConfirmation or None:
         """
         Calls the specified function by id and saves the api response as the new state
         :param xs1_function: XS1Function object
+        :param confirm: track the write until the new value reached the device
+        :return: a WriteConfirmation if confirm is True
         """
         if not isinstance(xs1_function, XS1Function):
             raise ValueError('Invalid function object type! Has to be a XS1Function!')
 
-        response = self._api_interface.call_actuator_function(self.id(), xs1_function.id())
+        response = self._api_interface.call_actuator_function(self.number(), xs1_function.id())
         new_value = self._get_node_value(response, Node.ACTUATOR)
         self.set_state(new_value)
 
+        if confirm:
+            return self._api_interface.confirm_write(self)
+
 
 class XS1Function(object):
     """
@@ -156,8 +189,10 @@ class XS1Function(object):
         """
         return self._description
 
-    def execute(self) -> None:
+    def execute(self, confirm: bool = False) -> WriteConfirmation or None:
         """
         Executes this function and sets the response as the new actuator value
+        :param confirm: track the write until the new value reached the device
+        :return: a WriteConfirmation if confirm is True
         """
-        self._actuator.call_function(self)
+        return self._actuator.call_function(self, confirm)
@@ -1,4 +1,5 @@
 from xs1_api_client.api_constants import Node
+from xs1_api_client.confirmation import WriteConfirmation
 from xs1_api_client.device.actuator import XS1Actuator
 
 
@@ -7,18 +8,26 @@ class XS1Switch(XS1Actuator):
     Represents a XS1 Switch.
     """
 
-    def __init__(self, state, api):
+    __slots__ = ()
+
+    def __init__(self, state, api, keep_raw: bool = False):
         """Initializes the switch."""
-        super(XS1Switch, self).__init__(state, api)
+        super(XS1Switch, self).__init__(state, api, keep_raw)
 
-    def turn_on(self) -> None:
+    def turn_on(self, confirm: bool = False) -> WriteConfirmation or None:
         """Turns on the switch."""
         response = self._api_interface.set_actuator_value(self.number(), 100)
         new_value = self._get_node_value(response, Node.ACTUATOR)
         self.set_state(new_value)
 
-    def turn_off(self) -> None:
+        if confirm:
+            return self._api_interface.confirm_write(self)
+
+    def turn_off(self, confirm: bool = False) -> WriteConfirmation or None:
         """Turns off the switch."""
         response = self._api_interface.set_actuator_value(self.number(), 0)
         new_value = self._get_node_value(response, Node.ACTUATOR)
         self.set_state(new_value)
+
+        if confirm:
+            return self._api_interface.confirm_write(self)
@@ -7,8 +7,10 @@ class XS1Thermostat(XS1Actuator):
     Represents a basic XS1 Actuator, there may be special variants for some types.
     """
 
-    def __init__(self, state, api):
-        super(XS1Actuator, self).__init__(state, api)
+    __slots__ = ()
+
+    def __init__(self, state, api, keep_raw: bool = False):
+        super(XS1Thermostat, self).__init__(state, api, keep_raw)
 
     def set_temperature(self, temp: float) -> None:
         """
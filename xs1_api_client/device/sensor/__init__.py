@@ -7,8 +7,10 @@ class XS1Sensor(XS1Device):
     Represents a XS1 Sensor
     """
 
-    def __init__(self, state, api):
-        super(XS1Sensor, self).__init__(state, api)
+    __slots__ = ()
+
+    def __init__(self, state, api, keep_raw: bool = False):
+        super(XS1Sensor, self).__init__(state, api, keep_raw)
 
     def __str__(self):
         return "Sensor: " + super(XS1Sensor, self).__str__()
@@ -43,7 +45,7 @@ class XS1Sensor(XS1Device):
         new_name = self._get_node_value(result, "name")
 
         # save new_name to internal state
-        self._state[Node.PARAM_NAME.value] = new_name
+        self.set_state({Node.PARAM_NAME.value: new_name})
 
         return new_name
 
@@ -0,0 +1,316 @@
+"""
+Client for the push interface of the XS1 gateway (``cmd=subscribe``).
+
+The gateway keeps the subscription request open and writes a line for every actuator or sensor update, f.ex.:
+
+    1511492305 2017 11 24 fr 3 58 25 +0100 A 3 switch 100.0
+
+(update time, date, time, time zone, "A" for actuators or "S" for sensors, device number, device type and value).
+Fields are separated by whitespace (``format=txt``) or tabs (``format=tsv``).
+"""
+
+import threading
+import time
+
+from xs1_api_client.api_constants import Command, Node
+from xs1_api_client.device import XS1Device
+from xs1_api_client.device.actuator import XS1Actuator
+from xs1_api_client.transport import Stream
+
+SUBSCRIBE_FORMAT = "txt"
+
+_NODE_CODES = {
+    "A": Node.ACTUATOR,
+    "S": Node.SENSOR,
+}
+_NODE_LETTERS = {node: letter for letter, node in _NODE_CODES.items()}
+_WEEKDAYS = ["mo", "tu", "we", "th", "fr", "sa", "su"]
+
+# number of fields of an event line
+_FIELD_COUNT = 13
+
+
+class DeviceEvent(object):
+    """
+    A single update pushed by the gateway.
+    """
+
+    def __init__(self, node: Node, number: int, device_type: str, value: float, utime: int) -> None:
+        """
+        :param node: the kind of the device (Node.ACTUATOR or Node.SENSOR)
+        :param number: the number of the device
+        :param device_type: the type of the device
+        :param value: the new value of the device
+        :param utime: the time of the update (unix timestamp)
+        """
+        self.node = node
+        self.number = number
+        self.device_type = device_type
+        self.value = value
+        self.utime = utime
+
+    def get_state(self) -> dict:
+        """
+        :return: the device state properties contained in this event
+        """
+        state = {
+            Node.PARAM_TYPE.value: self.device_type,
+            Node.PARAM_VALUE.value: self.value,
+            Node.PARAM_UTIME.value: self.utime,
+        }
+        if self.node == Node.ACTUATOR:
+            # the gateway only pushes values that have reached the actuator
+            state[Node.PARAM_NEW_VALUE.value] = self.value
+        return state
+
+    def __repr__(self) -> str:
+        return "DeviceEvent(%s %d %s: %s)" % (self.node.value, self.number, self.device_type, self.value)
+
+
+def parse_event(line: str or bytes) -> DeviceEvent or None:
+    """
+    :param line: a line of the event stream
+    :return: the event, None if the line is empty or not a device event
+    """
+    if isinstance(line, bytes):
+        line = line.decode('utf-8', 'replace')
+
+    fields = line.split()
+    if len(fields) < _FIELD_COUNT:
+        return None
+
+    node = _NODE_CODES.get(fields[9])
+    if node is None:
+        return None
+
+    try:
+        return DeviceEvent(node, int(fields[10]), fields[11], float(fields[12]), int(fields[0]))
+    except ValueError:
+        return None
+
+
+def format_event(node: Node, number: int, device_type: str, value: float, utime: int, separator: str = " ") -> str:
+    """
+    Creates an event line like the gateway does.
+    :param node: the kind of the device (Node.ACTUATOR or Node.SENSOR)
+    :param number: the number of the device
+    :param device_type: the type of the device
+    :param value: the new value of the device
+    :param utime: the time of the update (unix timestamp)
+    :param separator: the field separator (" " for the txt format, "\\t" for tsv)
+    :return: the event line (without a line break)
+    """
+    local_time = time.localtime(utime)
+    return separator.join(str(field) for field in [
+        utime, local_time.tm_year, local_time.tm_mon, local_time.tm_mday, _WEEKDAYS[local_time.tm_wday],
+        local_time.tm_hour, local_time.tm_min, local_time.tm_sec, time.strftime("%z", local_time),
+        _NODE_LETTERS[node], number, device_type, value])
+
+
+class XS1EventStream(object):
+    """
+    Holds a subscription to the push interface of the gateway and applies updates to registered devices.
+
+    Whenever the (re)connection succeeds the state of all registered devices is resynchronized
+    with one list request per device kind, so no update is lost while the stream was down.
+    """
+
+    def __init__(self, api, reconnect_delay: float = 1.0, max_reconnect_delay: float = 60.0,
+                 read_timeout: float = 300.0) -> None:
+        """
+        :param api: the XS1 object providing the connection info and used for resynchronization
+        :param reconnect_delay: delay before the first reconnection attempt (in seconds), doubled on every failure
+        :param max_reconnect_delay: upper bound of the reconnection delay (in seconds)
+        :param read_timeout: reconnect if the gateway didn't send anything for this long (in seconds)
+        """
+        self._api = api
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._read_timeout = read_timeout
+
+        self._lock = threading.Lock()
+        self._devices = {}
+        self._listeners = []
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._stream = None
+        self._connected = threading.Event()
+
+        self._stats = {
+            "connects": 0,
+            "disconnects": 0,
+            "resyncs": 0,
+            "events": 0,
+            "invalid_lines": 0,
+        }
+
+    def register(self, *devices: XS1Device) -> None:
+        """
+        Registers devices that are updated with the events of the stream.
+        :param devices: actuator and sensor objects
+        """
+        with self._lock:
+            for device in devices:
+                node = Node.ACTUATOR if isinstance(device, XS1Actuator) else Node.SENSOR
+                self._devices.setdefault((node, device.number()), []).append(device)
+
+    def unregister(self, *devices: XS1Device) -> None:
+        """
+        :param devices: previously registered devices
+        """
+        with self._lock:
+            for registered in self._devices.values():
+                registered[:] = [device for device in registered if not any(device is d for d in devices)]
+
+    def add_listener(self, listener) -> None:
+        """
+        Registers a function that is called with every DeviceEvent (after registered devices have been updated).
+        :param listener: function accepting a DeviceEvent
+        """
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener) -> None:
+        """
+        :param listener: a previously registered listener
+        """
+        with self._lock:
+            self._listeners = [registered for registered in self._listeners if registered is not listener]
+
+    def get_stats(self) -> dict:
+        """
+        :return: the number of (re)connections ("connects"), lost connections ("disconnects"), "resyncs",
+                 received "events" and lines that couldn't be parsed ("invalid_lines")
+        """
+        return dict(self._stats)
+
+    def is_connected(self) -> bool:
+        """
+        :return: True while the subscription is established
+        """
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout: float = None) -> bool:
+        """
+        Waits until the subscription is established (and registered devices have been resynchronized).
+        :param timeout: max time to wait (in seconds)
+        :return: True if the stream is connected
+        """
+        return self._connected.wait(timeout)
+
+    def start(self) -> None:
+        """
+        Starts receiving events on a background thread.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Closes the subscription and stops the background thread.
+        :param timeout: max time to wait for the background thread to finish (in seconds)
+        """
+        self._stop_event.set()
+        self._close_connection()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        delay = self._reconnect_delay
+        while not self._stop_event.is_set():
+            try:
+                stream = self._connect()
+                self._stats["connects"] += 1
+                self.resync()
+                self._connected.set()
+                delay = self._reconnect_delay
+                self._read_events(stream)
+            except Exception:
+                # reconnect below
+                pass
+            finally:
+                if self._connected.is_set():
+                    self._stats["disconnects"] += 1
+                self._connected.clear()
+                self._close_connection()
+
+            if self._stop_event.wait(delay):
+                break
+            delay = min(delay * 2, self._max_reconnect_delay)
+
+    def _connect(self) -> Stream:
+        """
+        Opens the subscription request using the transport of the api object.
+        :return: the streaming response
+        """
+        api = self._api
+        stream = api.get_transport().open_stream(api.get_request_url(Command.SUBSCRIBE, {"format": SUBSCRIBE_FORMAT}),
+                                                 api.REQUEST_TIMEOUT, self._read_timeout, api.get_auth())
+        self._stream = stream
+        if self._stop_event.is_set():
+            # stop() has been called while connecting
+            self._close_connection()
+        return stream
+
+    def _close_connection(self) -> None:
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close()
+
+    def _read_events(self, stream: Stream) -> None:
+        """
+        Reads and applies events until the connection is closed.
+        :param stream: the streaming response
+        """
+        while not self._stop_event.is_set():
+            line = stream.readline()
+            if not line:
+                # connection closed by the gateway
+                return
+            if not line.strip():
+                continue
+
+            event = parse_event(line)
+            if event is None:
+                self._stats["invalid_lines"] += 1
+                continue
+
+            self._stats["events"] += 1
+            self._apply(event)
+
+    def _apply(self, event: DeviceEvent) -> None:
+        """
+        Applies an event to the registered devices and notifies the listeners.
+        """
+        state = event.get_state()
+        for device in self._devices.get((event.node, event.number), []):
+            device.set_state(dict(state))
+
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                # a broken listener must not stop the stream
+                pass
+
+    def resync(self) -> None:
+        """
+        Updates all registered devices with one list request per device kind.
+        """
+        with self._lock:
+            devices = [device for registered in self._devices.values() for device in registered]
+
+        self._api.refresh(devices)
+        self._stats["resyncs"] += 1
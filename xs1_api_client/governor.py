@@ -0,0 +1,114 @@
+"""
+Adaptive concurrency limiting for requests sent to the XS1 gateway.
+
+The gateway is a small embedded device that starts failing when it receives too many parallel requests.
+The ConcurrencyGovernor limits the number of requests in flight and adapts this limit using
+AIMD (additive increase, multiplicative decrease): the limit grows slowly while responses are fast
+and is cut down quickly on timeouts or server errors.
+"""
+
+import threading
+import time
+
+from xs1_api_client.resilience import is_gateway_failure
+
+
+class ConcurrencyGovernor(object):
+    """
+    Limits the number of concurrent requests and adapts the limit to the health of the gateway.
+    """
+
+    def __init__(self, initial_limit: int = 2, min_limit: int = 1, max_limit: int = 8,
+                 latency_threshold: float = 1.0, backoff_factor: float = 0.5) -> None:
+        """
+        Creates a new governor.
+        :param initial_limit: number of concurrent requests allowed initially
+        :param min_limit: the limit never drops below this value
+        :param max_limit: the limit never grows above this value
+        :param latency_threshold: max latency of a request (in seconds) that is still considered healthy
+        :param backoff_factor: factor the limit is multiplied with when a request fails
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit!")
+        if not 0 < backoff_factor < 1:
+            raise ValueError("backoff_factor must be between 0 and 1!")
+
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_threshold = latency_threshold
+        self._backoff_factor = backoff_factor
+
+        self._condition = threading.Condition()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiting = 0
+
+    def get_limit(self) -> int:
+        """
+        :return: the current number of concurrent requests allowed
+        """
+        return int(self._limit)
+
+    def get_max_limit(self) -> int:
+        """
+        :return: the upper bound of the limit
+        """
+        return self._max_limit
+
+    def get_in_flight(self) -> int:
+        """
+        :return: the number of requests currently in flight
+        """
+        return self._in_flight
+
+    def get_queue_depth(self) -> int:
+        """
+        :return: the number of requests currently waiting for a free slot
+        """
+        return self._waiting
+
+    def execute(self, func, *args, **kwargs):
+        """
+        Executes a request as soon as the current limit allows it
+        and adapts the limit based on its outcome.
+        :param func: the request function
+        :return: the result of the function
+        """
+        self._acquire()
+        start = time.monotonic()
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except Exception as ex:
+            failed = self.is_overload_error(ex)
+            raise
+        finally:
+            self._release(time.monotonic() - start, failed)
+
+    @staticmethod
+    def is_overload_error(error: Exception) -> bool:
+        """
+        :param error: an exception raised while sending a request
+        :return: True if the error indicates that the gateway is overloaded (timeouts, connection and server errors)
+        """
+        return is_gateway_failure(error)
+
+    def _acquire(self) -> None:
+        with self._condition:
+            self._waiting += 1
+            try:
+                while self._in_flight >= int(self._limit):
+                    self._condition.wait()
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+
+    def _release(self, latency: float, failed: bool) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            if failed:
+                self._limit = max(self._min_limit, self._limit * self._backoff_factor)
+            elif latency <= self._latency_threshold:
+                # grows by roughly one slot per "window" of successful requests
+                self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+            self._condition.notify_all()
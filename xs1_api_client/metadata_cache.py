@@ -0,0 +1,174 @@
+"""
+A disk cache for gateway metadata that (almost) never changes:
+the config info and the lists of systems, functions, actuator types and sensor types.
+
+Metadata is stored per gateway, identified by its MAC address and firmware version, so a firmware update
+invalidates it automatically. An index remembers which gateway was last seen at which address, which allows
+to start using cached metadata before the gateway has been contacted at all.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+
+from xs1_api_client.api_constants import Command, Node
+from xs1_api_client.caching import copy_response
+
+# commands whose responses are cached
+CACHED_COMMANDS = [
+    Command.GET_CONFIG_INFO,
+    Command.GET_LIST_SYSTEMS,
+    Command.GET_LIST_FUNCTIONS,
+    Command.GET_TYPES_ACTUATORS,
+    Command.GET_TYPES_SENSORS,
+]
+
+_INDEX_FILE = "gateways.json"
+
+
+def default_directory() -> str:
+    """
+    :return: the default cache directory of the current user
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "xs1_api_client")
+
+
+def gateway_key(config_info: dict) -> str or None:
+    """
+    :param config_info: a get_config_info response
+    :return: the key identifying the gateway and its firmware, None if the response doesn't contain them
+    """
+    info = config_info.get(Node.INFO.value) or {}
+    mac = info.get(Node.DEVICE_MAC.value)
+    firmware = info.get(Node.DEVICE_FIRMWARE_VERSION.value)
+    if not mac or not firmware:
+        return None
+
+    return re.sub(r"[^0-9a-zA-Z._]+", "-", "%s_%s" % (mac, firmware))
+
+
+class MetadataCache(object):
+    """
+    Stores static gateway metadata as JSON files in a directory.
+    Files that can't be read are ignored, failing writes don't raise either: the cache is only an optimization.
+    """
+
+    def __init__(self, directory: str = None) -> None:
+        """
+        :param directory: the cache directory, default_directory() if None
+        """
+        self._directory = directory if directory is not None else default_directory()
+        self._lock = threading.Lock()
+        self._index = None
+        self._gateways = {}
+
+    def get_directory(self) -> str:
+        """
+        :return: the cache directory
+        """
+        return self._directory
+
+    def get(self, address: str, command: Command) -> dict or None:
+        """
+        :param address: the address of the gateway (host and port)
+        :param command: one of CACHED_COMMANDS
+        :return: a copy of the cached response of the gateway last seen at this address, None if there is none
+        """
+        with self._lock:
+            key = self._get_index().get(address)
+            if key is None:
+                return None
+
+            response = self._get_responses(key).get(command.value)
+            return copy_response(response) if response is not None else None
+
+    def put(self, address: str, command: Command, response: dict) -> None:
+        """
+        Stores a response of the gateway at the given address.
+        A config info response (re)assigns the address to the gateway it identifies,
+        other responses are only stored if the gateway at this address is known.
+        :param address: the address of the gateway (host and port)
+        :param command: one of CACHED_COMMANDS
+        :param response: the api response
+        """
+        with self._lock:
+            index = self._get_index()
+            if command == Command.GET_CONFIG_INFO:
+                key = gateway_key(response)
+                if key is None:
+                    return
+                previous_key = index.get(address)
+                if previous_key != key:
+                    index[address] = key
+                    self._write(_INDEX_FILE, index)
+                    if previous_key is not None and previous_key not in index.values():
+                        # the metadata of the old firmware is of no use anymore
+                        self._gateways.pop(previous_key, None)
+                        self._remove(previous_key + ".json")
+            else:
+                key = index.get(address)
+                if key is None:
+                    return
+
+            responses = self._get_responses(key)
+            responses[command.value] = copy_response(response)
+            self._write(key + ".json", responses)
+
+    def clear(self) -> None:
+        """
+        Removes all cached metadata.
+        Only the files of this cache are removed, other files in the directory are left alone.
+        """
+        with self._lock:
+            keys = set(self._get_index().values()) | set(self._gateways.keys())
+            for key in keys:
+                self._remove(key + ".json")
+            self._remove(_INDEX_FILE)
+            self._index = {}
+            self._gateways = {}
+
+    def _get_index(self) -> dict:
+        if self._index is None:
+            self._index = self._read(_INDEX_FILE)
+        return self._index
+
+    def _get_responses(self, key: str) -> dict:
+        responses = self._gateways.get(key)
+        if responses is None:
+            responses = self._read(key + ".json")
+            self._gateways[key] = responses
+        return responses
+
+    def _read(self, filename: str) -> dict:
+        try:
+            with open(os.path.join(self._directory, filename), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, filename: str, data: dict) -> None:
+        temp_path = None
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            # write to a temporary file first so readers never see a partially written file
+            fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, os.path.join(self._directory, filename))
+            temp_path = None
+        except (OSError, TypeError, ValueError):
+            # OSError: the directory isn't writable, TypeError/ValueError: the data can't be serialized
+            pass
+        finally:
+            if temp_path is not None:
+                self._remove(temp_path)
+
+    def _remove(self, filename: str) -> None:
+        try:
+            os.remove(os.path.join(self._directory, filename))
+        except OSError:
+            pass
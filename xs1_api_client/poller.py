@@ -0,0 +1,274 @@
+"""
+Polling of device lists with change detection.
+
+Every poll cycle requests the device lists and compares every device with the previous cycle using its
+id, value, new value and update time. Only changed devices produce events, unchanged devices cost a tuple
+comparison and no objects are created for them.
+"""
+
+import threading
+import time
+
+from xs1_api_client.api_constants import Command, Node
+
+# device properties compared between poll cycles
+_COMPARED_PROPERTIES = [Node.PARAM_ID.value, Node.PARAM_VALUE.value, Node.PARAM_NEW_VALUE.value,
+                        Node.PARAM_UTIME.value]
+
+_LIST_COMMANDS = {
+    Node.ACTUATOR: Command.GET_LIST_ACTUATORS,
+    Node.SENSOR: Command.GET_LIST_SENSORS,
+}
+
+
+def _fingerprint(state: dict) -> tuple:
+    return tuple(state.get(name) for name in _COMPARED_PROPERTIES)
+
+
+class ChangeEvent(object):
+    """
+    A change of a single device between two poll cycles.
+    """
+
+    def __init__(self, node: Node, number: int, old_state: dict or None, new_state: dict, device=None) -> None:
+        """
+        :param node: the kind of the device (Node.ACTUATOR or Node.SENSOR)
+        :param number: the number of the device
+        :param old_state: the state of the device in the previous cycle, None if it wasn't known before
+        :param new_state: the current state of the device
+        :param device: the device object of the registry (updated with the new state), if the registry knows it
+        """
+        self.node = node
+        self.number = number
+        self.old_state = old_state
+        self.new_state = new_state
+        self.device = device
+
+    def get_changed_properties(self) -> [str]:
+        """
+        :return: the names of the compared properties that have changed
+        """
+        if self.old_state is None:
+            return list(_COMPARED_PROPERTIES)
+        return [name for name in _COMPARED_PROPERTIES if self.old_state.get(name) != self.new_state.get(name)]
+
+    def __repr__(self) -> str:
+        return "ChangeEvent(%s %d: %s -> %s)" % (
+            self.node.value, self.number,
+            self.old_state.get(Node.PARAM_VALUE.value) if self.old_state is not None else None,
+            self.new_state.get(Node.PARAM_VALUE.value))
+
+
+class XS1Poller(object):
+    """
+    Polls the device lists of a gateway on a fixed schedule and reports changed devices.
+
+    Events are delivered to listeners by a background thread (start/stop) or can be consumed
+    in the current thread by iterating over events(). Failed poll cycles are counted and retried
+    on the next scheduled cycle.
+    """
+
+    def __init__(self, api, interval: float = 5.0, actuators: bool = True, sensors: bool = True,
+                 emit_initial: bool = False) -> None:
+        """
+        :param api: the XS1 object used to request the device lists
+        :param interval: time between the start of two poll cycles (in seconds)
+        :param actuators: poll the actuator list
+        :param sensors: poll the sensor list
+        :param emit_initial: emit an event for every device in the first cycle,
+                             otherwise the first cycle only records the initial states
+        """
+        self._api = api
+        self._interval = interval
+        self._nodes = [node for node, enabled in [(Node.ACTUATOR, actuators), (Node.SENSOR, sensors)] if enabled]
+        self._emit_initial = emit_initial
+
+        self._snapshots = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self._last_cycle = None
+        self._stats = {
+            "cycles": 0,
+            "errors": 0,
+            "events": 0,
+            "request_time": 0.0,
+            "diff_time": 0.0,
+        }
+
+    def add_listener(self, listener) -> None:
+        """
+        Registers a function that is called with every ChangeEvent by the background thread.
+        :param listener: function accepting a ChangeEvent
+        """
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener) -> None:
+        """
+        :param listener: a previously registered listener
+        """
+        with self._lock:
+            self._listeners = [registered for registered in self._listeners if registered is not listener]
+
+    def poll(self) -> [ChangeEvent]:
+        """
+        Executes a single poll cycle.
+        :return: the changes since the last cycle
+        """
+        events = []
+        snapshots = {}
+        request_time = 0.0
+        diff_time = 0.0
+        devices = 0
+
+        for node in self._nodes:
+            start = time.perf_counter()
+            response = self._api.call_api(_LIST_COMMANDS[node])
+            diffed = time.perf_counter()
+            request_time += diffed - start
+
+            states = response.get(node.value) or []
+            devices += len(states)
+            node_events, snapshots[node] = self._diff(node, states)
+            events.extend(node_events)
+            diff_time += time.perf_counter() - diffed
+
+        # only move on once all lists have been read, so a failed request doesn't lose the changes of other nodes
+        self._snapshots.update(snapshots)
+
+        self._last_cycle = {
+            "started_at": time.time(),
+            "request_time": request_time,
+            "diff_time": diff_time,
+            "devices": devices,
+            "events": len(events),
+        }
+        self._stats["cycles"] += 1
+        self._stats["events"] += len(events)
+        self._stats["request_time"] += request_time
+        self._stats["diff_time"] += diff_time
+        return events
+
+    def _diff(self, node: Node, states: list) -> ([ChangeEvent], dict):
+        """
+        Compares a device list with the previous one.
+        :param node: the kind of the devices
+        :param states: the device states of the list response (ordered by number)
+        :return: events for all changed devices and the snapshot to compare the next cycle with
+        """
+        previous = self._snapshots.get(node)
+        snapshot = {}
+        events = []
+        registry = self._api.get_registry()
+
+        for number, state in enumerate(states, start=1):
+            fingerprint = _fingerprint(state)
+            snapshot[number] = (fingerprint, state)
+
+            if previous is None:
+                if not self._emit_initial:
+                    continue
+                old_state = None
+            else:
+                old = previous.get(number)
+                if old is not None and old[0] == fingerprint:
+                    continue
+                old_state = old[1] if old is not None else None
+
+            # attach number to data so device objects can use it for future requests
+            state[Node.PARAM_NUMBER.value] = number
+            device = registry.update_device(node, number, state) if registry is not None else None
+            events.append(ChangeEvent(node, number, old_state, state, device))
+
+        return events, snapshot
+
+    def _notify(self, events: [ChangeEvent]) -> None:
+        for event in events:
+            for listener in self._listeners:
+                try:
+                    listener(event)
+                except Exception:
+                    # a broken listener must not stop the poller or other listeners
+                    pass
+
+    def _cycles(self):
+        """
+        Runs poll cycles on schedule until stopped.
+        :return: a generator of the events of each cycle
+        """
+        next_cycle = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                events = self.poll()
+            except Exception:
+                self._stats["errors"] += 1
+                events = []
+
+            yield events
+
+            # keep the schedule even if a cycle took a while, skip cycles that have been missed completely
+            next_cycle += self._interval
+            now = time.monotonic()
+            if next_cycle < now:
+                next_cycle = now
+            self._stop_event.wait(next_cycle - now)
+
+    def events(self):
+        """
+        Polls in the current thread and yields every change as it is detected, until stop() is called.
+        :return: a generator of ChangeEvents
+        """
+        self._stop_event.clear()
+        for events in self._cycles():
+            for event in events:
+                yield event
+
+    def start(self) -> None:
+        """
+        Starts polling on a background thread that delivers events to the listeners.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        for events in self._cycles():
+            self._notify(events)
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Stops polling.
+        :param timeout: max time to wait for the background thread to finish (in seconds)
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def get_last_cycle(self) -> dict or None:
+        """
+        :return: the cost of the last successful poll cycle: time spent on requests ("request_time") and
+                 comparing devices ("diff_time") in seconds, the number of compared "devices" and "events" emitted,
+                 None if there hasn't been a cycle yet
+        """
+        return self._last_cycle
+
+    def get_stats(self) -> dict:
+        """
+        :return: totals over all poll cycles: "cycles", failed cycles ("errors"), "events",
+                 "request_time" and "diff_time"
+        """
+        return dict(self._stats)
@@ -0,0 +1,226 @@
+"""
+An index of the devices of a gateway for lookups without any requests.
+"""
+
+import threading
+
+from xs1_api_client.api_constants import Command, Node, ApiConstant
+from xs1_api_client.device import XS1Device
+
+
+class _DeviceIndex(object):
+    """
+    Immutable lookup tables for one kind of devices.
+    """
+
+    def __init__(self, devices: [XS1Device]) -> None:
+        self.devices = devices
+        self.by_number = {}
+        self.by_id = {}
+        self.by_name = {}
+        self.by_type = {}
+
+        for device in devices:
+            device_type = device.type()
+            self.by_number[device.number()] = device
+            self.by_id.setdefault(device.id(), device)
+            self.by_name.setdefault(device.name(), device)
+            self.by_type.setdefault(getattr(device_type, "value", device_type), []).append(device)
+
+
+_EMPTY_INDEX = _DeviceIndex([])
+
+
+class DeviceRegistry(object):
+    """
+    Holds the current actuator and sensor objects of a gateway, indexed by id, number, name and type.
+
+    A refresh requests the device list once and updates the existing device objects in place,
+    so references to them stay valid. Objects are only replaced if a device changed into a different kind
+    (f.ex. from a switch to a temperature actuator).
+    """
+
+    def __init__(self, api, get_actuator_class, get_sensor_class) -> None:
+        """
+        :param api: the XS1 object used to request the device lists
+        :param get_actuator_class: function returning the class representing an actuator state
+        :param get_sensor_class: function returning the class representing a sensor state
+        """
+        self._api = api
+        self._get_actuator_class = get_actuator_class
+        self._get_sensor_class = get_sensor_class
+        self._lock = threading.Lock()
+        self._actuators = None
+        self._sensors = None
+
+    def clear(self) -> None:
+        """
+        Forgets all devices, they are requested again on the next lookup.
+        """
+        with self._lock:
+            self._actuators = None
+            self._sensors = None
+
+    def refresh(self) -> None:
+        """
+        Updates all actuators and sensors.
+        """
+        self.refresh_actuators()
+        self.refresh_sensors()
+
+    def refresh_actuators(self) -> [XS1Device]:
+        """
+        Updates all actuators using a single list request.
+        :return: all actuators
+        """
+        response = self._api.call_api(Command.GET_LIST_ACTUATORS)
+        with self._lock:
+            self._actuators = self._merge(self._actuators, response, Node.ACTUATOR, self._get_actuator_class)
+            return list(self._actuators.devices)
+
+    def refresh_sensors(self) -> [XS1Device]:
+        """
+        Updates all sensors using a single list request.
+        :return: all sensors
+        """
+        response = self._api.call_api(Command.GET_LIST_SENSORS)
+        with self._lock:
+            self._sensors = self._merge(self._sensors, response, Node.SENSOR, self._get_sensor_class)
+            return list(self._sensors.devices)
+
+    def _merge(self, index: _DeviceIndex or None, response: dict, node: Node, get_device_class) -> _DeviceIndex:
+        """
+        Applies a device list response to the existing devices.
+        :param index: the current index, None if there is none yet
+        :param response: the device list response
+        :param node: the node of the response containing the devices
+        :param get_device_class: function returning the device class for a device state
+        :return: the new index
+        """
+        existing = index.by_number if index is not None else {}
+
+        devices = []
+        for number, state in enumerate(response.get(node.value, []), start=1):
+            # attach number to data so we can use it for future requests
+            state[Node.PARAM_NUMBER.value] = number
+            device = existing.get(number)
+
+            device_class = get_device_class(state)
+            if device is None or type(device) is not device_class:
+                device = device_class(state, self._api, self._api.get_keep_raw_state())
+            else:
+                device.set_state(state)
+            devices.append(device)
+
+        return _DeviceIndex(devices)
+
+    def update_device(self, node: Node, number: int, state: dict) -> XS1Device or None:
+        """
+        Applies a new state to a known device without any request.
+        :param node: the kind of the device (Node.ACTUATOR or Node.SENSOR)
+        :param number: the number of the device
+        :param state: the new state of the device (f.ex. an entry of a device list response)
+        :return: the updated device, None if the registry doesn't know it (yet)
+        """
+        index = self._actuators if node == Node.ACTUATOR else self._sensors
+        device = index.by_number.get(number) if index is not None else None
+        if device is not None:
+            device.set_state(state)
+        return device
+
+    def _get_actuators(self, refresh: bool) -> _DeviceIndex:
+        if self._actuators is None or refresh:
+            self.refresh_actuators()
+        return self._actuators or _EMPTY_INDEX
+
+    def _get_sensors(self, refresh: bool) -> _DeviceIndex:
+        if self._sensors is None or refresh:
+            self.refresh_sensors()
+        return self._sensors or _EMPTY_INDEX
+
+    def _lookup(self, get_index, table: str, key):
+        """
+        Looks up a device, refreshing the index if it is empty or the device is unknown.
+        """
+        if isinstance(key, ApiConstant):
+            key = key.value
+
+        device = getattr(get_index(False), table).get(key)
+        if device is None:
+            # the device might have been configured since the last refresh
+            device = getattr(get_index(True), table).get(key)
+        return device
+
+    def get_actuators(self, refresh: bool = False) -> [XS1Device]:
+        """
+        :param refresh: request the current device list even if the registry is warm
+        :return: all actuators
+        """
+        return list(self._get_actuators(refresh).devices)
+
+    def get_actuator(self, actuator_id: int) -> XS1Device or None:
+        """
+        :param actuator_id: the id of the actuator
+        :return: the actuator with this id, None if there is none
+        """
+        return self._lookup(self._get_actuators, "by_id", actuator_id)
+
+    def get_actuator_by_number(self, number: int) -> XS1Device or None:
+        """
+        :param number: the number of the actuator
+        :return: the actuator with this number, None if there is none
+        """
+        return self._lookup(self._get_actuators, "by_number", number)
+
+    def get_actuator_by_name(self, name: str) -> XS1Device or None:
+        """
+        :param name: the name of the actuator
+        :return: the (first) actuator with this name, None if there is none
+        """
+        return self._lookup(self._get_actuators, "by_name", name)
+
+    def get_actuators_by_type(self, actuator_type) -> [XS1Device]:
+        """
+        :param actuator_type: an ActuatorType or its value
+        :return: all actuators of this type
+        """
+        if isinstance(actuator_type, ApiConstant):
+            actuator_type = actuator_type.value
+        return list(self._get_actuators(False).by_type.get(actuator_type, []))
+
+    def get_sensors(self, refresh: bool = False) -> [XS1Device]:
+        """
+        :param refresh: request the current device list even if the registry is warm
+        :return: all sensors
+        """
+        return list(self._get_sensors(refresh).devices)
+
+    def get_sensor(self, sensor_id: int) -> XS1Device or None:
+        """
+        :param sensor_id: the id of the sensor
+        :return: the sensor with this id, None if there is none
+        """
+        return self._lookup(self._get_sensors, "by_id", sensor_id)
+
+    def get_sensor_by_number(self, number: int) -> XS1Device or None:
+        """
+        :param number: the number of the sensor
+        :return: the sensor with this number, None if there is none
+        """
+        return self._lookup(self._get_sensors, "by_number", number)
+
+    def get_sensor_by_name(self, name: str) -> XS1Device or None:
+        """
+        :param name: the name of the sensor
+        :return: the (first) sensor with this name, None if there is none
+        """
+        return self._lookup(self._get_sensors, "by_name", name)
+
+    def get_sensors_by_type(self, sensor_type) -> [XS1Device]:
+        """
+        :param sensor_type: a SensorType or its value
+        :return: all sensors of this type
+        """
+        if isinstance(sensor_type, ApiConstant):
+            sensor_type = sensor_type.value
+        return list(self._get_sensors(False).by_type.get(sensor_type, []))
@@ -0,0 +1,194 @@
+"""
+Retry and failure handling for requests sent to the XS1 gateway.
+
+The RetryPolicy decides if and when a failed request is retried, its RetryBudget caps the number of retries
+to a fraction of the regular traffic so retries can't multiply the load on a struggling gateway.
+The CircuitBreaker stops sending requests altogether while the gateway is known to be down.
+"""
+
+import http.client
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the gateway is considered to be down.
+    """
+    pass
+
+
+def is_gateway_failure(error: Exception) -> bool:
+    """
+    :param error: an exception raised while sending a request
+    :return: True if the error indicates an unreachable or failing gateway (timeouts, connection and server errors)
+    """
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        # errors raised by requests carry the response instead
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status_code is not None:
+        return status_code >= 500
+
+    # network errors of all transports (including requests) are OSErrors
+    return isinstance(error, (OSError, http.client.HTTPException))
+
+
+class RetryBudget(object):
+    """
+    Limits retries to a percentage of the regular requests.
+    Every request deposits ``ratio`` tokens, every retry withdraws a whole token.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10, max_tokens: float = 100) -> None:
+        """
+        Creates a new retry budget.
+        :param ratio: retries allowed per regular request (0.2 allows one retry every five requests)
+        :param min_tokens: number of retries available initially (before any regular requests have been made)
+        :param max_tokens: max number of retries that can be saved up
+        """
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = float(min(min_tokens, max_tokens))
+        self._lock = threading.Lock()
+
+    def get_tokens(self) -> float:
+        """
+        :return: the number of retries currently available
+        """
+        return self._tokens
+
+    def deposit(self) -> None:
+        """
+        Records a regular request.
+        """
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Tries to take a token for a retry.
+        :return: True if the retry is allowed
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """
+    Specifies how failed requests are retried.
+    """
+
+    def __init__(self, max_retries: int = 5, backoff_factor: float = 0.1, max_backoff: float = 5.0,
+                 budget: RetryBudget = None) -> None:
+        """
+        Creates a new retry policy.
+        :param max_retries: max number of retries for a single request
+        :param backoff_factor: the n-th retry is delayed by backoff_factor * 2^(n-1) seconds
+        :param max_backoff: upper bound of the delay between retries (in seconds)
+        :param budget: the retry budget shared by all requests, a default budget if None
+        """
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._budget = budget if budget is not None else RetryBudget()
+
+    def get_budget(self) -> RetryBudget:
+        """
+        :return: the retry budget of this policy
+        """
+        return self._budget
+
+    def record_request(self) -> None:
+        """
+        Records a regular (non retry) request.
+        """
+        self._budget.deposit()
+
+    def should_retry(self, error: Exception, retry: int) -> bool:
+        """
+        :param error: the exception raised by the last attempt
+        :param retry: number of the upcoming retry (starting with 1)
+        :return: True if the request should be retried
+        """
+        if retry > self._max_retries or not is_gateway_failure(error):
+            return False
+        return self._budget.withdraw()
+
+    def get_backoff(self, retry: int) -> float:
+        """
+        :param retry: number of the upcoming retry (starting with 1)
+        :return: the time to wait before the retry (in seconds)
+        """
+        return min(self._max_backoff, self._backoff_factor * (2 ** (retry - 1)))
+
+
+class CircuitBreaker(object):
+    """
+    Fails fast while the gateway is down.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and requests are rejected
+    with a CircuitOpenError. Once ``reset_timeout`` has passed a single probe request is allowed (half-open),
+    if it succeeds the circuit closes again, otherwise it stays open for another ``reset_timeout``.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Creates a new circuit breaker.
+        :param failure_threshold: number of consecutive failures that open the circuit
+        :param reset_timeout: time (in seconds) the circuit stays open before a probe request is allowed
+        """
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    def get_state(self) -> str:
+        """
+        :return: the current state of the circuit (CLOSED, OPEN or HALF_OPEN)
+        """
+        return self._state
+
+    def before_request(self) -> bool:
+        """
+        Checks if a request may be sent.
+        Raises a CircuitOpenError if the circuit is open.
+        :return: True if the caller has to send a probe request and report its outcome before continuing
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return False
+
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+                self._state = self.HALF_OPEN
+                return True
+
+        raise CircuitOpenError("The XS1 gateway seems to be down, not sending any requests for now")
+
+    def record_success(self) -> None:
+        """
+        Records a successful request.
+        """
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """
+        Records a failed request.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
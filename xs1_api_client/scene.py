@@ -0,0 +1,186 @@
+"""
+Execution of scenes: batches of actuator commands sent to the gateway concurrently.
+
+Commands are sent using a bounded worker pool (and the governor of the api, if any). Ordering groups allow
+to run some commands strictly after others (f.ex. close the shutters before dimming the lights), a pacing
+interval spaces out the start of commands so the RF channel of the gateway isn't flooded.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from xs1_api_client.api_constants import FunctionType
+from xs1_api_client.device.actuator import XS1Actuator
+
+
+class SceneCommand(object):
+    """
+    A single command of a scene.
+    """
+
+    def __init__(self, actuator: XS1Actuator or int, target, group: int = 0) -> None:
+        """
+        :param actuator: the actuator object or actuator number (not id!)
+        :param target: the new value or a FunctionType executed using the function of this type of the actuator
+        :param group: commands of a group are only started after all commands of lower groups have finished
+        """
+        self.actuator = actuator
+        self.target = target
+        self.group = group
+
+    def __repr__(self) -> str:
+        number = self.actuator.number() if isinstance(self.actuator, XS1Actuator) else self.actuator
+        return "SceneCommand(%s -> %s, group %d)" % (number, self.target, self.group)
+
+
+class CommandResult(object):
+    """
+    The outcome of a single command of a scene.
+    """
+
+    def __init__(self, command: SceneCommand, actuator: XS1Actuator or None, error: Exception or None,
+                 started_at: float, latency: float) -> None:
+        """
+        :param command: the executed command
+        :param actuator: the actuator object, updated with the response of the gateway
+        :param error: the exception raised by the command, None if it succeeded
+        :param started_at: when the command was started (in seconds, relative to the start of the scene)
+        :param latency: how long the command took (in seconds)
+        """
+        self.command = command
+        self.actuator = actuator
+        self.error = error
+        self.started_at = started_at
+        self.latency = latency
+
+    def succeeded(self) -> bool:
+        """
+        :return: True if the command was executed successfully
+        """
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return "CommandResult(%s: %s, %.3fs)" % (self.command, "ok" if self.error is None else self.error,
+                                                  self.latency)
+
+
+class SceneReport(object):
+    """
+    The results of all commands of a scene (in the order of the commands).
+    """
+
+    def __init__(self, results: [CommandResult], duration: float) -> None:
+        """
+        :param results: the result of every command
+        :param duration: the time it took to execute the whole scene (in seconds)
+        """
+        self.results = results
+        self.duration = duration
+
+    def succeeded(self) -> bool:
+        """
+        :return: True if all commands were executed successfully
+        """
+        return all(result.succeeded() for result in self.results)
+
+    def get_failed(self) -> [CommandResult]:
+        """
+        :return: the results of the commands that failed
+        """
+        return [result for result in self.results if not result.succeeded()]
+
+
+class SceneExecutor(object):
+    """
+    Executes scenes using an XS1 api object.
+    """
+
+    def __init__(self, api, max_workers: int = None, pacing: float = 0.0) -> None:
+        """
+        :param api: the XS1 object used to send the commands
+        :param max_workers: max number of concurrent commands,
+                            defaults to the max limit of the governor or XS1.DEFAULT_BULK_WORKERS
+        :param pacing: min time between the start of two commands (in seconds)
+        """
+        self._api = api
+        self._max_workers = max_workers
+        self._pacing = pacing
+
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def execute(self, commands: [SceneCommand or tuple]) -> SceneReport:
+        """
+        Executes the commands of a scene, a failing command does not abort the others.
+        :param commands: SceneCommand objects or (actuator, target) / (actuator, target, group) tuples
+        :return: the report of the scene
+        """
+        commands = [command if isinstance(command, SceneCommand) else SceneCommand(*command)
+                    for command in commands]
+        results = [None] * len(commands)
+        if not commands:
+            return SceneReport(results, 0.0)
+
+        workers = self._api.get_bulk_workers(len(commands), self._max_workers)
+
+        scene_start = time.monotonic()
+        with self._lock:
+            self._next_start = scene_start
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for group in sorted(set(command.group for command in commands)):
+                futures = {executor.submit(self._execute_command, command, scene_start): index
+                           for index, command in enumerate(commands) if command.group == group}
+                wait(futures)
+                for future, index in futures.items():
+                    results[index] = future.result()
+
+        return SceneReport(results, time.monotonic() - scene_start)
+
+    def _wait_for_turn(self) -> None:
+        """
+        Delays the start of a command according to the pacing interval.
+        """
+        if self._pacing <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._pacing
+
+        if start > now:
+            time.sleep(start - now)
+
+    def _execute_command(self, command: SceneCommand, scene_start: float) -> CommandResult:
+        self._wait_for_turn()
+
+        start = time.monotonic()
+        actuator = None
+        error = None
+        try:
+            actuator = self._get_actuator(command)
+            if isinstance(command.target, FunctionType):
+                function = actuator.get_function_by_type(command.target)
+                if function is None:
+                    raise LookupError("Actuator %s has no function of type %s" % (actuator.number(),
+                                                                                   command.target.value))
+                actuator.call_function(function)
+            else:
+                actuator.set_value(command.target)
+        except Exception as ex:
+            error = ex
+
+        end = time.monotonic()
+        return CommandResult(command, actuator, error, start - scene_start, end - start)
+
+    def _get_actuator(self, command: SceneCommand) -> XS1Actuator:
+        if isinstance(command.actuator, XS1Actuator):
+            return command.actuator
+
+        # the registry only requests the device list once for all commands of a scene
+        actuator = self._api.get_registry().get_actuator_by_number(command.actuator)
+        if actuator is None:
+            raise LookupError("Unknown actuator %s" % command.actuator)
+        return actuator
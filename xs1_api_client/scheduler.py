@@ -0,0 +1,308 @@
+"""
+Adaptive polling of single devices.
+
+Every device is polled with its own get_state_* request on its own interval. The interval starts at a base value
+depending on the device type (door and motion sensors need to be fresh, a barometer doesn't) and adapts to the
+observed change rate: it is halved when a poll found a change and stretched when it didn't.
+Due devices are kept in a priority queue and all polls share a global request budget, so when the gateway can't
+keep up the devices that are due first (the ones with short intervals) are served first.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from xs1_api_client.api_constants import SensorType
+from xs1_api_client.device.actuator import XS1Actuator
+
+# base poll intervals (in seconds) of sensor types, other sensor types use DEFAULT_SENSOR_INTERVAL
+SENSOR_INTERVALS = {}
+SENSOR_INTERVALS.update({sensor_type.value: 0.5 for sensor_type in [
+    SensorType.DOOROPEN, SensorType.DOORBELL, SensorType.MOTION, SensorType.PRESENCE, SensorType.WINDOWOPEN,
+    SensorType.WINDOWBREAK, SensorType.ALARMMAT, SensorType.LIGHTBARRIER, SensorType.FENCEDETECTOR,
+    SensorType.REMOTECONTROL,
+]})
+SENSOR_INTERVALS.update({sensor_type.value: 2.0 for sensor_type in [
+    SensorType.SMOKEDETECTOR, SensorType.HEATDETECTOR, SensorType.WATERDETECTOR, SensorType.GAS_CO,
+    SensorType.GAS_BUTAN, SensorType.GAS_METHAN, SensorType.GAS_PROPAN,
+]})
+SENSOR_INTERVALS.update({sensor_type.value: 300.0 for sensor_type in [
+    SensorType.BAROMETER, SensorType.SOILTEMP, SensorType.SOILMOISTURE, SensorType.LEAFWETNESS,
+    SensorType.WATERLEVEL, SensorType.RAIN_24H, SensorType.PWR_CONSUMP, SensorType.WTR_CONSUMP,
+    SensorType.GAS_CONSUMP, SensorType.OIL_CONSUMP,
+]})
+DEFAULT_SENSOR_INTERVAL = 30.0
+
+# actuators usually only change by our own requests
+DEFAULT_ACTUATOR_INTERVAL = 10.0
+
+# the adapted interval stays within these factors of the base interval
+_MIN_FACTOR = 0.25
+_MAX_FACTOR = 4.0
+
+# interval factors applied after a poll with and without a change
+_CHANGED_FACTOR = 0.5
+_UNCHANGED_FACTOR = 1.5
+
+
+class _Entry(object):
+    """
+    The schedule of a single device.
+    """
+
+    def __init__(self, device, base_interval: float, min_interval: float, max_interval: float) -> None:
+        self.device = device
+        self.base_interval = base_interval
+        self.min_interval = max(min_interval, base_interval * _MIN_FACTOR)
+        self.max_interval = max(self.min_interval, min(max_interval, base_interval * _MAX_FACTOR))
+        self.interval = min(max(base_interval, self.min_interval), self.max_interval)
+        self.due = 0.0
+        self.removed = False
+
+    def adapt(self, changed: bool) -> None:
+        """
+        Adapts the interval to the result of a poll.
+        :param changed: True if the poll found a change
+        """
+        if changed:
+            self.interval = max(self.min_interval, self.interval * _CHANGED_FACTOR)
+        else:
+            self.interval = min(self.max_interval, self.interval * _UNCHANGED_FACTOR)
+
+
+class AdaptiveScheduler(object):
+    """
+    Polls devices individually with intervals adapted to their type and change rate.
+    Polls are executed on a background thread (start/stop) or by calling run_pending().
+    """
+
+    def __init__(self, budget: float = 5.0, min_interval: float = 0.25, max_interval: float = 900.0,
+                 intervals: dict = None, clock=time.monotonic) -> None:
+        """
+        :param budget: max number of requests per second for all devices together
+        :param min_interval: lower bound of all poll intervals (in seconds)
+        :param max_interval: upper bound of all poll intervals (in seconds)
+        :param intervals: base poll intervals (in seconds) by device type, overriding the defaults
+        :param clock: function returning the current (monotonic) time in seconds
+        """
+        if budget <= 0:
+            raise ValueError("budget must be greater than 0!")
+
+        self._budget = budget
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._intervals = dict(intervals or {})
+
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._queue = []
+        self._sequence = itertools.count()
+        self._listeners = []
+
+        # token bucket enforcing the request budget
+        self._clock = clock
+        self._tokens = max(1.0, budget)
+        self._refilled_at = self._clock()
+
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+        self._stats = {
+            "polls": 0,
+            "changes": 0,
+            "errors": 0,
+            "deferred": 0,
+        }
+
+    def _get_base_interval(self, device) -> float:
+        device_type = device.type()
+        device_type = getattr(device_type, "value", device_type)
+        if device_type in self._intervals:
+            return self._intervals[device_type]
+        if isinstance(device, XS1Actuator):
+            return DEFAULT_ACTUATOR_INTERVAL
+        return SENSOR_INTERVALS.get(device_type, DEFAULT_SENSOR_INTERVAL)
+
+    def add(self, *devices) -> None:
+        """
+        Schedules devices for polling, disabled devices are ignored.
+        The first poll of a device is due immediately.
+        :param devices: actuator and sensor objects
+        """
+        with self._lock:
+            now = self._clock()
+            for device in devices:
+                if not device.enabled():
+                    continue
+                if id(device) in self._entries:
+                    continue
+
+                entry = _Entry(device, self._get_base_interval(device), self._min_interval, self._max_interval)
+                self._entries[id(device)] = entry
+                self._push(entry, now)
+
+        # let the background thread reschedule
+        self._wakeup.set()
+
+    def remove(self, *devices) -> None:
+        """
+        :param devices: previously added devices
+        """
+        with self._lock:
+            for device in devices:
+                entry = self._entries.pop(id(device), None)
+                if entry is not None:
+                    # the queue entry is dropped when it becomes due
+                    entry.removed = True
+
+    def get_interval(self, device) -> float or None:
+        """
+        :param device: a scheduled device
+        :return: the current poll interval of the device (in seconds), None if it isn't scheduled
+        """
+        entry = self._entries.get(id(device))
+        return entry.interval if entry is not None else None
+
+    def get_demand(self) -> float:
+        """
+        :return: the number of requests per second needed to poll all devices at their current intervals,
+                 more than the budget means devices are polled less often than their interval
+        """
+        return sum(1 / entry.interval for entry in list(self._entries.values()))
+
+    def add_listener(self, listener) -> None:
+        """
+        Registers a function that is called with every device whose poll found a change.
+        :param listener: function accepting a device
+        """
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener) -> None:
+        """
+        :param listener: a previously registered listener
+        """
+        with self._lock:
+            self._listeners = [registered for registered in self._listeners if registered is not listener]
+
+    def get_stats(self) -> dict:
+        """
+        :return: the number of "polls", polls that found a change ("changes"), failed polls ("errors")
+                 and polls that had to wait for the request budget ("deferred")
+        """
+        return dict(self._stats)
+
+    def _push(self, entry: _Entry, due: float) -> None:
+        entry.due = due
+        heapq.heappush(self._queue, (due, next(self._sequence), entry))
+
+    def _take_token(self, now: float) -> float:
+        """
+        Takes a token from the request budget.
+        :return: 0 if a token was taken, otherwise the time until the next token is available (in seconds)
+        """
+        self._tokens = min(max(1.0, self._budget), self._tokens + (now - self._refilled_at) * self._budget)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._budget
+
+    def run_pending(self) -> float:
+        """
+        Polls all devices that are due, as far as the request budget allows.
+        :return: the time until the next poll is due or the budget allows the next request (in seconds)
+        """
+        while not self._stop_event.is_set():
+            with self._lock:
+                now = self._clock()
+                while self._queue and self._queue[0][2].removed:
+                    heapq.heappop(self._queue)
+                if not self._queue:
+                    return self._max_interval
+
+                due, _, entry = self._queue[0]
+                if due > now:
+                    return due - now
+
+                wait = self._take_token(now)
+                if wait > 0:
+                    self._stats["deferred"] += 1
+                    return wait
+
+                heapq.heappop(self._queue)
+
+            changed = self._poll(entry)
+
+            with self._lock:
+                if not entry.removed:
+                    if changed is not None:
+                        entry.adapt(changed)
+                    self._push(entry, self._clock() + entry.interval)
+
+            if changed:
+                self._notify(entry.device)
+
+        return 0.0
+
+    def _poll(self, entry: _Entry) -> bool or None:
+        """
+        :return: True if the state of the device changed, None if the request failed
+        """
+        device = entry.device
+        before = (device.value(), device.new_value(), device.last_update())
+        try:
+            device.update()
+        except Exception:
+            self._stats["errors"] += 1
+            return None
+
+        changed = before != (device.value(), device.new_value(), device.last_update())
+        self._stats["polls"] += 1
+        if changed:
+            self._stats["changes"] += 1
+        return changed
+
+    def _notify(self, device) -> None:
+        for listener in self._listeners:
+            try:
+                listener(device)
+            except Exception:
+                # a broken listener must not stop the scheduler or other listeners
+                pass
+
+    def start(self) -> None:
+        """
+        Starts polling on a background thread that delivers changed devices to the listeners.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.run_pending())
+            self._wakeup.clear()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Stops polling.
+        :param timeout: max time to wait for the background thread to finish (in seconds)
+        """
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
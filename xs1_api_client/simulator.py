@@ -0,0 +1,626 @@
+"""
+A local simulator of the XS1 gateway HTTP api.
+
+It answers ``/control?callback=callback&cmd=...`` requests for every Command with JSONP responses shaped like
+the ones of a real gateway. The number of devices can exceed the 64 slots of a real gateway,
+latency, jitter and server errors can be injected and sensor values change over time.
+This makes it a reproducible target for throughput, latency and soak tests without real hardware.
+
+Run it using:
+
+    python -m xs1_api_client.simulator --port 8080 --actuators 64 --sensors 64 --latency 0.02
+
+or start it from python code using the XS1Simulator context manager.
+"""
+
+import argparse
+import json
+import math
+import queue
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from xs1_api_client.api_constants import Command, Node, UrlParam, ErrorCode, ActuatorType, SensorType, \
+    FunctionType, SystemType, UNIT_BOOLEAN
+from xs1_api_client.event_stream import format_event
+
+PROTOCOL_VERSION = 16
+
+# actuator types (and their functions) assigned to simulated actuators in turn
+_ACTUATOR_TEMPLATES = [
+    (ActuatorType.SWITCH, "%", [FunctionType.ON, FunctionType.OFF]),
+    (ActuatorType.DIMMER, "%", [FunctionType.ON, FunctionType.OFF, FunctionType.DIM_UP, FunctionType.DIM_DOWN]),
+    (ActuatorType.TEMPERATURE, "°C", [FunctionType.AUTO, FunctionType.AUTO, FunctionType.AUTO]),
+    (ActuatorType.SHUTTER, "%", [FunctionType.ON, FunctionType.OFF, FunctionType.STOP]),
+    (ActuatorType.DISABLED, "%", []),
+]
+
+# sensor types assigned to simulated sensors in turn: (type, unit, base value, amplitude, period in seconds)
+_SENSOR_TEMPLATES = [
+    (SensorType.TEMPERATURE, "°C", 21.0, 3.0, 600),
+    (SensorType.HYGROMETER, "%", 50.0, 10.0, 900),
+    (SensorType.BAROMETER, "hPa", 1013.0, 5.0, 3600),
+    (SensorType.DOOROPEN, UNIT_BOOLEAN, 0.0, 1.0, 20),
+    (SensorType.MOTION, UNIT_BOOLEAN, 0.0, 1.0, 10),
+    (SensorType.LIGHT, "lux", 500.0, 400.0, 1800),
+    (SensorType.PWR_CONSUMP, "kWh", 100.0, 100.0, 7200),
+    (SensorType.DISABLED, "", 0.0, 0.0, 1),
+]
+
+_WEEKDAYS = ["mo", "tu", "we", "th", "fr", "sa", "su"]
+
+
+class SimulatedGateway(object):
+    """
+    The simulated state of a gateway and the logic to answer api commands.
+    It is independent of HTTP, so it can also be used to create synthetic api responses directly.
+    """
+
+    def __init__(self, actuators: int = 64, sensors: int = 64, transmit_delay: float = 0.0, seed: int = 0,
+                 clock=time.time) -> None:
+        """
+        :param actuators: number of simulated actuators
+        :param sensors: number of simulated sensors
+        :param transmit_delay: time (in seconds) until a new actuator value is "transmitted" and value == newvalue
+        :param seed: seed for the randomized parts of the simulation
+        :param clock: function returning the current time (in seconds since the epoch)
+        """
+        self._transmit_delay = transmit_delay
+        self._clock = clock
+        self._start_time = clock()
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+        rng = random.Random(seed)
+        self._actuators = [self._create_actuator(number, rng) for number in range(1, actuators + 1)]
+        self._sensors = [self._create_sensor(number, rng) for number in range(1, sensors + 1)]
+
+        self._handlers = {
+            Command.GET_PROTOCOL_INFO.value: self._get_protocol_info,
+            Command.GET_CONFIG_INFO.value: self._get_config_info,
+            Command.GET_CONFIG_MAIN.value: self._get_config_main,
+            Command.GET_LIST_SYSTEMS.value: self._get_list_systems,
+            Command.GET_LIST_FUNCTIONS.value: self._get_list_functions,
+            Command.GET_TYPES_ACTUATORS.value: self._get_types_actuators,
+            Command.GET_TYPES_SENSORS.value: self._get_types_sensors,
+            Command.GET_LIST_RFMODES.value: self._get_list_rfmodes,
+            Command.GET_CONFIG_ACTUATOR.value: self._get_config_actuator,
+            Command.SET_CONFIG_ACTUATOR.value: self._set_config_actuator,
+            Command.GET_CONFIG_SENSOR.value: self._get_config_sensor,
+            Command.SET_CONFIG_SENSOR.value: self._set_config_sensor,
+            Command.GET_LIST_ACTUATORS.value: self._get_list_actuators,
+            Command.GET_LIST_SENSORS.value: self._get_list_sensors,
+            Command.GET_STATE_ACTUATOR.value: self._get_state_actuator,
+            Command.GET_STATE_SENSOR.value: self._get_state_sensor,
+            Command.SET_STATE_ACTUATOR.value: self._set_state_actuator,
+            Command.SET_STATE_SENSOR.value: self._set_state_sensor,
+            Command.SUBSCRIBE.value: self._subscribe,
+        }
+
+    @staticmethod
+    def _create_actuator(number: int, rng: random.Random) -> dict:
+        actuator_type, unit, function_types = _ACTUATOR_TEMPLATES[(number - 1) % len(_ACTUATOR_TEMPLATES)]
+        functions = [{"type": function_type.value, "dsc": function_type.value.upper()}
+                     for function_type in function_types]
+        functions += [{"type": FunctionType.DISABLED.value, "dsc": ""}] * (4 - len(functions))
+
+        value = float(rng.choice([0, 100])) if actuator_type != ActuatorType.DISABLED else 0.0
+        return {
+            "number": number,
+            "id": number,
+            "name": "Actuator_%d" % number,
+            "type": actuator_type.value,
+            "system": SystemType.AB400.value,
+            "unit": unit,
+            "value": value,
+            "newvalue": value,
+            "utime": 0,
+            "changed_at": 0.0,
+            "transmitting": False,
+            "function": functions,
+            "hc1": rng.randint(0, 255),
+            "hc2": 0,
+            "address": number,
+        }
+
+    @staticmethod
+    def _create_sensor(number: int, rng: random.Random) -> dict:
+        sensor_type, unit, base, amplitude, period = _SENSOR_TEMPLATES[(number - 1) % len(_SENSOR_TEMPLATES)]
+        return {
+            "number": number,
+            "id": number,
+            "name": "Sensor_%d" % number,
+            "type": sensor_type.value,
+            "system": SystemType.WS300.value if unit != UNIT_BOOLEAN else SystemType.FS20.value,
+            "unit": unit,
+            "base": base,
+            "amplitude": amplitude,
+            # vary the period a little so sensors of the same type don't change in lockstep
+            "period": period * rng.uniform(0.8, 1.2),
+            "phase": rng.uniform(0, 2 * math.pi),
+            "override": None,
+            "hc1": 0,
+            "hc2": 0,
+            "address": number,
+        }
+
+    def handle(self, parameters: dict) -> dict:
+        """
+        Answers an api request.
+        :param parameters: the url parameters of the request
+        :return: the api response
+        """
+        command = parameters.get(UrlParam.COMMAND.value)
+        handler = self._handlers.get(command)
+        if handler is None:
+            return self._error(command, ErrorCode.INVALID_COMMAND if command else ErrorCode.CMD_TYPE_MISSING)
+
+        with self._lock:
+            try:
+                return handler(command, parameters)
+            except LookupError:
+                return self._error(command, ErrorCode.NOT_FOUND)
+            except ValueError:
+                return self._error(command, ErrorCode.SYNTAX_ERROR)
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Registers a subscriber of the push interface.
+        Every state change caused by a set_state_* command puts an event line into the returned queue,
+        actuator changes only once their new value has been transmitted (see transmit_delay).
+        :return: the event queue of the subscriber
+        """
+        events = queue.Queue()
+        with self._lock:
+            self._subscribers.append(events)
+        return events
+
+    def unsubscribe(self, events: queue.Queue) -> None:
+        """
+        :param events: an event queue returned by subscribe()
+        """
+        with self._lock:
+            self._subscribers = [subscriber for subscriber in self._subscribers if subscriber is not events]
+
+    def _publish(self, node: Node, device: dict, value: float, utime: int) -> None:
+        if not self._subscribers:
+            return
+
+        line = format_event(node, device["number"], device["type"], value, utime)
+        for subscriber in self._subscribers:
+            subscriber.put(line)
+
+    @staticmethod
+    def _response(command: str, **nodes) -> dict:
+        response = {"version": PROTOCOL_VERSION, "type": command}
+        response.update(nodes)
+        return response
+
+    def _error(self, command: str, error_code: ErrorCode) -> dict:
+        return self._response(command, error=error_code.value)
+
+    @staticmethod
+    def _get_number(parameters: dict, devices: list) -> int:
+        number = int(parameters[UrlParam.NUMBER.value])
+        if not 1 <= number <= len(devices):
+            raise LookupError(number)
+        return number
+
+    @staticmethod
+    def _date_time(utime: int) -> dict:
+        local_time = time.localtime(utime)
+        return {
+            "date": {"weekday": _WEEKDAYS[local_time.tm_wday], "day": local_time.tm_mday,
+                     "month": local_time.tm_mon, "year": local_time.tm_year},
+            "time": {"hour": local_time.tm_hour, "min": local_time.tm_min, "sec": local_time.tm_sec},
+        }
+
+    def _transmit(self, actuator: dict, now: float) -> None:
+        """
+        Completes the transmission of a new actuator value to the device.
+        Like the real gateway, subscribers are only notified once the value reached the device.
+        """
+        actuator["transmitting"] = False
+        actuator["value"] = actuator["newvalue"]
+        actuator["utime"] = int(now)
+        self._publish(Node.ACTUATOR, actuator, actuator["value"], actuator["utime"])
+
+    def _transmit_delayed(self, actuator: dict, changed_at: float) -> None:
+        with self._lock:
+            # a newer write restarts the transmission
+            if actuator["transmitting"] and actuator["changed_at"] == changed_at:
+                self._transmit(actuator, self._clock())
+
+    def _actuator_state(self, actuator: dict, now: float) -> dict:
+        if actuator["transmitting"] and now - actuator["changed_at"] >= self._transmit_delay:
+            # the new value has been "transmitted" to the device
+            self._transmit(actuator, now)
+
+        return {
+            "name": actuator["name"],
+            "id": actuator["id"],
+            "type": actuator["type"],
+            "value": actuator["value"],
+            "newvalue": actuator["newvalue"],
+            "utime": actuator["utime"],
+            "unit": actuator["unit"],
+            "function": [dict(function) for function in actuator["function"]],
+        }
+
+    def _sensor_value(self, sensor: dict, now: float) -> (float, int):
+        if sensor["override"] is not None:
+            return sensor["override"]
+
+        if sensor["type"] == SensorType.DISABLED.value:
+            return 0.0, 0
+
+        # values follow a sine wave, boolean sensors switch on and off periodically
+        # utime is the (simulated) time of the last change
+        step = sensor["period"] / 20
+        elapsed = now - self._start_time
+        changed_at = self._start_time + elapsed - (elapsed % step)
+        wave = math.sin(2 * math.pi * (changed_at - self._start_time) / sensor["period"] + sensor["phase"])
+        if sensor["unit"] == UNIT_BOOLEAN:
+            value = 1.0 if wave > 0 else 0.0
+        else:
+            value = round(sensor["base"] + sensor["amplitude"] * wave, 1)
+        return value, int(changed_at)
+
+    def _sensor_state(self, sensor: dict, now: float) -> dict:
+        value, utime = self._sensor_value(sensor, now)
+        return {
+            "name": sensor["name"],
+            "id": sensor["id"],
+            "type": sensor["type"],
+            "value": value,
+            "utime": utime,
+            "unit": sensor["unit"],
+            "state": [],
+        }
+
+    def _get_protocol_info(self, command: str, parameters: dict) -> dict:
+        return self._response(command)
+
+    def _get_config_info(self, command: str, parameters: dict) -> dict:
+        return self._response(command, info={
+            "devicename": "xs1-simulator",
+            "hardware": "1.3.0.1BB",
+            "xs1_id": "0000000000000000",
+            "bootloader": "1.0.0.6",
+            "firmware": "4.0.0.5326",
+            "systems": len(SystemType),
+            "maxactuators": len(self._actuators),
+            "maxsensors": len(self._sensors),
+            "maxtimers": 128,
+            "maxscripts": 32,
+            "maxrooms": 64,
+            "maxurls": 4,
+            "maxemails": 6,
+            "uptime": int(self._clock() - self._start_time),
+            "features": ["A", "B", "C", "D"],
+            "esystems": [],
+            "mac": "00:00:00:00:00:00",
+            "autoip": "on",
+        })
+
+    def _get_config_main(self, command: str, parameters: dict) -> dict:
+        return self._response(command, main={
+            "longitude": 13.377778,
+            "latitude": 52.516387,
+            "location": "",
+            "rfmode1": "433.92_MHz_normal",
+            "rfmode2": "868.35_MHz_normal",
+            "mmc_state": "no card",
+            "xs1connect": "off",
+        })
+
+    def _get_list_systems(self, command: str, parameters: dict) -> dict:
+        functions = [FunctionType.DISABLED.value, FunctionType.ON.value, FunctionType.OFF.value]
+        return self._response(command, system=[{"name": system.value, "functions": functions}
+                                               for system in SystemType])
+
+    def _get_list_functions(self, command: str, parameters: dict) -> dict:
+        return self._response(command, function=[{"name": function_type.value} for function_type in FunctionType
+                                                 if function_type != FunctionType.UNKNOWN])
+
+    def _get_types_actuators(self, command: str, parameters: dict) -> dict:
+        return self._response(command, actuatortype=[{"name": actuator_type.value}
+                                                     for actuator_type in ActuatorType])
+
+    def _get_types_sensors(self, command: str, parameters: dict) -> dict:
+        return self._response(command, sensortype=[{"name": sensor_type.value, "unit": ""}
+                                                   for sensor_type in SensorType])
+
+    def _get_list_rfmodes(self, command: str, parameters: dict) -> dict:
+        return self._response(command, rfmode=[{"name": "433.92_MHz_normal"}, {"name": "868.35_MHz_normal"}])
+
+    @staticmethod
+    def _config(device: dict, keys: [str]) -> dict:
+        config = {key: device[key] for key in keys if key in device}
+        config.update({"room": 0, "x": 0, "y": 0, "z": 0, "log": "off"})
+        return config
+
+    def _get_config_actuator(self, command: str, parameters: dict) -> dict:
+        actuator = self._actuators[self._get_number(parameters, self._actuators) - 1]
+        config = self._config(actuator, ["number", "id", "name", "system", "type", "hc1", "hc2", "address"])
+        config["function"] = [dict(function) for function in actuator["function"]]
+        return self._response(command, actuator=config)
+
+    def _get_config_sensor(self, command: str, parameters: dict) -> dict:
+        sensor = self._sensors[self._get_number(parameters, self._sensors) - 1]
+        config = self._config(sensor, ["number", "id", "name", "system", "type", "hc1", "hc2", "address"])
+        config.update({"factor": 1.0, "offset": 0.0})
+        return self._response(command, sensor=config)
+
+    @staticmethod
+    def _apply_config(device: dict, parameters: dict) -> None:
+        for key in [UrlParam.NAME.value, UrlParam.TYPE.value, UrlParam.SYSTEM.value]:
+            if key in parameters:
+                device[key] = parameters[key]
+
+    def _set_config_actuator(self, command: str, parameters: dict) -> dict:
+        actuator = self._actuators[self._get_number(parameters, self._actuators) - 1]
+        self._apply_config(actuator, parameters)
+        for index, function in enumerate(actuator["function"], start=1):
+            function_type = parameters.get("function%d.type" % index)
+            if function_type is not None:
+                actuator["function"][index - 1] = {"type": function_type,
+                                                   "dsc": parameters.get("function%d.dsc" % index, "")}
+        return self._get_config_actuator(command, parameters)
+
+    def _set_config_sensor(self, command: str, parameters: dict) -> dict:
+        sensor = self._sensors[self._get_number(parameters, self._sensors) - 1]
+        self._apply_config(sensor, parameters)
+        return self._get_config_sensor(command, parameters)
+
+    def _get_list_actuators(self, command: str, parameters: dict) -> dict:
+        now = self._clock()
+        return self._response(command, utc_offset=60, dst="off",
+                              actuator=[self._actuator_state(actuator, now) for actuator in self._actuators])
+
+    def _get_list_sensors(self, command: str, parameters: dict) -> dict:
+        now = self._clock()
+        return self._response(command, utc_offset=60, dst="off",
+                              sensor=[self._sensor_state(sensor, now) for sensor in self._sensors])
+
+    def _single_actuator_response(self, command: str, number: int, now: float) -> dict:
+        state = self._actuator_state(self._actuators[number - 1], now)
+        state.pop("id")
+        state.pop("function")
+        state["number"] = number
+        state.update(self._date_time(state["utime"]))
+        return self._response(command, actuator=state)
+
+    def _single_sensor_response(self, command: str, number: int, now: float) -> dict:
+        state = self._sensor_state(self._sensors[number - 1], now)
+        state.pop("id")
+        state["number"] = number
+        state.update(self._date_time(state["utime"]))
+        return self._response(command, sensor=state)
+
+    def _get_state_actuator(self, command: str, parameters: dict) -> dict:
+        return self._single_actuator_response(command, self._get_number(parameters, self._actuators), self._clock())
+
+    def _get_state_sensor(self, command: str, parameters: dict) -> dict:
+        return self._single_sensor_response(command, self._get_number(parameters, self._sensors), self._clock())
+
+    def _set_state_actuator(self, command: str, parameters: dict) -> dict:
+        number = self._get_number(parameters, self._actuators)
+        actuator = self._actuators[number - 1]
+        now = self._clock()
+
+        if UrlParam.FUNCTION.value in parameters:
+            function = actuator["function"][int(parameters[UrlParam.FUNCTION.value]) - 1]
+            if function["type"] == FunctionType.ON.value:
+                new_value = 100.0
+            elif function["type"] == FunctionType.OFF.value:
+                new_value = 0.0
+            elif function["type"] == FunctionType.TOGGLE.value:
+                new_value = 0.0 if actuator["newvalue"] else 100.0
+            else:
+                new_value = actuator["newvalue"]
+        else:
+            new_value = float(parameters[UrlParam.VALUE.value])
+
+        actuator["newvalue"] = new_value
+        actuator["changed_at"] = now
+        actuator["transmitting"] = True
+        if self._transmit_delay <= 0:
+            self._transmit(actuator, now)
+        elif self._subscribers:
+            # without subscribers the transmission is completed when the actuator is read the next time
+            timer = threading.Timer(self._transmit_delay, self._transmit_delayed, (actuator, now))
+            timer.daemon = True
+            timer.start()
+        return self._single_actuator_response(command, number, now)
+
+    def _set_state_sensor(self, command: str, parameters: dict) -> dict:
+        number = self._get_number(parameters, self._sensors)
+        now = self._clock()
+        sensor = self._sensors[number - 1]
+        sensor["override"] = (float(parameters[UrlParam.VALUE.value]), int(now))
+        self._publish(Node.SENSOR, sensor, *sensor["override"])
+        return self._single_sensor_response(command, number, now)
+
+    def _subscribe(self, command: str, parameters: dict) -> dict:
+        # the event lines themselves are streamed by the HTTP server
+        return self._response(command)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers HTTP requests using the SimulatedGateway of the server.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        simulator = self.server.simulator
+        url = urlsplit(self.path)
+        if url.path != "/control":
+            self._send(404, b"not found")
+            return
+
+        simulator._delay()
+        if simulator._should_fail():
+            self._send(503, b"service unavailable")
+            return
+
+        parameters = dict(parse_qsl(url.query, keep_blank_values=True))
+        if parameters.get(UrlParam.COMMAND.value) == Command.SUBSCRIBE.value:
+            self._stream_events(simulator)
+            return
+
+        response = simulator.gateway.handle(parameters)
+        callback = parameters.get("callback", "callback")
+        body = "%s(%s)" % (callback, json.dumps(response, ensure_ascii=False))
+        self._send(200, body.encode('utf-8'))
+
+    def _stream_events(self, simulator) -> None:
+        """
+        Keeps the connection open and writes an event line for every state change until the client disconnects.
+        """
+        events = simulator.gateway.subscribe()
+        try:
+            self.close_connection = True
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.flush()
+
+            while not simulator._stopped.is_set():
+                try:
+                    line = events.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                self.wfile.write((line + "\n").encode('utf-8'))
+                self.wfile.flush()
+        except OSError:
+            # client disconnected
+            pass
+        finally:
+            simulator.gateway.unsubscribe(events)
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/javascript; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class XS1Simulator(object):
+    """
+    HTTP server simulating an XS1 gateway.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, actuators: int = 64, sensors: int = 64,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, transmit_delay: float = 0.0,
+                 seed: int = 0) -> None:
+        """
+        :param host: address to listen on
+        :param port: port to listen on, a random free port if 0
+        :param actuators: number of simulated actuators
+        :param sensors: number of simulated sensors
+        :param latency: base latency of every response (in seconds)
+        :param jitter: max random latency added to the base latency (in seconds)
+        :param error_rate: fraction of requests answered with HTTP 503 (0.0 - 1.0)
+        :param transmit_delay: time (in seconds) until a new actuator value is "transmitted" and value == newvalue
+        :param seed: seed for the randomized parts of the simulation
+        """
+        self.gateway = SimulatedGateway(actuators, sensors, transmit_delay, seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.simulator = self
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def _delay(self) -> None:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _should_fail(self) -> bool:
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def start(self) -> None:
+        """
+        Starts serving requests on a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops serving requests.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        """
+        Serves requests on the current thread until interrupted.
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+def main(args: [str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulates the HTTP api of an XS1 gateway")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--actuators", type=int, default=64, help="number of simulated actuators")
+    parser.add_argument("--sensors", type=int, default=64, help="number of simulated sensors")
+    parser.add_argument("--latency", type=float, default=0.0, help="base latency of every response in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="max random latency added in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with HTTP 503")
+    parser.add_argument("--transmit-delay", type=float, default=0.0,
+                        help="seconds until a new actuator value reaches the device")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the randomized parts of the simulation")
+    options = parser.parse_args(args)
+
+    simulator = XS1Simulator(options.host, options.port, options.actuators, options.sensors, options.latency,
+                             options.jitter, options.error_rate, options.transmit_delay, options.seed)
+    print("Simulating an XS1 gateway with %d actuators and %d sensors on http://%s:%d/control" % (
+        options.actuators, options.sensors, simulator.host, simulator.port))
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
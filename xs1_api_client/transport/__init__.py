@@ -0,0 +1,84 @@
+"""
+Transports send the HTTP requests of an XS1 object to the gateway.
+
+A transport only has to implement the ``get`` method, ``open_stream`` is needed for the push interface
+(see event_stream.XS1EventStream). Two implementations are provided:
+
+- ``requests_transport.RequestsTransport`` (default) uses a pooled requests session
+- ``http_client_transport.HttpClientTransport`` uses keep-alive connections of the standard library's http.client
+  and has no external dependencies
+"""
+
+
+class TransportError(IOError):
+    """
+    Raised by transports if a request could not be completed.
+    """
+    pass
+
+
+class HTTPStatusError(TransportError):
+    """
+    Raised by transports if the gateway answered with an HTTP error status.
+    """
+
+    def __init__(self, status_code: int, reason: str = None) -> None:
+        super(HTTPStatusError, self).__init__("HTTP %s: %s" % (status_code, reason))
+        self.status_code = status_code
+
+
+class Stream(object):
+    """
+    A streaming response that is read line by line, returned by Transport.open_stream().
+    """
+
+    def readline(self) -> bytes:
+        """
+        Blocks until the next line has been received.
+        :return: the next line, an empty value if the stream has been closed
+        """
+        raise NotImplementedError("Not implemented!")
+
+    def close(self) -> None:
+        """
+        Closes the stream, this also unblocks a thread waiting in readline().
+        """
+        pass
+
+
+class Transport(object):
+    """
+    Base class for all transports.
+    """
+
+    def get(self, url: str, timeout: float, auth: (str, str) = None) -> (bytes, str or None):
+        """
+        Sends a GET request.
+        Implementations have to raise an exception if the response has an HTTP error status.
+
+        :param url: the request url
+        :param timeout: timeout in seconds
+        :param auth: (user, password) tuple for basic authentication, if any
+        :return: the raw response body and its encoding (if specified by the response headers)
+        """
+        raise NotImplementedError("Not implemented!")
+
+    def open_stream(self, url: str, timeout: float, read_timeout: float, auth: (str, str) = None) -> Stream:
+        """
+        Sends a GET request whose response is streamed, using a connection of its own.
+        Implementations have to raise an exception if the response has an HTTP error status.
+
+        :param url: the request url
+        :param timeout: timeout for connecting and receiving the response headers in seconds
+        :param read_timeout: max time between two lines of the response in seconds
+        :param auth: (user, password) tuple for basic authentication, if any
+        :return: the response stream
+        """
+        raise NotImplementedError("Streaming is not supported by %s!" % type(self).__name__)
+
+    def close(self) -> None:
+        """
+        Closes all open connections of this transport.
+        The transport can still be used afterwards.
+        """
+        pass
@@ -0,0 +1,297 @@
+"""
+Recording and replaying of gateway requests for offline testing and benchmarking.
+
+A Cassette is a list of recorded request/response pairs ("interactions"). It is stored as a JSON lines file
+with one interaction per line. A directory of raw api responses (like tests/api_responses, where every file
+is named after the command it answers) can be loaded as a cassette as well.
+Streamed responses (subscriptions) are recorded as a single interaction containing all received lines.
+"""
+
+import base64
+import io
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl
+
+from xs1_api_client.api_constants import Command, UrlParam
+from xs1_api_client.transport import Transport, HTTPStatusError, Stream
+
+# url parameters that don't identify a request
+_IGNORED_PARAMETERS = {"callback", UrlParam.USER.value, UrlParam.PASSWORD.value}
+
+# api responses that are named after the method that requests them instead of the command
+_RESPONSE_COMMANDS = {"call_actuator_function": Command.SET_STATE_ACTUATOR.value}
+
+
+class Interaction(object):
+    """
+    A single recorded request and its response.
+    """
+
+    def __init__(self, command: str, parameters: dict, body: bytes, status: int = 200, latency: float = 0.0,
+                 encoding: str = None) -> None:
+        """
+        :param command: the command of the request
+        :param parameters: the other parameters of the request (without credentials)
+        :param body: the raw response body
+        :param status: the HTTP status of the response
+        :param latency: the time it took to receive the response (in seconds)
+        :param encoding: the encoding of the response (if specified by the response headers)
+        """
+        self.command = command
+        self.parameters = parameters
+        self.body = body
+        self.status = status
+        self.latency = latency
+        self.encoding = encoding
+
+    def to_dict(self) -> dict:
+        """
+        :return: a JSON serializable representation of this interaction
+        """
+        data = {
+            "cmd": self.command,
+            "params": self.parameters,
+            "status": self.status,
+            "latency": round(self.latency, 6),
+        }
+        if self.encoding:
+            data["encoding"] = self.encoding
+        try:
+            data["body"] = self.body.decode('utf-8')
+        except UnicodeDecodeError:
+            data["body_base64"] = base64.b64encode(self.body).decode('ascii')
+        return data
+
+    @staticmethod
+    def from_dict(data: dict):
+        """
+        :param data: a representation created by to_dict()
+        :return: the interaction
+        """
+        if "body_base64" in data:
+            body = base64.b64decode(data["body_base64"])
+        else:
+            body = data["body"].encode('utf-8')
+
+        return Interaction(data["cmd"], data.get("params", {}), body, data.get("status", 200),
+                           data.get("latency", 0.0), data.get("encoding"))
+
+
+def parse_request_url(url: str) -> (str, dict):
+    """
+    :param url: a request url
+    :return: the command and the other (identifying) parameters of the request
+    """
+    parameters = {key: value for key, value in parse_qsl(urlsplit(url).query, keep_blank_values=True)
+                  if key not in _IGNORED_PARAMETERS}
+    command = parameters.pop(UrlParam.COMMAND.value, None)
+    return command, parameters
+
+
+class Cassette(object):
+    """
+    A list of recorded interactions that can be saved to and loaded from a file.
+    """
+
+    def __init__(self, interactions: [Interaction] = None) -> None:
+        self._interactions = list(interactions) if interactions else []
+        self._lock = threading.Lock()
+
+    def get_interactions(self) -> [Interaction]:
+        """
+        :return: all interactions of this cassette
+        """
+        return list(self._interactions)
+
+    def add(self, interaction: Interaction) -> None:
+        """
+        Adds an interaction to this cassette.
+        :param interaction: the interaction to add
+        """
+        with self._lock:
+            self._interactions.append(interaction)
+
+    def save(self, path: str) -> None:
+        """
+        Saves this cassette as a JSON lines file.
+        :param path: the file to write
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for interaction in self.get_interactions():
+                f.write(json.dumps(interaction.to_dict(), ensure_ascii=False, separators=(',', ':')))
+                f.write("\n")
+
+    @staticmethod
+    def load(path: str):
+        """
+        Loads a cassette from a JSON lines file or from a directory of api responses.
+        Files in a directory are named after the command they answer, anything after a double underscore is ignored
+        (f.ex. "get_state_actuator__updated"). They match requests with any parameters and are replayed in
+        alphabetical order. "call_actuator_function" answers "set_state_actuator" requests.
+
+        :param path: a cassette file or a directory of api responses
+        :return: the cassette
+        """
+        if os.path.isdir(path):
+            interactions = []
+            for filename in sorted(os.listdir(path)):
+                with open(os.path.join(path, filename), 'rb') as f:
+                    body = f.read()
+                if not body.lstrip().startswith(b"callback("):
+                    body = b"callback(" + body + b")"
+                name = filename.split("__")[0]
+                interactions.append(Interaction(_RESPONSE_COMMANDS.get(name, name), None, body))
+            return Cassette(interactions)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return Cassette([Interaction.from_dict(json.loads(line)) for line in f if line.strip()])
+
+
+class _RecordingStream(Stream):
+    """
+    Collects the lines of a stream and records them as one interaction once the stream is closed.
+    """
+
+    def __init__(self, stream: Stream, record) -> None:
+        """
+        :param stream: the recorded stream
+        :param record: function accepting the received body, called once
+        """
+        self._stream = stream
+        self._record = record
+        self._lines = []
+
+    def readline(self) -> bytes:
+        line = self._stream.readline()
+        if line:
+            self._lines.append(line)
+        return line
+
+    def close(self) -> None:
+        self._stream.close()
+        record, self._record = self._record, None
+        if record is not None:
+            record(b"".join(self._lines))
+
+
+class RecordingTransport(Transport):
+    """
+    Transport that records all requests sent by another transport to a cassette.
+    """
+
+    def __init__(self, transport: Transport, cassette: Cassette = None) -> None:
+        """
+        :param transport: the transport used to send the requests
+        :param cassette: the cassette to record to, a new one if None
+        """
+        self._transport = transport
+        self._cassette = cassette if cassette is not None else Cassette()
+
+    def get_cassette(self) -> Cassette:
+        """
+        :return: the cassette requests are recorded to
+        """
+        return self._cassette
+
+    def get(self, url: str, timeout: float, auth: (str, str) = None) -> (bytes, str or None):
+        command, parameters = parse_request_url(url)
+        start = time.perf_counter()
+        try:
+            body, encoding = self._transport.get(url, timeout, auth)
+        except HTTPStatusError as ex:
+            self._cassette.add(Interaction(command, parameters, b"", ex.status_code, time.perf_counter() - start))
+            raise
+
+        self._cassette.add(Interaction(command, parameters, body, 200, time.perf_counter() - start, encoding))
+        return body, encoding
+
+    def open_stream(self, url: str, timeout: float, read_timeout: float, auth: (str, str) = None) -> Stream:
+        command, parameters = parse_request_url(url)
+        start = time.perf_counter()
+        try:
+            stream = self._transport.open_stream(url, timeout, read_timeout, auth)
+        except HTTPStatusError as ex:
+            self._cassette.add(Interaction(command, parameters, b"", ex.status_code, time.perf_counter() - start))
+            raise
+
+        latency = time.perf_counter() - start
+        return _RecordingStream(stream, lambda body: self._cassette.add(
+            Interaction(command, parameters, body, 200, latency)))
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class _ReplayStream(Stream):
+    """
+    Replays the recorded lines of a stream, the stream ends after the last one.
+    """
+
+    def __init__(self, body: bytes) -> None:
+        self._body = io.BytesIO(body)
+
+    def readline(self) -> bytes:
+        return self._body.readline()
+
+
+class ReplayTransport(Transport):
+    """
+    Transport that answers requests with the recorded responses of a cassette instead of contacting the gateway.
+
+    Requests are matched by command and parameters, or by command only for interactions without parameters.
+    If there are multiple matching interactions they are replayed in order, starting over after the last one.
+    This transport is thread safe.
+    """
+
+    def __init__(self, cassette: Cassette, speed: float = None) -> None:
+        """
+        :param cassette: the cassette to replay
+        :param speed: replay the recorded latencies this many times faster (1.0 for the original latencies),
+                      don't wait at all if None
+        """
+        self._speed = speed
+        self._interactions = {}
+        for interaction in cassette.get_interactions():
+            if interaction.parameters is None:
+                key = (interaction.command,)
+            else:
+                key = (interaction.command, frozenset(interaction.parameters.items()))
+            self._interactions.setdefault(key, []).append(interaction)
+
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, timeout: float, auth: (str, str) = None) -> (bytes, str or None):
+        interaction = self._replay(url)
+        return interaction.body, interaction.encoding
+
+    def open_stream(self, url: str, timeout: float, read_timeout: float, auth: (str, str) = None) -> Stream:
+        return _ReplayStream(self._replay(url).body)
+
+    def _replay(self, url: str) -> Interaction:
+        """
+        :param url: the request url
+        :return: the next matching interaction (after waiting for its latency)
+        """
+        command, parameters = parse_request_url(url)
+
+        interactions = self._interactions.get((command, frozenset(parameters.items())))
+        if interactions is None:
+            interactions = self._interactions.get((command,))
+        if interactions is None:
+            raise HTTPStatusError(404, "No recorded response for %s" % url)
+
+        with self._lock:
+            position = self._positions.get(id(interactions), 0)
+            self._positions[id(interactions)] = (position + 1) % len(interactions)
+        interaction = interactions[position]
+
+        if self._speed:
+            time.sleep(interaction.latency / self._speed)
+
+        if interaction.status >= 400:
+            raise HTTPStatusError(interaction.status)
+        return interaction
@@ -0,0 +1,171 @@
+import base64
+import http.client
+import socket
+import ssl
+import threading
+from urllib.parse import urlsplit
+
+from xs1_api_client.transport import Transport, TransportError, HTTPStatusError, Stream
+
+
+def _get_headers(auth: (str, str) or None) -> dict:
+    """
+    :param auth: (user, password) tuple for basic authentication, if any
+    :return: the request headers
+    """
+    headers = {}
+    if auth and auth[0] is not None and auth[1] is not None:
+        credentials = ("%s:%s" % auth).encode('utf-8')
+        headers["Authorization"] = "Basic " + base64.b64encode(credentials).decode('ascii')
+    return headers
+
+
+class _HttpClientStream(Stream):
+    """
+    A streaming response of an http.client connection.
+    """
+
+    def __init__(self, connection: http.client.HTTPConnection, sock: socket.socket,
+                 response: http.client.HTTPResponse) -> None:
+        self._connection = connection
+        self._socket = sock
+        self._response = response
+
+    def readline(self) -> bytes:
+        return self._response.readline()
+
+    def close(self) -> None:
+        try:
+            # unblocks a thread waiting for the next line
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._connection.close()
+
+
+class HttpClientTransport(Transport):
+    """
+    Transport using keep-alive connections of the standard library's http.client module.
+    It has no external dependencies and very little overhead per request.
+    """
+
+    def __init__(self, pool_size: int = 10, ssl_context: ssl.SSLContext = None) -> None:
+        """
+        :param pool_size: max number of idle keep-alive connections kept open per host
+        :param ssl_context: context used for HTTPS connections, the default context if None
+        """
+        self._pool_size = pool_size
+        self._ssl_context = ssl_context
+        self._idle_connections = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, timeout: float, auth: (str, str) = None) -> (bytes, str or None):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        headers = _get_headers(auth)
+
+        while True:
+            connection, reused = self._acquire(key, timeout)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as ex:
+                connection.close()
+                if reused and isinstance(ex, (ConnectionError, http.client.BadStatusLine)):
+                    # the gateway closed an idle keep-alive connection, try again with another one
+                    continue
+                if isinstance(ex, OSError):
+                    raise
+                raise TransportError(str(ex)) from ex
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+
+        if response.status >= 400:
+            raise HTTPStatusError(response.status, response.reason)
+
+        return body, response.headers.get_content_charset()
+
+    def open_stream(self, url: str, timeout: float, read_timeout: float, auth: (str, str) = None) -> Stream:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        # streams are never pooled
+        connection, _ = self._acquire((parts.scheme, parts.hostname, parts.port), timeout, pooled=False)
+        try:
+            connection.request("GET", path, headers=_get_headers(auth))
+            # the connection forgets its socket if the response is terminated by closing the connection
+            sock = connection.sock
+            response = connection.getresponse()
+        except http.client.HTTPException as ex:
+            connection.close()
+            raise TransportError(str(ex)) from ex
+        except OSError:
+            connection.close()
+            raise
+
+        if response.status >= 400:
+            connection.close()
+            raise HTTPStatusError(response.status, response.reason)
+
+        sock.settimeout(read_timeout)
+        return _HttpClientStream(connection, sock, response)
+
+    def _acquire(self, key: tuple, timeout: float, pooled: bool = True) -> (http.client.HTTPConnection, bool):
+        """
+        :param key: (scheme, host, port) of the connection
+        :param timeout: timeout in seconds
+        :param pooled: use an idle connection if there is one
+        :return: an idle connection or a new one and whether the connection has been used before
+        """
+        connection = None
+        if pooled:
+            with self._lock:
+                idle = self._idle_connections.get(key)
+                connection = idle.pop() if idle else None
+
+        if connection is not None:
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            return connection, True
+
+        scheme, host, port = key
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        return connection, False
+
+    def _release(self, key: tuple, connection: http.client.HTTPConnection) -> None:
+        """
+        Returns a connection to the pool of idle connections.
+        :param key: (scheme, host, port) of the connection
+        :param connection: the connection to return
+        """
+        with self._lock:
+            idle = self._idle_connections.setdefault(key, [])
+            if len(idle) < self._pool_size:
+                idle.append(connection)
+                return
+
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle_connections = self._idle_connections
+            self._idle_connections = {}
+
+        for connections in idle_connections.values():
+            for connection in connections:
+                connection.close()
@@ -0,0 +1,91 @@
+import os
+import socket
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from xs1_api_client.transport import Transport, Stream
+
+
+class _RequestsStream(Stream):
+    """
+    A streaming response of a requests session.
+    """
+
+    def __init__(self, response: requests.Response) -> None:
+        self._response = response
+        # a socket sharing the connection of the response, which can be shut down from any thread
+        self._socket = socket.socket(fileno=os.dup(response.raw.fileno()))
+        # read byte by byte, larger chunks would wait for more data than the gateway has sent
+        self._lines = response.iter_lines(chunk_size=1)
+
+    def readline(self) -> bytes:
+        try:
+            # iter_lines() strips the line breaks, keep them to distinguish empty lines from the end of the stream
+            return next(self._lines) + b"\n"
+        except StopIteration:
+            return b""
+
+    def close(self) -> None:
+        try:
+            # unblocks a thread waiting for the next line
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        self._response.close()
+
+
+class RequestsTransport(Transport):
+    """
+    Transport using a pooled requests session with keep-alive connections.
+    """
+
+    def __init__(self, pool_size: int = 10) -> None:
+        """
+        :param pool_size: max number of keep-alive connections kept open
+        """
+        self._pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _get_session(self) -> requests.Session:
+        """
+        :return: the pooled session used for all requests of this transport
+        """
+        session = self._session
+        if session is None:
+            with self._lock:
+                session = self._session
+                if session is None:
+                    session = requests.Session()
+                    # retries are handled by the retry policy of the XS1 object
+                    adapter = HTTPAdapter(pool_connections=1,
+                                          pool_maxsize=self._pool_size,
+                                          max_retries=0)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+
+        return session
+
+    def get(self, url: str, timeout: float, auth: (str, str) = None) -> (bytes, str or None):
+        response = self._get_session().get(url, timeout=timeout, auth=auth)
+        response.raise_for_status()
+        return response.content, response.encoding
+
+    def open_stream(self, url: str, timeout: float, read_timeout: float, auth: (str, str) = None) -> Stream:
+        response = self._get_session().get(url, timeout=(timeout, read_timeout), auth=auth, stream=True)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return _RequestsStream(response)
+
+    def close(self) -> None:
+        session = self._session
+        self._session = None
+        if session is not None:
+            session.close()